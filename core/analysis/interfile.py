@@ -7,6 +7,7 @@ from pathlib import Path
 from typing import Dict, List, Optional, Set, Tuple
 
 from core.analysis.common import load_analysis_config
+from utils.project_index_utils import get_project_index
 
 
 @dataclass
@@ -1592,8 +1593,9 @@ def analyze_multifile_flows(
     globs = spec["globs"]
 
     files: List[Path] = []
+    project_index = get_project_index(source_root)
     for pat in globs:
-        files.extend(source_root.rglob(pat))
+        files.extend(project_index.rglob(pat, source_root))
 
     if len(files) > max_files:
         print(
@@ -9,6 +9,7 @@ import yaml
 
 import state.runtime_state as state
 from core.analysis.common import load_analysis_config
+from utils.project_index_utils import get_project_index
 
 
 DEFAULT_RANKING = {
@@ -1930,7 +1931,7 @@ def _discover_mitigations(scan_root: Path, platform: str) -> List[Dict]:
     raw_globs = FILE_GLOBS.get(platform_key, "*")
     globs = raw_globs if isinstance(raw_globs, (list, tuple, set)) else (raw_globs,)
     for glob in globs:
-        for file_path in Path(scan_root).rglob(glob):
+        for file_path in get_project_index(scan_root).rglob(glob, scan_root):
             if not file_path.is_file():
                 continue
             try:
@@ -1,5 +1,7 @@
 from pathlib import Path
 
+from utils.project_index_utils import get_project_index
+
 
 def project_language_hints(source_root):
     root = Path(source_root)
@@ -18,14 +20,9 @@ def project_language_hints(source_root):
         "javascript": ("*.js", "*.jsx", "*.ts", "*.tsx"),
         "dotnet": ("*.cs", "*.vb", "*.aspx", "*.cshtml"),
     }
+    project_index = get_project_index(root)
     for lang, globs in patterns.items():
-        total = 0
-        for glob in globs:
-            try:
-                total += sum(1 for _ in root.rglob(glob))
-            except OSError:
-                continue
-        counts[lang] = total
+        counts[lang] = sum(len(project_index.rglob(glob, root)) for glob in globs)
     return counts
 
 
@@ -8,8 +8,12 @@ from pathlib import Path
 
 # Local application imports
 import state.runtime_state as runtime
+import utils.archive_utils as archiveops
 import utils.file_utils as fileops
+import utils.generated_file_utils as genops
+from utils.discovery_snapshot_utils import DiscoverySnapshot
 from utils.log_utils import get_logger
+from utils.project_index_utils import get_project_index
 import utils.result_utils as result
 import utils.rules_utils as rulesops
 from utils.rules_utils import get_available_rules, get_rules_path_or_filetypes
@@ -77,7 +81,7 @@ def detect_mobile_rule_types(sourcepath):
         except json.JSONDecodeError:
             return {}
 
-    for root, dirs, files in os.walk(sourcepath):
+    for root, dirs, files in get_project_index(sourcepath).walk(sourcepath):
         files_set = set(files)
         files_set_lower = {f.lower() for f in files_set}
         for file_name in files:
@@ -332,7 +336,7 @@ def detect_framework_rule_files(sourcepath, selected_platforms=None):
     dep_index = {}
     content_cache = {}
 
-    for root, _, files in os.walk(sourcepath):
+    for root, _, files in get_project_index(sourcepath).walk(sourcepath):
         for fname in files:
             fpath = os.path.join(root, fname)
             lower_name = fname.lower()
@@ -470,6 +474,148 @@ def detect_framework_rule_files(sourcepath, selected_platforms=None):
     return deduped
 
 
+def index_target(target_dirpath):
+    """
+    Build the shared project index of the scan target and diff it against the
+    discovery snapshot of the previous scan.
+
+    Sets runtime.discoveryDelta and runtime.knownContentHashes, writes the delta
+    to runtime/discovery_delta.json and the scan summary, and saves the new
+    snapshot. Returns the DiscoverySnapshot, so content hashes computed while
+    scanning can be recorded in it.
+    """
+    snapshot = DiscoverySnapshot(runtime.discoverySnapshotDb, target_dirpath, enabled=runtime.discoverySnapshotEnabled)
+    previous = snapshot.load()
+    project_index = get_project_index(target_dirpath, previous=previous)
+    if not snapshot.enabled:
+        return snapshot
+
+    delta, known_hashes = snapshot.update(project_index, previous)
+    runtime.discoveryDelta = delta
+    runtime.knownContentHashes = known_hashes
+    if delta.first_run:
+        print(f"     [-] Discovery Snapshot   : Recorded {len(project_index.entries)} entries (first scan of this target)")
+    else:
+        print(
+            f"     [-] Discovery Snapshot   : +{len(delta.added)} added, -{len(delta.removed)} removed, "
+            f"~{len(delta.modified)} modified ({delta.dirs_reused}/{delta.dirs_total} directories unchanged)"
+        )
+
+    try:
+        with open(runtime.discoveryDelta_Fpath, "w", encoding="utf-8") as file_obj:
+            json.dump({
+                "first_run": delta.first_run,
+                "added": delta.added,
+                "removed": delta.removed,
+                "modified": delta.modified,
+            }, file_obj, indent=4)
+    except OSError as exc:
+        logger.error("Failed to write discovery delta %s: %s", runtime.discoveryDelta_Fpath, exc)
+    result.update_scan_summary("detection_summary.discovery_delta", {
+        "first_run": delta.first_run,
+        "added": len(delta.added),
+        "removed": len(delta.removed),
+        "modified": len(delta.modified),
+        "directories_reused": delta.dirs_reused,
+        "directories_total": delta.dirs_total,
+    })
+    return snapshot
+
+
+def discovery_delta_size(delta):
+    """Return how many files were added, removed or modified in `delta`."""
+    if delta is None:
+        return 0
+    return len(delta.added) + len(delta.removed) + len(delta.modified)
+
+
+def _name_suffix(file_name):
+    """
+    Return the extension the way Path(file_name).suffix does, without building a Path.
+    """
+    dot = file_name.rfind(".")
+    if 0 < dot < len(file_name) - 1:
+        return file_name[dot:]
+    return ""
+
+
+def _build_filetype_dispatch(platform_names, platform_filetypes):
+    """
+    Split every platform's filetype patterns into lookup tables.
+
+    Returns (name_slots, ext_slots, glob_slots): exact file names and "*.ext"
+    patterns map to the (platform position, pattern position) slots they fill, so
+    only real globs such as "*.*" or "Dockerfile*" still go through fnmatch.
+    """
+    name_slots = {}
+    ext_slots = {}
+    glob_slots = []
+    for platform_pos, platform in enumerate(platform_names):
+        for pattern_pos, patt in enumerate(platform_filetypes[platform]):
+            patt = patt.strip()  # Remove spaces
+            slot = (platform_pos, pattern_pos)
+            if not any(token in patt for token in ("*", "?", "[")):
+                name_slots.setdefault(os.path.normcase(patt), []).append(slot)
+            elif patt.startswith("*.") and not any(token in patt[2:] for token in ("*", "?", "[", ".", "/", "\\")):
+                ext_slots.setdefault(os.path.normcase(patt[1:]), []).append(slot)
+            else:
+                glob_slots.append((slot, patt))
+    return name_slots, ext_slots, glob_slots
+
+
+def _dispatch_names(names, dispatch, slot_order):
+    """
+    Yield (slot, position) for every name in `names` matched by a platform filetype,
+    in slot order, as if each platform's patterns were matched against `names` in turn.
+    """
+    name_slots, ext_slots, glob_slots = dispatch
+    slot_positions = {}
+    for position, filename in enumerate(names):
+        name_key = os.path.normcase(filename)
+        slots = list(name_slots.get(name_key, ()))
+        dot = name_key.rfind(".")
+        if dot >= 0:
+            slots.extend(ext_slots.get(name_key[dot:], ()))
+        for slot, patt in glob_slots:
+            if fnmatch.fnmatch(filename, patt):
+                slots.append(slot)
+        for slot in slots:
+            slot_positions.setdefault(slot, []).append(position)
+
+    for slot in slot_order:
+        for position in slot_positions.get(slot, ()):
+            yield slot, position
+
+
+def _count_reasons(generated_files):
+    counts = {}
+    for reason in generated_files.values():
+        counts[reason] = counts.get(reason, 0) + 1
+    return dict(sorted(counts.items()))
+
+
+def _write_generated_files(generated_files):
+    try:
+        with open(runtime.generatedFiles_Fpath, "w", encoding="utf-8") as file_obj:
+            json.dump({"mode": runtime.generatedFilesMode, "files": generated_files}, file_obj, indent=4)
+    except OSError as exc:
+        logger.error("Failed to write generated file list %s: %s", runtime.generatedFiles_Fpath, exc)
+
+
+def load_generated_files():
+    """
+    Restore runtime.generatedWindowFiles from runtime/generated_files.json when a
+    resumed scan skips file discovery.
+    """
+    try:
+        with open(runtime.generatedFiles_Fpath, "r", encoding="utf-8") as file_obj:
+            recorded = json.load(file_obj)
+    except (OSError, ValueError):
+        return
+    if isinstance(recorded, dict) and recorded.get("mode") == "window" and runtime.generatedFilesMode == "window":
+        runtime.generatedWindowFiles = frozenset(recorded.get("files") or {})
+
+
 def discover_files(codebase, sourcepath, mode):
     """
     Discovers files for specified platforms and logs paths to platform-specific and master log files.
@@ -488,7 +634,7 @@ def discover_files(codebase, sourcepath, mode):
 
     platform_filetypes = {}  # Store platform-specific filetypes
     platform_extensions = {}  # Store identified extensions per platform
-    matches, total_files_count = [], 0
+    total_files_count = 0
     identified_files_count = 0
 
     # Create or return the /runtime/platform directory and clear existing logs
@@ -513,43 +659,111 @@ def discover_files(codebase, sourcepath, mode):
         platform_extensions = {platform: [] for platform in platforms}
 
     master_file_paths = runtime.runtime_dirpath / "filepaths.log"
-    platform_file_paths = []  # List to store paths of platform-specific logs
-
+    platform_file_paths = [platform_dir / f"filepaths_{platform}.log" for platform in platform_filetypes]
+
+    # slot = (platform position, pattern position); every match lands in one slot
+    platform_names = list(platform_filetypes)
+    slot_order = [
+        (platform_pos, pattern_pos)
+        for platform_pos, platform in enumerate(platform_names)
+        for pattern_pos in range(len(platform_filetypes[platform]))
+    ]
+    dispatch = _build_filetype_dispatch(platform_names, platform_filetypes)
+
+    project_index = get_project_index(sourcepath)
+    # Vendor/VCS/build directories were never entered while the target was indexed.
+    pruned_dirs = [rel_dir.replace(os.sep, "/") for rel_dir in project_index.pruned]
+    master_lines = []
+    platform_lines = [[] for _ in platform_names]
+    platform_ext_seen = [dict.fromkeys(platform_extensions.get(platform, [])) for platform in platform_names]
+
+    changed_files = runtime.changedFiles
+    unchanged_files_count = 0
+    archives_scanned = 0
+    archives_unreadable = 0
+    archive_members_count = 0
+    archive_members_skipped = 0
+    # path -> reason it looks minified/generated (None for regular sources); each
+    # file is classified once even when several platforms pick it up.
+    classify_generated = runtime.generatedFilesMode != "scan"
+    generated_reasons = {}
+
+    # Traverse the source path to discover files
+    for root, dirnames, filenames in project_index.walk(sourcepath):
+        total_files_count += len(filenames)
+
+        # --since: only files git reports as changed or added are queued.
+        if changed_files is not None:
+            rel_root = os.path.relpath(root, sourcepath)
+            kept_filenames = [
+                filename for filename in filenames
+                if os.path.normcase(os.path.normpath(os.path.join(rel_root, filename))) in changed_files
+            ]
+            unchanged_files_count += len(filenames) - len(kept_filenames)
+            filenames = kept_filenames
+
+        # Archives are read as virtual directories; members follow the directory's files.
+        listings = [(filenames, None)]
+        if runtime.archiveExtensions:
+            for filename in filenames:
+                if not archiveops.is_archive_name(filename):
+                    continue
+                archive_path = os.path.join(root, filename)
+                try:
+                    members, skipped = archiveops.list_archive_members(archive_path)
+                except IOError as exc:
+                    logger.warning("Skipping archive %s: %s", archive_path, exc)
+                    archives_unreadable += 1
+                    continue
+                archives_scanned += 1
+                archive_members_count += len(members)
+                archive_members_skipped += skipped
+                listings.append(([member.name for member in members], [member.ref for member in members]))
+
+        # Same order as matching each platform's patterns against the directory in turn.
+        for names, member_refs in listings:
+            for slot, position in _dispatch_names(names, dispatch, slot_order):
+                full_path = os.path.join(root, names[position]) if member_refs is None else member_refs[position]
+                if classify_generated:
+                    if full_path not in generated_reasons:
+                        # Archive members are classified by name only, not read twice.
+                        generated_reasons[full_path] = (
+                            genops.classify_file(full_path, names[position]) if member_refs is None
+                            else genops.classify_name(names[position])
+                        )
+                    if generated_reasons[full_path] and runtime.generatedFilesMode == "skip":
+                        continue
+                platform_pos = slot[0]
+                platform_lines[platform_pos].append(full_path + "\n")
+                master_lines.append(full_path + "\n")
+                identified_files_count += 1
+
+                ext_value = _name_suffix(names[position])
+                if ext_value:
+                    platform_ext_seen[platform_pos].setdefault(ext_value)
+
+    for platform_pos, platform in enumerate(platform_names):
+        platform_extensions[platform] = list(platform_ext_seen[platform_pos])
+
+    generated_files = {path: reason for path, reason in generated_reasons.items() if reason}
+    if runtime.generatedFilesMode == "window":
+        runtime.generatedWindowFiles = frozenset(generated_files)
+    if classify_generated:
+        _write_generated_files(generated_files)
+
+    # One buffered write per log once the walk is done.
     try:
         with open(master_file_paths, "w+") as master_log:
-
-            # Traverse the source path to discover and log files
-            for root, _, filenames in os.walk(sourcepath):
-                total_files_count += len(filenames)
-
-                for platform, extensions in platform_filetypes.items():
-                    platform_log_path = platform_dir / f"filepaths_{platform}.log"
-                    if platform_log_path not in platform_file_paths:
-                        platform_file_paths.append(platform_log_path)  # Append each platform log path
-
-                    try:
-                        with open(platform_log_path, "a") as platform_log:
-                            for ext in extensions:
-                                ext = ext.strip()  # Remove spaces
-                                matched_files = fnmatch.filter(filenames, ext)
-
-                                for filename in matched_files:
-                                    full_path = os.path.join(root, filename)
-
-                                    platform_log.write(full_path + "\n")
-                                    master_log.write(full_path + "\n")
-
-                                    matches.append(full_path)
-                                    identified_files_count += 1
-
-                                    ext_value = fileops.get_file_extension(full_path)
-                                    if ext_value and ext_value not in platform_extensions[platform]:
-                                        platform_extensions[platform].append(ext_value)
-                    except OSError as exc:
-                        logger.error("Failed to write platform log %s: %s", platform_log_path, exc)
+            master_log.write("".join(master_lines))
     except OSError as exc:
         logger.error("Failed to write master filepath log at %s: %s", master_file_paths, exc)
         return master_file_paths, platform_file_paths  # Early return; nothing else to do
+    for platform_log_path, lines in zip(platform_file_paths, platform_lines):
+        try:
+            with open(platform_log_path, "w") as platform_log:
+                platform_log.write("".join(lines))
+        except OSError as exc:
+            logger.error("Failed to write platform log %s: %s", platform_log_path, exc)
 
     # Filter out platforms with no valid extensions before writing to summary
     platform_extensions_filtered = {
@@ -569,11 +783,44 @@ def discover_files(codebase, sourcepath, mode):
         '''
     # Print and update scan summary
     print(f"     [-] Total project files in the directory: {total_files_count}")
+    if pruned_dirs:
+        print(f"     [-] Pruned directories: {len(pruned_dirs)} (not walked)")
+    if changed_files is not None:
+        print(f"     [-] Unchanged since {runtime.sinceRef}: {unchanged_files_count} files skipped")
+    if archives_scanned or archives_unreadable:
+        print(
+            f"     [-] Archives scanned in place: {archives_scanned} ({archive_members_count} members, "
+            f"{archive_members_skipped} skipped by depth/size limits, {archives_unreadable} unreadable)"
+        )
+    if generated_files:
+        handled = "skipped" if runtime.generatedFilesMode == "skip" else "matched in windows"
+        reasons = _count_reasons(generated_files)
+        print(
+            f"     [-] Minified/generated files: {len(generated_files)} {handled} ("
+            + ", ".join(f"{count} {reason.replace('_', ' ')}" for reason, count in reasons.items()) + ")"
+        )
     print(f"     [-] Total files to be scanned: {identified_files_count}")
 
     result.update_scan_summary("detection_summary.total_project_files_identified", str(total_files_count))
     result.update_scan_summary("detection_summary.total_files_identified", str(identified_files_count))
     result.update_scan_summary("detection_summary.file_extensions_identified", platform_extensions_filtered)
+    result.update_scan_summary("detection_summary.pruned_directories", pruned_dirs)
+    if changed_files is not None:
+        result.update_scan_summary("detection_summary.unchanged_files_skipped", str(unchanged_files_count))
+    if archives_scanned or archives_unreadable:
+        result.update_scan_summary("detection_summary.archives_scanned", {
+            "archives": archives_scanned,
+            "unreadable": archives_unreadable,
+            "members": archive_members_count,
+            "members_skipped": archive_members_skipped,
+        })
+    if classify_generated:
+        result.update_scan_summary("detection_summary.generated_files", {
+            "mode": runtime.generatedFilesMode,
+            "skipped": len(generated_files) if runtime.generatedFilesMode == "skip" else 0,
+            "windowed": len(generated_files) if runtime.generatedFilesMode == "window" else 0,
+            "reasons": _count_reasons(generated_files),
+        })
     #result.update_scan_summary("detection_summary.file_extensions_identified", platform_extensions)
 
     runtime.totalFilesIdentified = identified_files_count
@@ -600,7 +847,7 @@ def recon_discover_files(codebase, sourcepath, mode):
     
     identified_files = []  # List to store discovered file paths
 
-    for root, dirnames, filenames in os.walk(sourcepath):
+    for root, dirnames, filenames in get_project_index(sourcepath).walk(sourcepath):
         for extensions in filetypes:
             for filename in fnmatch.filter(filenames, extensions):
                 file_path = os.path.join(root, filename)
@@ -658,7 +905,7 @@ def auto_detect_rule_types(sourcepath):
     pending_platforms = set(platform_patterns.keys())
     all_patterns = list(pattern_to_platforms.keys())
 
-    for _, _, files in os.walk(sourcepath):
+    for _, _, files in get_project_index(sourcepath).walk(sourcepath):
         if not pending_platforms:
             break
         for filename in files:
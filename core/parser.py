@@ -1,17 +1,29 @@
 # Standard libraries
+import bisect
+import hashlib
 import json
+import multiprocessing
+import os
 import re
+import sqlite3
 import sys
+import tempfile
 import xml.etree.ElementTree as ET
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from timeit import default_timer as timer
+from xml.sax.saxutils import unescape as xml_unescape
 
 # Local application imports
-from core import rdl_engine
+from core import prefilter, rdl_engine
 import state.runtime_state as state
+import utils.archive_utils as archiveops
 import utils.file_utils as futils
 import utils.suppression_utils as supp
+from utils.jsonl_utils import JsonlAppender, compact_jsonl, discard_jsonl
 from utils.log_utils import get_logger
+from utils.project_index_utils import get_project_index
+from utils.result_cache_utils import ScanResultCache
 
 logger = get_logger(__name__)
 
@@ -213,22 +225,52 @@ def _collect_context_lines(file_lines, linecount, lines_before, lines_after):
     return before, after
 
 
-def _match_full_file(pattern, content, file_lines, exclude):
+# Newline offsets of the file currently being matched, shared by all of its
+# file-mode rules. Keyed on the content object itself and released by
+# _release_file_indexes() once the file is done, so no file text outlives its scan.
+_newline_index = (None, [])
+
+
+def _newline_offsets(content):
+    """Return the sorted offsets of every newline in `content`, built once per file."""
+    global _newline_index
+    if _newline_index[0] is not content:
+        _newline_index = (content, [m.start() for m in re.finditer("\n", content)])
+    return _newline_index[1]
+
+
+def _release_file_indexes():
+    """Drop the per-file match indexes, and with them the last file's text."""
+    global _newline_index, _joined_lines
+    _newline_index = (None, [])
+    _joined_lines = (None, "", [])
+
+
+def _full_file_pattern(pattern):
+    try:
+        return re.compile(pattern.pattern, re.MULTILINE | re.DOTALL)
+    except re.error:
+        return pattern
+
+
+def _match_full_file(pattern, content, file_lines, exclude, full_pattern=None):
     """
     Apply pattern to full file content with MULTILINE|DOTALL.
     Returns list of (linecount, matched_text, groups_dict) tuples.
     linecount is the 1-based line number of the match start.
     groups_dict holds named capture groups from the match (may be empty).
+    full_pattern is the pattern already recompiled by _full_file_pattern(), if any.
     """
-    try:
-        full_pattern = re.compile(pattern.pattern, re.MULTILINE | re.DOTALL)
-    except re.error:
-        full_pattern = pattern
+    if full_pattern is None:
+        full_pattern = _full_file_pattern(pattern)
 
     results = []
+    newlines = None
     for m in full_pattern.finditer(content):
-        # Determine line number of match start
-        linecount = content.count('\n', 0, m.start()) + 1
+        if newlines is None:
+            newlines = _newline_offsets(content)
+        # Line number of match start = newlines before it + 1
+        linecount = bisect.bisect_left(newlines, m.start()) + 1
         # Get the matched text (first line only for display)
         matched_text = m.group(0)
         first_line = matched_text.split('\n', 1)[0]
@@ -280,73 +322,91 @@ def _confidence_level(score):
     return "low"
 
 
-def _compute_source_confidence_score(evidence, has_regex=False, has_rdl=False, has_descriptions=False):
+class _SourceScoreAccumulator:
     """
-    Heuristic confidence score for source-code matches.
+    Running inputs of _compute_source_confidence_score().
+
+    Each evidence item is classified once when it is added, so scoring a finding
+    after every file stays linear in its evidence count.
     """
-    evidence = evidence or []
-    evidence_count = len(evidence)
-    unique_files = len({ev.get("file", "") for ev in evidence if isinstance(ev, dict)})
-
-    # Confidence should represent precision of the match, not only the number of hits.
-    score = 28
-    score += min(10, evidence_count * 2)
-    score += min(6, unique_files * 2)
-    if has_regex:
-        score += 8
-    if has_rdl:
-        score += 6
-    if has_descriptions:
-        score += 2
-
-    placeholder_hits = 0
-    taint_lines = 0
-    sink_lines = 0
-    direct_taint_to_sink_lines = 0
-    dynamic_query_lines = 0
-    sink_only_lines = 0
-
-    for ev in evidence:
+
+    def __init__(self):
+        self.evidence_count = 0
+        self.files = set()
+        self.placeholder_hits = 0
+        self.taint_lines = 0
+        self.sink_lines = 0
+        self.direct_taint_to_sink_lines = 0
+        self.dynamic_query_lines = 0
+        self.sink_only_lines = 0
+
+    def add(self, ev):
+        self.evidence_count += 1
         if not isinstance(ev, dict):
-            continue
+            return
+        self.files.add(ev.get("file", ""))
         code = str(ev.get("code", "")).strip().lower()
         if code in {"[rdl condition matched]", "[rdl matched]"}:
-            placeholder_hits += 1
-            continue
+            self.placeholder_hits += 1
+            return
 
         has_taint_signal = bool(_TAINT_SIGNAL_PATTERN.search(code))
         has_sink_signal = bool(_SINK_SIGNAL_PATTERN.search(code))
         has_dynamic_signal = bool(_DYNAMIC_CONSTRUCTION_PATTERN.search(code))
 
         if has_taint_signal:
-            taint_lines += 1
+            self.taint_lines += 1
         if has_sink_signal:
-            sink_lines += 1
+            self.sink_lines += 1
         if has_sink_signal and has_taint_signal:
-            direct_taint_to_sink_lines += 1
+            self.direct_taint_to_sink_lines += 1
         if has_sink_signal and has_dynamic_signal:
-            dynamic_query_lines += 1
+            self.dynamic_query_lines += 1
         if has_sink_signal and not has_taint_signal and _VARIABLE_ARG_CALL_PATTERN.search(code):
-            sink_only_lines += 1
-
-    score += min(28, direct_taint_to_sink_lines * 12)
-    score += min(16, taint_lines * 4)
-    score += min(12, dynamic_query_lines * 4)
-    score -= min(18, placeholder_hits * 6)
-    score -= min(18, sink_only_lines * 4)
+            self.sink_only_lines += 1
+
+    def score(self, has_regex=False, has_rdl=False, has_descriptions=False):
+        evidence_count = self.evidence_count
+
+        # Confidence should represent precision of the match, not only the number of hits.
+        score = 28
+        score += min(10, evidence_count * 2)
+        score += min(6, len(self.files) * 2)
+        if has_regex:
+            score += 8
+        if has_rdl:
+            score += 6
+        if has_descriptions:
+            score += 2
+
+        score += min(28, self.direct_taint_to_sink_lines * 12)
+        score += min(16, self.taint_lines * 4)
+        score += min(12, self.dynamic_query_lines * 4)
+        score -= min(18, self.placeholder_hits * 6)
+        score -= min(18, self.sink_only_lines * 4)
+
+        # Do not mark as high confidence without direct taint-to-sink proof.
+        if self.direct_taint_to_sink_lines == 0:
+            score -= 10
+            score = min(score, 74)
+            if evidence_count >= 12:
+                score -= 6
+
+        # Penalize noisy broad matches where most evidence is sink-only wrappers.
+        if self.sink_lines > 0 and self.sink_only_lines >= self.sink_lines:
+            score -= 8
+
+        return _clamp_score(score, low=10, high=96)
 
-    # Do not mark as high confidence without direct taint-to-sink proof.
-    if direct_taint_to_sink_lines == 0:
-        score -= 10
-        score = min(score, 74)
-        if evidence_count >= 12:
-            score -= 6
 
-    # Penalize noisy broad matches where most evidence is sink-only wrappers.
-    if sink_lines > 0 and sink_only_lines >= sink_lines:
-        score -= 8
-
-    return _clamp_score(score, low=10, high=96)
+def _compute_source_confidence_score(evidence, has_regex=False, has_rdl=False, has_descriptions=False):
+    """
+    Heuristic confidence score for source-code matches.
+    """
+    accumulator = _SourceScoreAccumulator()
+    for ev in evidence or []:
+        accumulator.add(ev)
+    return accumulator.score(has_regex=has_regex, has_rdl=has_rdl, has_descriptions=has_descriptions)
 
 
 def _compute_paths_confidence_score(path_count):
@@ -463,11 +523,877 @@ def _file_path_rule_meta(rule_elem):
     }
 
 
+def _read_source_rule(rule_elem, rule_path, category_name):
+    """
+    Read one <rule> element of a source rule pack into plain data (texts, scan
+    config and the referenced RDL script). Returns None for malformed rules.
+    """
+    rule_title = (rule_elem.findtext("name") or "").strip()
+    pattern_text = (rule_elem.findtext("regex") or "").strip()
+    rdl_ref = (rule_elem.findtext("rdl_ref") or "").strip()
+    exclude_text = (rule_elem.findtext("exclude") or "").strip()
+
+    if not rule_title or (not pattern_text and not rdl_ref):
+        logger.warning("Skipping malformed rule in %s under category %s", rule_path, category_name)
+        return None
+
+    rule = {
+        "title": rule_title,
+        "category": category_name,
+        "pattern_text": pattern_text,
+        "exclude_text": exclude_text,
+        "rdl_ref": rdl_ref,
+        "rule_desc": (rule_elem.findtext("rule_desc") or "").strip(),
+        "vuln_desc": (rule_elem.findtext("vuln_desc") or "").strip(),
+        "dev_note": (rule_elem.findtext("developer") or "").strip(),
+        "rev_note": (rule_elem.findtext("reviewer") or "").strip(),
+        "scan_cfg": _parse_scan_config(rule_elem),
+        "rdl_logic_text": "",
+        "flag_pattern_text": "",
+    }
+
+    logic_file_path = _resolve_logic_file(rule_path, rdl_ref) if rdl_ref else None
+    if logic_file_path and logic_file_path.exists():
+        try:
+            rule["rdl_logic_text"] = rdl_engine.load_rdl(logic_file_path)
+        except OSError as exc:
+            logger.error("Failed to read RDL file %s for rule %s: %s", logic_file_path, rule_title, exc)
+
+    if rule["rdl_logic_text"]:
+        rule["flag_pattern_text"] = pattern_text or _extract_rdl_logic_evidence_pattern(rule["rdl_logic_text"]) or ""
+
+    return rule
+
+
+# RDL clause statistics for this scan, loaded on first use.
+_rdl_stats = None
+
+
+def _get_rdl_stats():
+    global _rdl_stats
+    if _rdl_stats is None:
+        _rdl_stats = rdl_engine.RdlStats(state.rdlStatsFile)
+    return _rdl_stats
+
+
+def save_rdl_stats():
+    """Persist the RDL clause statistics gathered by this scan for the next one."""
+    if _rdl_stats is not None:
+        _rdl_stats.save()
+
+
+def _compile_rule_patterns(rule, rule_path):
+    """
+    Compile the regexes of a rule read by _read_source_rule() in place.
+    Rules with an invalid <regex> get "invalid" set so callers can still report
+    them as unmatched.
+    """
+    rule_title = rule["title"]
+    rule.update({
+        "invalid": False,
+        "pattern": None,
+        "exclude": None,
+        "full_pattern": None,
+        "line_pattern": None,
+        "flag_regex": None,
+        "flag_line_regex": None,
+        "context_regex": None,
+        "rdl_program": None,
+        "rdl_order": None,
+    })
+
+    if rule["pattern_text"]:
+        try:
+            rule["pattern"] = re.compile(rule["pattern_text"])
+        except re.error as exc:
+            logger.error("Invalid regex in rule %s (%s): %s", rule_title, rule_path, exc)
+            rule["invalid"] = True
+            return rule
+        if rule["scan_cfg"]["match_mode"] == "file":
+            rule["full_pattern"] = _full_file_pattern(rule["pattern"])
+        elif prefilter.line_searchable(rule["pattern_text"]):
+            rule["line_pattern"] = re.compile(rule["pattern_text"], re.MULTILINE)
+
+    if rule["exclude_text"]:
+        try:
+            rule["exclude"] = re.compile(rule["exclude_text"], re.IGNORECASE)
+        except re.error as exc:
+            logger.error("Invalid exclude regex in rule %s (%s): %s", rule_title, rule_path, exc)
+
+    if rule["flag_pattern_text"]:
+        try:
+            rule["flag_regex"] = re.compile(rule["flag_pattern_text"], re.IGNORECASE)
+            if prefilter.line_searchable(rule["flag_pattern_text"], re.IGNORECASE):
+                rule["flag_line_regex"] = re.compile(rule["flag_pattern_text"], re.IGNORECASE | re.MULTILINE)
+        except re.error as exc:
+            logger.error("Invalid FLAG regex in RDL for rule %s (%s): %s", rule_title, rule_path, exc)
+
+    if rule["rdl_logic_text"]:
+        rule["rdl_program"] = rdl_engine.compile_rdl(rule["rdl_logic_text"])
+        if state.rdlReorderEnabled:
+            rule["rdl_order"] = rdl_engine.plan_rdl_order(rule["rdl_program"], _get_rdl_stats())
+
+    context_pattern = rule["scan_cfg"]["context_pattern"]
+    if rule["scan_cfg"]["context_type"] == "backward" and context_pattern:
+        try:
+            rule["context_regex"] = re.compile(context_pattern)
+        except re.error:
+            rule["context_regex"] = None
+
+    return rule
+
+
+def _compile_source_rule(rule_elem, rule_path, category_name):
+    """
+    Compile one <rule> element of a source rule pack.
+    Returns None for malformed rules; rules with an invalid <regex> are returned
+    with "invalid" set so callers can still report them as unmatched.
+    """
+    rule = _read_source_rule(rule_elem, rule_path, category_name)
+    if rule is None:
+        return None
+    _compile_rule_patterns(rule, rule_path)
+    rule["prefilter"] = None if rule["invalid"] else _rule_prefilter(rule)
+    return rule
+
+
+def _rule_prefilter(rule):
+    """
+    Literal requirements that must hold before a rule can produce anything for a file.
+
+    Returns a tuple of required_literals() sets (the rule can only fire when at least
+    one of them is met) or None when the rule has to be evaluated on every file.
+    The <regex> gates line matches; for RDL rules the FLAG pattern (the <regex> or the
+    first WHEN PRESENT / CURRENT_FILE_MATCHES pattern) gates both passing evidence
+    and RDL-suppressed entries. RDL rules without a FLAG pattern are never skipped.
+    """
+    gates = []
+    if rule["pattern"] is not None:
+        gates.append(prefilter.required_literals(rule["pattern_text"]))
+    if rule["rdl_logic_text"]:
+        if rule["flag_regex"] is None:
+            return None
+        gates.append(prefilter.required_literals(rule["flag_pattern_text"], re.IGNORECASE))
+    if not gates or any(gate is None for gate in gates):
+        return None
+    return tuple(gates)
+
+
+def _rule_may_match(rule, found_literals, content):
+    gates = rule["prefilter"]
+    if gates is None:
+        return True
+    return any(prefilter.requirement_met(gate, found_literals, content) for gate in gates)
+
+
+def _parse_source_rule_pack(rule_path):
+    """
+    Parse a platform/framework/common rule XML into a list of compiled rules.
+    Returns None when the XML cannot be parsed.
+    """
+    try:
+        root = ET.parse(rule_path).getroot()
+    except ET.ParseError as exc:
+        logger.error("Failed to parse rules file %s: %s", rule_path, exc)
+        return None
+
+    rules = []
+    for category in root:
+        category_name = category.get('name')
+        for rule_elem in category:
+            compiled = _compile_source_rule(rule_elem, rule_path, category_name)
+            if compiled is not None:
+                rules.append(compiled)
+    return rules
+
+
+# Bump whenever the cached rule layout or the prefilter extraction changes.
+RULE_PACK_CACHE_VERSION = 1
+
+_RDL_REF_PATTERN = re.compile(rb"<rdl_ref>\s*(?:<!\[CDATA\[)?(.*?)(?:\]\]>)?\s*</rdl_ref>", re.DOTALL)
+
+# Rule keys rebuilt by _compile_rule_patterns() instead of being cached.
+_COMPILED_RULE_KEYS = (
+    "invalid", "pattern", "full_pattern", "line_pattern", "exclude",
+    "flag_regex", "flag_line_regex", "context_regex", "rdl_program", "rdl_order", "prefilter",
+)
+
+
+def _rule_pack_digest(rule_path, xml_bytes):
+    """Hash of the rule XML and every RDL script it references."""
+    digest = hashlib.sha256(f"rulepack-v{RULE_PACK_CACHE_VERSION}\0".encode("utf-8"))
+    digest.update(xml_bytes)
+    for raw_ref in _RDL_REF_PATTERN.findall(xml_bytes):
+        logic_ref = xml_unescape(raw_ref.decode("utf-8", "replace")).strip()
+        digest.update(b"\0" + logic_ref.encode("utf-8") + b"\0")
+        try:
+            digest.update(_resolve_logic_file(rule_path, logic_ref).read_bytes())
+        except OSError:
+            digest.update(b"<missing>")
+    return digest.hexdigest()
+
+
+def _rule_pack_cache_path(rule_path):
+    resolved = str(Path(rule_path).resolve())
+    path_key = hashlib.sha256(resolved.encode("utf-8")).hexdigest()[:12]
+    return Path(state.rulePackCacheDir) / f"{Path(rule_path).stem}-{path_key}.json"
+
+
+def _read_rule_pack_cache(cache_path, digest):
+    try:
+        artifact = json.loads(cache_path.read_text(encoding="utf-8"))
+    except (OSError, ValueError):
+        return None
+    if not isinstance(artifact, dict) or artifact.get("digest") != digest:
+        return None
+    return artifact.get("rules")
+
+
+def _write_rule_pack_cache(cache_path, digest, rules):
+    cached_rules = []
+    for rule in rules:
+        entry = {key: value for key, value in rule.items() if key not in _COMPILED_RULE_KEYS}
+        entry["prefilter"] = (
+            [[[text, ignore_case] for text, ignore_case in sorted(gate)] for gate in rule["prefilter"]]
+            if rule["prefilter"] is not None else None
+        )
+        cached_rules.append(entry)
+
+    # Concurrent scans share DAKSH_CACHE_DIR, so each writer gets its own temp file.
+    tmp_path = None
+    try:
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            "w", encoding="utf-8", dir=cache_path.parent, prefix=cache_path.name + ".", suffix=".tmp", delete=False
+        ) as tmp_file:
+            tmp_path = tmp_file.name
+            json.dump({"digest": digest, "rules": cached_rules}, tmp_file)
+        os.replace(tmp_path, cache_path)
+    except OSError as exc:
+        logger.debug("Could not write rule pack cache %s: %s", cache_path, exc)
+        if tmp_path:
+            Path(tmp_path).unlink(missing_ok=True)
+
+
+def _restore_cached_rule(entry, rule_path):
+    rule = dict(entry)
+    cached_prefilter = rule.pop("prefilter", None)
+    _compile_rule_patterns(rule, rule_path)
+    rule["prefilter"] = None
+    if cached_prefilter is not None and not rule["invalid"]:
+        rule["prefilter"] = tuple(
+            frozenset((text, bool(ignore_case)) for text, ignore_case in gate)
+            for gate in cached_prefilter
+        )
+    return rule
+
+
+def _load_compiled_rule_pack(rule_path):
+    """
+    Load a rule pack, reusing the compiled artifact under runtime/cache/rulepacks
+    when neither the XML nor any RDL script it references has changed.
+
+    Returns (rules, digest): rules is None when the XML cannot be parsed and digest
+    is None when the XML cannot be read.
+    """
+    try:
+        xml_bytes = Path(rule_path).read_bytes()
+    except OSError:
+        return _parse_source_rule_pack(rule_path), None
+
+    digest = _rule_pack_digest(rule_path, xml_bytes)
+    cache_path = _rule_pack_cache_path(rule_path)
+    if state.rulePackCacheEnabled:
+        cached_rules = _read_rule_pack_cache(cache_path, digest)
+        if cached_rules is not None:
+            return [_restore_cached_rule(entry, rule_path) for entry in cached_rules], digest
+
+    rules = _parse_source_rule_pack(rule_path)
+    if rules is not None and state.rulePackCacheEnabled:
+        _write_rule_pack_cache(cache_path, digest, rules)
+    return rules, digest
+
+
+def _load_source_rule_pack(rule_path):
+    return _load_compiled_rule_pack(rule_path)[0]
+
+
+def _read_target_file(filepath):
+    with futils.readfile_FallbackEncoding(filepath) as fo_target:
+        return fo_target.read()
+
+
+# Lines longer than this are never matched in line mode (minified code, data blobs),
+# except in files discovery routed to window mode (--generated-files window).
+MAX_LINE_LENGTH = 500
+
+# Window mode searches an over-long line in MAX_LINE_LENGTH windows overlapping by
+# WINDOW_OVERLAP characters, and reports WINDOW_CONTEXT characters around a match.
+WINDOW_OVERLAP = 100
+WINDOW_CONTEXT = 60
+
+# "\n".join() of the file currently being matched and its line start offsets,
+# shared by all of its line-mode rules. Keyed on the file_lines object itself and
+# released with the newline index by _release_file_indexes().
+_joined_lines = (None, "", [])
+
+
+def _joined_line_index(file_lines):
+    """
+    Return file_lines joined with newlines, with lines over MAX_LINE_LENGTH blanked,
+    and the offset at which each line starts.
+    """
+    global _joined_lines
+    if _joined_lines[0] is not file_lines:
+        starts = []
+        offset = 0
+        kept = []
+        for line in file_lines:
+            if len(line) > MAX_LINE_LENGTH:
+                line = ""
+            starts.append(offset)
+            offset += len(line) + 1
+            kept.append(line)
+        _joined_lines = (file_lines, "\n".join(kept), starts)
+    return _joined_lines[1], _joined_lines[2]
+
+
+def _candidate_line_indexes(line_regex, file_lines):
+    """
+    Run a prefilter.line_searchable() pattern once over the whole file and return
+    the sorted indexes of the lines its matches touch.
+    """
+    if not file_lines:
+        return []
+    text, starts = _joined_line_index(file_lines)
+    touched = set()
+    for m in line_regex.finditer(text):
+        first = bisect.bisect_right(starts, m.start()) - 1
+        last = bisect.bisect_right(starts, m.end()) - 1
+        touched.update(range(first, last + 1))
+    return sorted(touched)
+
+
+def _search_windows(regex, exclude, line):
+    """
+    Return (snippet, match) for the first window of an over-long `line` that
+    `regex` matches and `exclude` does not, or None. `snippet` is the text around
+    the match, as reported in place of the whole line.
+    """
+    step = MAX_LINE_LENGTH - WINDOW_OVERLAP
+    for start in range(0, max(1, len(line) - WINDOW_OVERLAP), step):
+        window = line[start:start + MAX_LINE_LENGTH]
+        m = regex.search(window)
+        if not m:
+            continue
+        if exclude and exclude.search(window):
+            continue
+        return window[max(0, m.start() - WINDOW_CONTEXT):m.end() + WINDOW_CONTEXT], m
+    return None
+
+
+def _search_lines(regex, line_regex, exclude, file_lines, windowed=False):
+    """
+    Yield (linecount, line, match) for every line of up to MAX_LINE_LENGTH
+    characters that `regex` matches and `exclude` does not.
+
+    With a MULTILINE `line_regex` only the lines touched by its whole-file matches
+    are searched; otherwise every line is. With `windowed` longer lines are searched
+    in windows too (see _search_windows()), and yield the text around the match.
+    """
+    if line_regex is None or windowed:
+        indexes = range(len(file_lines))
+    else:
+        indexes = _candidate_line_indexes(line_regex, file_lines)
+    for index in indexes:
+        line = file_lines[index]
+        if len(line) > MAX_LINE_LENGTH:
+            if windowed:
+                found = _search_windows(regex, exclude, line)
+                if found:
+                    yield index + 1, found[0], found[1]
+            continue
+        m = regex.search(line)
+        if not m:
+            continue
+        if exclude and exclude.search(line):
+            continue
+        yield index + 1, line, m
+
+
+def _flag_line_evidence(rule, file_lines, existing, windowed=False):
+    """
+    Collect line-level FLAG matches for an RDL rule that are not already in `existing`.
+    Returns (added_items, any_flag_hit).
+    """
+    flag_regex = rule["flag_regex"]
+    exclude = rule["exclude"]
+    added = []
+    flag_hit = False
+    if flag_regex is None:
+        return added, flag_hit
+
+    seen = {ev[0] for ev in existing}
+    for linecount, line, _ in _search_lines(flag_regex, rule["flag_line_regex"], exclude, file_lines, windowed):
+        if linecount not in seen:
+            added.append((linecount, line, {}))
+            seen.add(linecount)
+        flag_hit = True
+    return added, flag_hit
+
+
+def _evaluate_source_rule(rule, platform_name, filepath, content, file_lines, record_suppressed=True, rdl_memo=None, rdl_stats=None, apply_baseline=True, windowed=False):
+    """
+    Apply one compiled rule to one in-memory target file.
+
+    Returns None when the rule produced nothing for the file, otherwise a dict with:
+        evidence            - evidence items that survived RDL and baseline suppression
+        suppressed          - RDL-rejected entries (without their "id", assigned on emit)
+        baseline_suppressed - number of evidence lines dropped by the suppression baseline
+        logic_meta          - RDL metadata to merge into the finding
+        candidate_count     - number of candidate lines before suppression
+
+    `rdl_memo` is a rdl_engine.PredicateMemo shared by all rules evaluated against
+    this file; `rdl_stats` is the rdl_engine.RdlStats that records RDL clauses.
+    With `apply_baseline` False the suppression baseline is left to the caller
+    (see _apply_source_baseline()). `windowed` also matches lines over
+    MAX_LINE_LENGTH, for minified files routed to window mode.
+    """
+    pattern = rule["pattern"]
+    exclude = rule["exclude"]
+    scan_cfg = rule["scan_cfg"]
+    rule_title = rule["title"]
+    category_name = rule["category"]
+
+    # candidate_evidence: list of (linecount, line, groups_dict)
+    candidate_evidence = []
+
+    if pattern is not None:
+        if scan_cfg["match_mode"] == "file":
+            matches = _match_full_file(pattern, content, file_lines, exclude, rule.get("full_pattern"))
+            for linecount, line, groups in matches:
+                candidate_evidence.append((linecount, line, groups))
+        else:
+            for linecount, line, m in _search_lines(pattern, rule["line_pattern"], exclude, file_lines, windowed):
+                groups = {k: v for k, v in m.groupdict().items() if v is not None}
+                candidate_evidence.append((linecount, line, groups))
+
+    rdl_logic_text = rule["rdl_logic_text"]
+    active_logic_meta = {}
+    suppressed_entries = []
+
+    if rdl_logic_text:
+        # Decide pass/fail first, trying clauses in cost order; the script-order
+        # trace and fail_reason are only built when the result is reported.
+        rdl_passes, rdl_known = rdl_engine.check_rdl(
+            rule["rdl_program"],
+            file_text=content,
+            file_path=filepath,
+            memo=rdl_memo,
+            order=rule["rdl_order"],
+            stats=rdl_stats,
+        )
+        failed_flag_evidence = None
+        if not rdl_passes and not candidate_evidence:
+            # A rejected file without candidates only reports FLAG lines as suppressed.
+            if not record_suppressed:
+                return None
+            failed_flag_evidence, _ = _flag_line_evidence(rule, file_lines, [], windowed)
+            if not failed_flag_evidence:
+                return None
+
+        rdl_result = rdl_engine.evaluate_rdl(
+            rule["rdl_program"],
+            file_text=content,
+            file_path=filepath,
+            project_root=state.sourcedir,
+            memo=rdl_memo,
+            known=rdl_known,
+        )
+        active_logic_passes = bool(rdl_result.get("passes"))
+        active_logic_reason = rdl_result.get("fail_reason", "")
+        active_logic_meta = _build_logic_meta(
+            "rdl",
+            rule["rdl_ref"],
+            logic_result=rdl_result,
+        )
+
+        if active_logic_passes:
+            # RDL passed — add FLAG evidence not already in candidate_evidence
+            added, rdl_evidence_added = _flag_line_evidence(rule, file_lines, candidate_evidence, windowed)
+            candidate_evidence.extend(added)
+            if not rdl_evidence_added and not rule["flag_pattern_text"] and file_lines:
+                candidate_evidence.append((1, "[RDL condition matched]", {}))
+
+        elif record_suppressed and active_logic_reason not in (
+            "FLAG pattern not found in file", "Invalid FLAG pattern in RDL"
+        ):
+            # RDL IF() condition rejected candidates — record them as suppressed FPs.
+            # Build evidence from regex matches plus any FLAG line-level matches
+            # (so RDL-only rules with no <regex> also produce suppressed entries).
+            rdl_suppressed_evidence = list(candidate_evidence)
+            if failed_flag_evidence is None:
+                failed_flag_evidence, _ = _flag_line_evidence(rule, file_lines, rdl_suppressed_evidence, windowed)
+            rdl_suppressed_evidence.extend(failed_flag_evidence)
+
+            if rdl_suppressed_evidence:
+                rel_path = futils.get_source_file_path(state.sourcedir, filepath)
+                ctx_type = scan_cfg["context_type"]
+                lines_before = scan_cfg["context_lines_before"]
+                lines_after = scan_cfg["context_lines_after"]
+
+                for linecount, line, groups in rdl_suppressed_evidence:
+                    short_line = (line[:75] + '..') if len(line) > 300 else line
+                    sup_entry = {
+                        "platform": platform_name,
+                        "rule_title": rule_title,
+                        "category": category_name,
+                        "file": rel_path,
+                        "line": linecount,
+                        "code": short_line.strip(),
+                        "rdl_text": rdl_logic_text,
+                        "rdl_condition": f"RDL:{rule['rdl_ref']}",
+                        "suppression_reason": active_logic_reason,
+                        "suppressed_at": None,
+                        "status": "suppressed",
+                    }
+                    _merge_logic_meta(sup_entry, active_logic_meta)
+                    if ctx_type == "lines" and (lines_before > 0 or lines_after > 0):
+                        ctx_before, ctx_after = _collect_context_lines(
+                            file_lines, linecount, lines_before, lines_after
+                        )
+                        if ctx_before:
+                            sup_entry["context_before"] = ctx_before
+                        if ctx_after:
+                            sup_entry["context_after"] = ctx_after
+                    suppressed_entries.append(sup_entry)
+                # Clear candidates so they don't appear in active findings
+                candidate_evidence = []
+
+    if not candidate_evidence and not suppressed_entries:
+        return None
+
+    rel_path = futils.get_source_file_path(state.sourcedir, filepath)
+    seen_lines = set()
+    ctx_type = scan_cfg["context_type"]
+    lines_before = scan_cfg["context_lines_before"]
+    lines_after = scan_cfg["context_lines_after"]
+    baseline_suppressed = 0
+    file_evidence_items = []
+
+    for linecount, line, groups in candidate_evidence:
+        if linecount in seen_lines:
+            continue
+        seen_lines.add(linecount)
+
+        short_line = (line[:75] + '..') if len(line) > 300 else line
+        if apply_baseline and supp.is_suppressed(
+            state.suppressions,
+            platform_name,
+            rule_title,
+            category_name,
+            rel_path,
+            linecount,
+            short_line.strip(),
+        ):
+            baseline_suppressed += 1
+            continue
+
+        ev_item = {
+            "file": rel_path,
+            "line": linecount,
+            "code": short_line.strip(),
+        }
+
+        if ctx_type == "named_groups" and groups:
+            ev_item["groups"] = groups
+        elif ctx_type == "lines" and (lines_before > 0 or lines_after > 0):
+            ctx_before, ctx_after = _collect_context_lines(
+                file_lines, linecount, lines_before, lines_after
+            )
+            if ctx_before:
+                ev_item["context_before"] = ctx_before
+            if ctx_after:
+                ev_item["context_after"] = ctx_after
+        elif ctx_type == "backward" and rule["context_regex"] is not None:
+            back_regex = rule["context_regex"]
+            depth = scan_cfg["context_depth"]
+            idx = linecount - 1
+            for i in range(idx - 1, max(-1, idx - depth - 1), -1):
+                bm = back_regex.search(file_lines[i])
+                if bm:
+                    groups_back = bm.groups()
+                    ev_item["context_label"] = groups_back[0] if groups_back else bm.group(0)
+                    break
+
+        file_evidence_items.append(ev_item)
+
+    return {
+        "rel_path": rel_path,
+        "evidence": file_evidence_items,
+        "suppressed": suppressed_entries,
+        "baseline_suppressed": baseline_suppressed,
+        "logic_meta": active_logic_meta,
+        "candidate_count": len(candidate_evidence),
+    }
+
+
+def _apply_source_baseline(outcome, platform_name, rule):
+    """
+    Drop the evidence of `outcome` that the suppression baseline covers, as
+    _evaluate_source_rule() does with `apply_baseline` set. Returns a new outcome.
+    """
+    if not state.suppressions or not outcome["evidence"]:
+        return outcome
+    kept = [
+        ev for ev in outcome["evidence"]
+        if not supp.is_suppressed(
+            state.suppressions,
+            platform_name,
+            rule["title"],
+            rule["category"],
+            outcome["rel_path"],
+            ev["line"],
+            ev["code"],
+        )
+    ]
+    return {
+        **outcome,
+        "evidence": kept,
+        "baseline_suppressed": outcome["baseline_suppressed"] + len(outcome["evidence"]) - len(kept),
+    }
+
+
+def _rebase_outcome(outcome, rel_path):
+    """Return a copy of `outcome`, evaluated on an identical file, as found at `rel_path`."""
+    return {
+        **outcome,
+        "rel_path": rel_path,
+        "evidence": [{**ev, "file": rel_path} for ev in outcome["evidence"]],
+        "suppressed": [{**entry, "file": rel_path} for entry in outcome["suppressed"]],
+    }
+
+
+def _findings_spool_path(json_path):
+    return Path(state.runtime_dirpath) / f"{Path(json_path).stem}.jsonl"
+
+
+def _open_findings_sink(findings_json_path, suppressed_json_path, outputfile):
+    """
+    Open the append-only JSONL spools that findings and suppressed entries are
+    streamed to. finalize_source_findings() compacts them into the JSON reports.
+    """
+    def _appender(json_path):
+        if not json_path:
+            return JsonlAppender(None)
+        return JsonlAppender(_findings_spool_path(json_path), seed_json_path=json_path)
+
+    return {
+        "findings": _appender(findings_json_path),
+        "suppressed": _appender(suppressed_json_path),
+        "scanout": outputfile,
+    }
+
+
+def _close_findings_sink(sink):
+    for key in ("findings", "suppressed"):
+        sink[key].commit()
+        sink[key].close()
+
+
+def finalize_source_findings(findings_json_path, suppressed_json_path=None):
+    """
+    Write areas_of_interest.json (and suppressed_findings.json when anything was
+    suppressed) from the JSONL spools filled by source_parser()/scan_source_packs().
+    """
+    if not findings_json_path:
+        return
+    if suppressed_json_path is None:
+        suppressed_json_path = str(Path(findings_json_path).parent / "suppressed_findings.json")
+    compact_jsonl(_findings_spool_path(findings_json_path), findings_json_path)
+    compact_jsonl(_findings_spool_path(suppressed_json_path), suppressed_json_path, write_empty=False)
+
+
+def discard_source_findings(findings_json_path, suppressed_json_path=None):
+    """
+    Remove the findings of an earlier, interrupted run: the JSONL spools with their
+    commit points and the JSON reports they would otherwise be seeded from.
+    """
+    if suppressed_json_path is None:
+        suppressed_json_path = str(Path(findings_json_path).parent / "suppressed_findings.json")
+    for json_path in (findings_json_path, suppressed_json_path):
+        discard_jsonl(_findings_spool_path(json_path))
+        try:
+            Path(json_path).unlink()
+        except FileNotFoundError:
+            pass
+
+
+def _emit_rule_results(sink, platform_name, rule, file_outcomes, rule_no, progress_callback=None, file_blobs=None):
+    """
+    Fold one rule's per-file outcomes (in target-file order) into the findings sink.
+
+    `file_outcomes` yields (file_index, filepath, outcome) where outcome is the
+    value returned by _evaluate_source_rule. With `file_blobs` ({filepath:
+    content_hash}) evidence from a copy of an earlier file with the same matches is
+    not repeated; the copy is listed in the "locations" of the first one's
+    evidence instead. Returns (rule_no, matched).
+    """
+    findings_sink = sink["findings"]
+    suppressed_sink = sink["suppressed"]
+    f_scanout = sink["scanout"]
+    rule_title = rule["title"]
+    category_name = rule["category"]
+    scan_cfg = rule["scan_cfg"]
+    do_aggregate = (scan_cfg["aggregate"] == "file")
+    finding = None
+    score_inputs = _SourceScoreAccumulator()
+    # content_hash -> (match signature, evidence entries) of each blob's first copy
+    first_copies = {}
+
+    for file_index, filepath, outcome in file_outcomes:
+        if outcome is None:
+            continue
+
+        for sup_entry in outcome["suppressed"]:
+            suppressed_sink.append({"id": f"sup_{suppressed_sink.count + 1}", **sup_entry})
+            state.suppressedFindingsCnt += 1
+        state.suppressedFindingsCnt += outcome["baseline_suppressed"]
+
+        file_evidence_items = outcome["evidence"]
+        if not file_evidence_items:
+            continue
+
+        rel_path = outcome["rel_path"]
+        active_logic_meta = outcome["logic_meta"]
+
+        blob_hash = file_blobs.get(filepath) if file_blobs is not None else None
+        first_copy = None
+        if blob_hash:
+            signature = [(ev["line"], ev["code"]) for ev in file_evidence_items]
+            first_copy = first_copies.get(blob_hash)
+            if first_copy is not None and first_copy[0] != signature:
+                first_copy = None
+
+        if finding is None:
+            if rule_no > 0 and f_scanout:
+                f_scanout.write("\n\n")
+            rule_no += 1
+            state.rulesMatchCnt += 1
+
+            if f_scanout:
+                f_scanout.write(
+                    f"\n{platform_name}-{rule_no}. Rule Title: {rule_title}\n"
+                    f"\n\t Rule Description  : {rule['rule_desc']}"
+                    f"\n\t Issue Description : {rule['vuln_desc']}"
+                    f"\n\t Developer Note    : {rule['dev_note']}"
+                    f"\n\t Reviewer Note     : {rule['rev_note']}\n"
+                )
+
+            finding = {
+                "platform": platform_name,
+                "rule_id": f"{platform_name}-{rule_no}",
+                "rule_title": rule_title,
+                "category": category_name,
+                "issue_scope": _derive_issue_scope(category_name, platform_name),
+                "rule_desc": rule["rule_desc"],
+                "issue_desc": rule["vuln_desc"],
+                "developer_note": rule["dev_note"],
+                "reviewer_note": rule["rev_note"],
+                "confidence_score": 0,
+                "confidence_level": "low",
+                "scan_config": scan_cfg,
+                "evidence": [],
+            }
+            _merge_logic_meta(finding, active_logic_meta)
+
+        if first_copy is not None:
+            # A copy of an earlier file with the same matches: list it as another
+            # location of that file's evidence, scoring it as if it were reported.
+            for entry in first_copy[1]:
+                entry.setdefault("locations", [entry["file"]]).append(rel_path)
+            if f_scanout:
+                f_scanout.write(f"\n\t -> Identical File: {rel_path}")
+            for ev_item in ([{"file": rel_path, "aggregated": True}] if do_aggregate else file_evidence_items):
+                score_inputs.add(ev_item)
+            state.collapsedDuplicateCnt += 1
+        elif do_aggregate:
+            # All matches in this file collapse into one aggregate evidence entry
+            agg_entry = {
+                "file": rel_path,
+                "aggregated": True,
+                "matches": [
+                    {"line": ev["line"], "code": ev["code"], **
+                     ({"groups": ev["groups"]} if "groups" in ev else {})}
+                    for ev in file_evidence_items
+                ],
+            }
+            if f_scanout:
+                for ev in file_evidence_items:
+                    f_scanout.write(f"\n\t -> Source File: {rel_path}\n\t\t [{ev['line']}] {ev['code']}")
+            finding["evidence"].append(agg_entry)
+            score_inputs.add(agg_entry)
+            added_entries = [agg_entry]
+        else:
+            for ev_item in file_evidence_items:
+                if f_scanout:
+                    f_scanout.write(
+                        f"\n\t -> Source File: {rel_path}\n"
+                        f"\t\t [{ev_item['line']}] {ev_item['code']}"
+                    )
+                finding["evidence"].append(ev_item)
+                score_inputs.add(ev_item)
+            added_entries = file_evidence_items
+        if blob_hash and blob_hash not in first_copies:
+            first_copies[blob_hash] = (signature, added_entries)
+        _merge_logic_meta(finding, active_logic_meta)
+
+        score = score_inputs.score(
+            has_regex=bool(rule["pattern_text"]),
+            has_rdl=bool(rule["rdl_ref"]),
+            has_descriptions=bool(rule["rule_desc"] or rule["vuln_desc"]),
+        )
+        finding["confidence_score"] = score
+        finding["confidence_level"] = _confidence_level(score)
+
+        if callable(progress_callback):
+            progress_callback({
+                "scope": "source_parser",
+                "platform": platform_name,
+                "category": category_name,
+                "rule_title": rule_title,
+                "file_index": file_index,
+                "filepath": filepath,
+                "matched_evidence_count": outcome["candidate_count"],
+                "rules_match_count": state.rulesMatchCnt,
+                "suppressed_count": state.suppressedFindingsCnt,
+            })
+
+    if finding is not None:
+        findings_sink.append(finding)
+    return rule_no, finding is not None
+
+
+def _print_parsing_file(counter, filepath):
+    if str(state.verbosity) == '1':
+        if len(filepath) > 50:
+            print('\t Parsing file: ' + "[" + str(counter) + "] " + futils.get_short_path(filepath), end='\r')
+        else:
+            print('\t Parsing file: ' + "[" + str(counter) + "] " + filepath, end='\r')
+    else:
+        print('\t Parsing file: ' + "[" + str(counter) + "] " + futils.get_source_file_path(state.sourcedir, filepath), end='\r')
+
+    sys.stdout.write("\033[K")
+
+
 def source_parser(rule_input, targetfile, outputfile=None, findings_json_path=None, suppressed_json_path=None, progress_callback=None):
     """
     Parses rules from XML files and applies them to target files.
     Supports both individual Path and dictionary of Paths as input.
 
+    This is the rule-major engine: each rule is applied to every target file in
+    turn. See scan_source_packs() for the file-major engine.
+
     Parameters:
         rule_input (dict or Path): Rule file paths or a single Path to an XML file.
         targetfile (str): File containing paths of target source files.
@@ -484,119 +1410,55 @@ def source_parser(rule_input, targetfile, outputfile=None, findings_json_path=No
     else:
         raise TypeError(f"Expected a dict or Path, but got {type(rule_input)}")
 
-    f_scanout = outputfile
     f_targetfiles = targetfile
-    findings_json = []
-    if findings_json_path and Path(findings_json_path).exists():
-        try:
-            findings_json = json.loads(Path(findings_json_path).read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError, TypeError, ValueError):
-            findings_json = []
 
     # Derive suppressed_json_path from findings_json_path if not explicitly provided
     if suppressed_json_path is None and findings_json_path:
         suppressed_json_path = str(Path(findings_json_path).parent / "suppressed_findings.json")
 
-    suppressed_json = []
-    if suppressed_json_path and Path(suppressed_json_path).exists():
-        try:
-            suppressed_json = json.loads(Path(suppressed_json_path).read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError, TypeError, ValueError):
-            suppressed_json = []
+    sink = _open_findings_sink(findings_json_path, suppressed_json_path, outputfile)
 
-    iCnt = 0
     rule_no = state.rCnt
     error_count = 0
     matched_rules = []
     unmatched_rules = []
 
     for rule_path in rule_paths:
-        try:
-            xmltree = ET.parse(rule_path)
-            root = xmltree.getroot()
-        except ET.ParseError as exc:
-            logger.error("Failed to parse rules file %s: %s", rule_path, exc)
+        rules = _load_source_rule_pack(rule_path)
+        if rules is None:
             continue
 
         platform_name = rule_path.stem.upper()
         rule_no = 0
 
-        if f_scanout:
-            f_scanout.write(f"\n--- {platform_name} Findings ---\n")
-
-        for category in root:
-            category_name = category.get('name')
-            if category_name:
-                print(f"         [-] Category: {category_name}")
-
-            for rule in category:
-                rule_title = (rule.findtext("name") or "").strip()
-                pattern_text = (rule.findtext("regex") or "").strip()
-                rdl_text = (rule.findtext("rdl") or "").strip()
-                rdl_ref = (rule.findtext("rdl_ref") or "").strip()
-                rule_desc = (rule.findtext("rule_desc") or "").strip()
-                vuln_desc = (rule.findtext("vuln_desc") or "").strip()
-                dev_note = (rule.findtext("developer") or "").strip()
-                rev_note = (rule.findtext("reviewer") or "").strip()
-                exclude_text = (rule.findtext("exclude") or "").strip()
-                scan_cfg = _parse_scan_config(rule)
-
-                if not rule_title or (not pattern_text and not rdl_ref):
-                    logger.warning("Skipping malformed rule in %s under category %s", rule_path, category_name)
-                    continue
+        if outputfile:
+            outputfile.write(f"\n--- {platform_name} Findings ---\n")
 
-                pattern = None
-                if pattern_text:
-                    try:
-                        pattern = re.compile(pattern_text)
-                    except re.error as exc:
-                        logger.error("Invalid regex in rule %s (%s): %s", rule_title, rule_path, exc)
-                        unmatched_rules.append(rule_title)
-                        continue
+        current_category = None
+        for rule in rules:
+            if rule["category"] != current_category:
+                current_category = rule["category"]
+                if current_category:
+                    print(f"         [-] Category: {current_category}")
 
-                exclude = None
-                if exclude_text:
-                    try:
-                        exclude = re.compile(exclude_text, re.IGNORECASE)
-                    except re.error as exc:
-                        logger.error("Invalid exclude regex in rule %s (%s): %s", rule_title, rule_path, exc)
-                        exclude = None
-
-                if str(state.verbosity) in ('1', '2'):
-                    print(f"         [-] Applying Rule: {rule_title}", end='\r')
-                else:
-                    sys.stdout.write("\033[K")
-                    print(f"         [-] Applying Rule: {rule_title}")
-
-                finding_index = None
-                rule_has_unsuppressed_match = False
-                logic_file_path = _resolve_logic_file(rule_path, rdl_ref) if rdl_ref else None
-                rdl_logic_text = ""
-                if logic_file_path and logic_file_path.exists():
-                    try:
-                        rdl_logic_text = rdl_engine.load_rdl(logic_file_path)
-                    except OSError as exc:
-                        logger.error("Failed to read RDL file %s for rule %s: %s", logic_file_path, rule_title, exc)
-                        rdl_logic_text = ""
-                rdl_logic_evidence_pattern = _extract_rdl_logic_evidence_pattern(rdl_logic_text)
+            if rule["invalid"]:
+                unmatched_rules.append(rule["title"])
+                continue
 
+            if str(state.verbosity) in ('1', '2'):
+                print(f"         [-] Applying Rule: {rule['title']}", end='\r')
+            else:
+                sys.stdout.write("\033[K")
+                print(f"         [-] Applying Rule: {rule['title']}")
+
+            def _file_outcomes(rule=rule):
+                nonlocal error_count
                 for file_index, eachfilepath in enumerate(f_targetfiles, start=1):
                     filepath = eachfilepath.rstrip()
-                    iCnt += 1
-
-                    if str(state.verbosity) == '1':
-                        if len(filepath) > 50:
-                            print('\t Parsing file: ' + "[" + str(iCnt) + "] " + futils.get_short_path(filepath), end='\r')
-                        else:
-                            print('\t Parsing file: ' + "[" + str(iCnt) + "] " + filepath, end='\r')
-                    else:
-                        print('\t Parsing file: ' + "[" + str(iCnt) + "] " + futils.get_source_file_path(state.sourcedir, filepath), end='\r')
-
-                    sys.stdout.write("\033[K")
+                    _print_parsing_file(file_index, filepath)
 
                     try:
-                        with futils.readfile_FallbackEncoding(filepath) as fo_target:
-                            content = fo_target.read()
+                        content = _read_target_file(filepath)
                     except (FileNotFoundError, PermissionError, UnicodeError, IOError) as exc:
                         print(f"Error processing {filepath}: {exc}")
                         error_count += 1
@@ -604,8 +1466,8 @@ def source_parser(rule_input, targetfile, outputfile=None, findings_json_path=No
                             progress_callback({
                                 "scope": "source_parser",
                                 "platform": platform_name,
-                                "category": category_name,
-                                "rule_title": rule_title,
+                                "category": rule["category"],
+                                "rule_title": rule["title"],
                                 "file_index": file_index,
                                 "filepath": filepath,
                                 "status": "read_error",
@@ -613,367 +1475,550 @@ def source_parser(rule_input, targetfile, outputfile=None, findings_json_path=No
                             })
                         continue
 
-                    file_lines = content.splitlines()
-                    # candidate_evidence: list of (linecount, line, groups_dict)
-                    candidate_evidence = []
-
-                    use_file_mode = (scan_cfg["match_mode"] == "file")
-
-                    if pattern is not None:
-                        if use_file_mode:
-                            for linecount, line, groups in _match_full_file(pattern, content, file_lines, exclude):
-                                candidate_evidence.append((linecount, line, groups))
-                        else:
-                            for linecount, line in enumerate(file_lines, start=1):
-                                if len(line) > 500:
-                                    continue
-                                if not pattern.search(line):
-                                    continue
-                                if exclude and exclude.search(line):
-                                    continue
-                                m = pattern.search(line)
-                                groups = m.groupdict() if m else {}
-                                groups = {k: v for k, v in groups.items() if v is not None}
-                                candidate_evidence.append((linecount, line, groups))
-
-                    rdl_result = None
-                    use_rdl_logic = bool(rdl_logic_text)
-                    if use_rdl_logic:
-                        rdl_result = rdl_engine.evaluate_rdl_with_reason(
-                            rdl_logic_text,
-                            file_text=content,
-                            file_path=filepath,
-                            project_root=state.sourcedir,
-                        )
-
-                    active_logic_meta = {}
-                    active_logic_passes = None
-                    active_logic_reason = ""
-
-                    if use_rdl_logic and rdl_result is not None:
-                        active_logic_passes = bool(rdl_result.get("passes"))
-                        active_logic_reason = rdl_result.get("fail_reason", "")
-                        active_logic_meta = _build_logic_meta(
-                            "rdl",
-                            rdl_ref,
-                            logic_result=rdl_result,
-                        )
-
-                    if use_rdl_logic:
-                        if active_logic_passes:
-                            # RDL passed — add FLAG evidence not already in candidate_evidence
-                            flag_pattern_rdl = pattern_text or rdl_logic_evidence_pattern
-                            rdl_evidence_added = False
-                            if flag_pattern_rdl:
-                                try:
-                                    flag_regex = re.compile(flag_pattern_rdl, re.IGNORECASE)
-                                    for linecount, line in enumerate(file_lines, start=1):
-                                        if len(line) > 500:
-                                            continue
-                                        if not flag_regex.search(line):
-                                            continue
-                                        if exclude and exclude.search(line):
-                                            continue
-                                        if not any(ev[0] == linecount for ev in candidate_evidence):
-                                            candidate_evidence.append((linecount, line, {}))
-                                        rdl_evidence_added = True
-                                except re.error as exc:
-                                    logger.error("Invalid FLAG regex in RDL for rule %s (%s): %s", rule_title, rule_path, exc)
-                            if not rdl_evidence_added and not flag_pattern_rdl and file_lines:
-                                candidate_evidence.append((1, "[RDL condition matched]", {}))
-
-                        elif suppressed_json_path and active_logic_reason not in (
-                            "FLAG pattern not found in file", "Invalid FLAG pattern in RDL"
-                        ):
-                            # RDL IF() condition rejected candidates — record them as suppressed FPs.
-                            # Build evidence from regex matches plus any FLAG line-level matches
-                            # (so RDL-only rules with no <regex> also produce suppressed entries).
-                            rdl_suppressed_evidence = list(candidate_evidence)
-                            flag_pattern_rdl = pattern_text or rdl_logic_evidence_pattern
-                            if flag_pattern_rdl:
-                                try:
-                                    flag_regex = re.compile(flag_pattern_rdl, re.IGNORECASE)
-                                    for linecount, line in enumerate(file_lines, start=1):
-                                        if len(line) > 500:
-                                            continue
-                                        if not flag_regex.search(line):
-                                            continue
-                                        if exclude and exclude.search(line):
-                                            continue
-                                        if not any(ev[0] == linecount for ev in rdl_suppressed_evidence):
-                                            rdl_suppressed_evidence.append((linecount, line, {}))
-                                except re.error:
-                                    pass
-
-                            if rdl_suppressed_evidence:
-                                rdl_condition = f"RDL:{rdl_ref}"
-                                logic_text = rdl_logic_text
-
-                                rel_path = futils.get_source_file_path(state.sourcedir, filepath)
-                                ctx_type = scan_cfg["context_type"]
-                                lines_before = scan_cfg["context_lines_before"]
-                                lines_after = scan_cfg["context_lines_after"]
-
-                                for linecount, line, groups in rdl_suppressed_evidence:
-                                    short_line = (line[:75] + '..') if len(line) > 300 else line
-                                    sup_entry = {
-                                        "id": f"sup_{len(suppressed_json) + 1}",
-                                        "platform": platform_name,
-                                        "rule_title": rule_title,
-                                        "category": category_name,
-                                        "file": rel_path,
-                                        "line": linecount,
-                                        "code": short_line.strip(),
-                                        "rdl_text": logic_text,
-                                        "rdl_condition": rdl_condition,
-                                        "suppression_reason": active_logic_reason,
-                                        "suppressed_at": None,
-                                        "status": "suppressed",
-                                    }
-                                    _merge_logic_meta(sup_entry, active_logic_meta)
-                                    if ctx_type == "lines" and (lines_before > 0 or lines_after > 0):
-                                        ctx_before, ctx_after = _collect_context_lines(
-                                            file_lines, linecount, lines_before, lines_after
-                                        )
-                                        if ctx_before:
-                                            sup_entry["context_before"] = ctx_before
-                                        if ctx_after:
-                                            sup_entry["context_after"] = ctx_after
-                                    suppressed_json.append(sup_entry)
-                                    state.suppressedFindingsCnt += 1
-                                # Clear candidates so they don't appear in active findings
-                                candidate_evidence = []
-
-                    if not candidate_evidence:
-                        continue
-
-                    rel_path = futils.get_source_file_path(state.sourcedir, filepath)
-                    seen_lines = set()
-                    ctx_type = scan_cfg["context_type"]
-                    lines_before = scan_cfg["context_lines_before"]
-                    lines_after = scan_cfg["context_lines_after"]
-                    do_aggregate = (scan_cfg["aggregate"] == "file")
-
-                    # For aggregate:file, collect all passing evidence first, then emit one entry
-                    file_evidence_items = []
-
-                    for linecount, line, groups in candidate_evidence:
-                        if linecount in seen_lines:
-                            continue
-                        seen_lines.add(linecount)
-
-                        short_line = (line[:75] + '..') if len(line) > 300 else line
-                        if supp.is_suppressed(
-                            state.suppressions,
-                            platform_name,
-                            rule_title,
-                            category_name,
-                            rel_path,
-                            linecount,
-                            short_line.strip(),
-                        ):
-                            state.suppressedFindingsCnt += 1
-                            continue
-
-                        ev_item = {
-                            "file": rel_path,
-                            "line": linecount,
-                            "code": short_line.strip(),
-                        }
-
-                        if ctx_type == "named_groups" and groups:
-                            ev_item["groups"] = groups
-                        elif ctx_type == "lines" and (lines_before > 0 or lines_after > 0):
-                            ctx_before, ctx_after = _collect_context_lines(
-                                file_lines, linecount, lines_before, lines_after
-                            )
-                            if ctx_before:
-                                ev_item["context_before"] = ctx_before
-                            if ctx_after:
-                                ev_item["context_after"] = ctx_after
-                        elif ctx_type == "backward" and scan_cfg["context_pattern"]:
-                            try:
-                                back_regex = re.compile(scan_cfg["context_pattern"])
-                                depth = scan_cfg["context_depth"]
-                                idx = linecount - 1
-                                for i in range(idx - 1, max(-1, idx - depth - 1), -1):
-                                    bm = back_regex.search(file_lines[i])
-                                    if bm:
-                                        groups_back = bm.groups()
-                                        ev_item["context_label"] = groups_back[0] if groups_back else bm.group(0)
-                                        break
-                            except re.error:
-                                pass
-
-                        file_evidence_items.append(ev_item)
-
-                    if not file_evidence_items:
-                        continue
-
-                    if finding_index is None:
-                        if rule_no > 0 and f_scanout:
-                            f_scanout.write("\n\n")
-                        rule_no += 1
-                        state.rulesMatchCnt += 1
-                        matched_rules.append(rule_title)
-                        rule_has_unsuppressed_match = True
-
-                        if f_scanout:
-                            f_scanout.write(
-                                f"\n{platform_name}-{rule_no}. Rule Title: {rule_title}\n"
-                                f"\n\t Rule Description  : {rule_desc}"
-                                f"\n\t Issue Description : {vuln_desc}"
-                                f"\n\t Developer Note    : {dev_note}"
-                                f"\n\t Reviewer Note     : {rev_note}\n"
-                            )
-
-                        findings_json.append({
-                            "platform": platform_name,
-                            "rule_id": f"{platform_name}-{rule_no}",
-                            "rule_title": rule_title,
-                            "category": category_name,
-                            "issue_scope": _derive_issue_scope(category_name, platform_name),
-                            "rule_desc": rule_desc,
-                            "issue_desc": vuln_desc,
-                            "developer_note": dev_note,
-                            "reviewer_note": rev_note,
-                            "confidence_score": 0,
-                            "confidence_level": "low",
-                            "scan_config": scan_cfg,
-                            "evidence": [],
-                        })
-                        _merge_logic_meta(findings_json[-1], active_logic_meta)
-                        finding_index = len(findings_json) - 1
-
-                    if do_aggregate:
-                        # All matches in this file collapse into one aggregate evidence entry
-                        agg_entry = {
-                            "file": rel_path,
-                            "aggregated": True,
-                            "matches": [
-                                {"line": ev["line"], "code": ev["code"], **
-                                 ({"groups": ev["groups"]} if "groups" in ev else {})}
-                                for ev in file_evidence_items
-                            ],
-                        }
-                        if f_scanout:
-                            for ev in file_evidence_items:
-                                f_scanout.write(f"\n\t -> Source File: {rel_path}\n\t\t [{ev['line']}] {ev['code']}")
-                        findings_json[finding_index]["evidence"].append(agg_entry)
-                    else:
-                        for ev_item in file_evidence_items:
-                            if f_scanout:
-                                f_scanout.write(
-                                    f"\n\t -> Source File: {rel_path}\n"
-                                    f"\t\t [{ev_item['line']}] {ev_item['code']}"
-                                )
-                            findings_json[finding_index]["evidence"].append(ev_item)
-                    _merge_logic_meta(findings_json[finding_index], active_logic_meta)
-
-                    score = _compute_source_confidence_score(
-                        findings_json[finding_index].get("evidence", []),
-                        has_regex=bool(pattern_text),
-                        has_rdl=bool(rdl_ref),
-                        has_descriptions=bool(rule_desc or vuln_desc),
+                    outcome = _evaluate_source_rule(
+                        rule,
+                        platform_name,
+                        filepath,
+                        content,
+                        content.splitlines(),
+                        record_suppressed=bool(suppressed_json_path),
+                        rdl_stats=_get_rdl_stats(),
+                        windowed=filepath in state.generatedWindowFiles,
                     )
-                    findings_json[finding_index]["confidence_score"] = score
-                    findings_json[finding_index]["confidence_level"] = _confidence_level(score)
-
-                    if callable(progress_callback):
-                        progress_callback({
-                            "scope": "source_parser",
-                            "platform": platform_name,
-                            "category": category_name,
-                            "rule_title": rule_title,
-                            "file_index": file_index,
-                            "filepath": filepath,
-                            "matched_evidence_count": len(candidate_evidence),
-                            "rules_match_count": state.rulesMatchCnt,
-                            "suppressed_count": state.suppressedFindingsCnt,
-                        })
-
-                f_targetfiles.seek(0)
-                state.rCnt = rule_no
-                iCnt = 0
-
-                if not rule_has_unsuppressed_match:
-                    unmatched_rules.append(rule_title)
+                    # The file is read again for the next rule, so its indexes are never reused.
+                    _release_file_indexes()
+                    yield file_index, filepath, outcome
+
+            rule_no, matched = _emit_rule_results(
+                sink, platform_name, rule, _file_outcomes(), rule_no, progress_callback
+            )
+            if matched:
+                matched_rules.append(rule["title"])
+            else:
+                unmatched_rules.append(rule["title"])
+
+            f_targetfiles.seek(0)
+            state.rCnt = rule_no
 
     matched_rules = list(set(matched_rules))
     unmatched_rules = list(set(unmatched_rules))
     state.parseErrorCnt += error_count
+    _close_findings_sink(sink)
+
+    return matched_rules, unmatched_rules
+
+
+# Bump whenever _evaluate_source_rule() output changes for the same inputs.
+RESULT_CACHE_VERSION = 1
+# Fresh result-cache rows are written in batches of this size during a scan.
+RESULT_CACHE_BATCH_ROWS = 500
+
+
+def _content_hash(content):
+    return hashlib.sha256(content.encode("utf-8", "surrogatepass")).hexdigest()
 
-    if findings_json_path:
-        try:
-            out_path = Path(findings_json_path)
-            out_path.parent.mkdir(parents=True, exist_ok=True)
-            out_path.write_text(json.dumps(findings_json, indent=2), encoding="utf-8")
-        except OSError as exc:
-            logger.error("Failed to write findings JSON %s: %s", findings_json_path, exc)
 
-    if suppressed_json_path and suppressed_json:
+def _result_cache_keys(rule_path, platform_name, digest, rules, record_suppressed):
+    """
+    Return (pack_key, scope) for the per-file result cache, or (None, None) when the
+    pack cannot be cached. The pack key covers everything besides the file itself
+    that feeds _evaluate_source_rule(): compiled pack, project root, suppression
+    baseline, the project files matched by OBSERVE PROJECT_HAS_GLOB and, in window
+    mode, the settings that route minified files to windowed matching.
+    """
+    if digest is None:
+        return None, None
+    project = state.target_dirpath or state.sourcedir
+    scope = hashlib.sha256(f"{project}\0{Path(rule_path).resolve()}".encode("utf-8")).hexdigest()
+    key = hashlib.sha256(f"results-v{RESULT_CACHE_VERSION}\0{scope}\0{digest}\0{platform_name}\0{record_suppressed}".encode("utf-8"))
+    key.update(json.dumps(state.suppressions, sort_keys=True, default=str).encode("utf-8"))
+    observed = [glob for rule in rules for glob in rdl_engine.observed_project_globs(rule["rdl_logic_text"])]
+    if observed:
+        key.update(rdl_engine.project_glob_signature(state.sourcedir, observed).encode("utf-8"))
+    if state.generatedFilesMode == "window":
+        key.update(
+            f"\0window\0{state.generatedMaxAvgLineLength}\0{state.generatedMinWhitespaceRatio}"
+            f"\0{state.generatedSampleBytes}".encode("utf-8")
+        )
+    return key.hexdigest(), scope
+
+
+def _cached_file_outcomes(scan_context, filepath, pack_indexes, content_hash):
+    """Return the cached outcomes of every listed pack at `content_hash`, or None if one is missing."""
+    outcomes = []
+    for pack_index in pack_indexes:
+        pack_key = scan_context["pack_keys"][pack_index]
+        cached = scan_context["cached_results"].get((filepath, pack_key)) if pack_key else None
+        if cached is None or cached[0] != content_hash:
+            return None
+        outcomes.extend((pack_index, rule_index, outcome) for rule_index, outcome in json.loads(cached[1]))
+    return outcomes
+
+
+def _target_relpath(filepath):
+    """Return `filepath` relative to the scan target as a POSIX path, as the discovery snapshot keys it."""
+    return Path(os.path.relpath(os.path.abspath(filepath), state.target_dirpath)).as_posix()
+
+
+def _duplicate_candidates(filepaths):
+    """
+    Return the target files that may share their content with another one: those
+    whose size is not unique in the scan set. Archive members and files that cannot
+    be stat'ed are always candidates.
+    """
+    by_size = {}
+    candidates = set()
+    for filepath in filepaths:
+        if archiveops.is_archive_ref(filepath):
+            candidates.add(filepath)
+            continue
         try:
-            sup_path = Path(suppressed_json_path)
-            sup_path.parent.mkdir(parents=True, exist_ok=True)
-            sup_path.write_text(json.dumps(suppressed_json, indent=2), encoding="utf-8")
-        except OSError as exc:
-            logger.error("Failed to write suppressed findings JSON %s: %s", suppressed_json_path, exc)
+            size = os.stat(filepath).st_size
+        except OSError:
+            candidates.add(filepath)
+            continue
+        by_size.setdefault(size, []).append(filepath)
+    for same_size in by_size.values():
+        if len(same_size) > 1:
+            candidates.update(same_size)
+    return candidates
 
-    return matched_rules, unmatched_rules
 
+# Outcomes of the rules evaluated on each shared blob, before the suppression
+# baseline: (content_hash, pack_index, windowed) -> {rule_index: outcome}. Filled per process,
+# so parallel workers deduplicate within their own shard of the target files.
+_blob_outcomes = {}
 
 
+def _scan_target_file(scan_context, filepath, pack_indexes):
+    """
+    Read one target file and evaluate every rule of the listed packs against it.
+
+    Packs whose cached results match the file's content hash are not re-evaluated;
+    a file whose hash is known from the discovery snapshot is not even read when
+    every pack has cached results for it. A file identical to one scanned before
+    reuses that blob's outcomes for every rule that does not look at the file path.
+    Returns a picklable dict with the file's outcomes as (pack_index, rule_index,
+    outcome) tuples, the freshly evaluated packs to cache, or the read error
+    message, so it can run in a worker process.
+    """
+    scanned = {
+        "filepath": filepath,
+        "error": None,
+        "outcomes": [],
+        "skipped": 0,
+        "content_hash": None,
+        "fresh": [],
+        "rdl_memo": (0, 0),
+        "rdl_stats": {},
+        "unread": False,
+        "deduplicated": False,
+    }
+    known_hash = scan_context["known_hashes"].get(filepath)
+    if known_hash is not None:
+        # Unchanged since the discovery snapshot that recorded this hash: when every
+        # pack has results for it, the file does not need to be read at all.
+        cached_outcomes = _cached_file_outcomes(scan_context, filepath, pack_indexes, known_hash)
+        if cached_outcomes is not None:
+            scanned["content_hash"] = known_hash
+            scanned["outcomes"] = cached_outcomes
+            scanned["unread"] = True
+            return scanned
 
+    try:
+        content = _read_target_file(filepath)
+    except (FileNotFoundError, PermissionError, UnicodeError, IOError) as exc:
+        scanned["error"] = str(exc)
+        return scanned
+
+    cached_results = scan_context["cached_results"]
+    if scan_context["hash_content"]:
+        scanned["content_hash"] = _content_hash(content)
+    shared_blob = filepath in scan_context["dedup_candidates"]
+    windowed = filepath in scan_context["window_files"]
+
+    file_lines = None
+    found_literals = None
+    rel_path = None
+    rdl_memo = rdl_engine.PredicateMemo()
+    rdl_stats = rdl_engine.RdlStats()
+    for pack_index in pack_indexes:
+        platform_name, rules = scan_context["packs"][pack_index]
+        pack_key = scan_context["pack_keys"][pack_index]
+
+        if cached_results is not None and pack_key is not None:
+            cached = cached_results.get((filepath, pack_key))
+            if cached is not None and cached[0] == scanned["content_hash"]:
+                for rule_index, outcome in json.loads(cached[1]):
+                    scanned["outcomes"].append((pack_index, rule_index, outcome))
+                continue
 
-def paths_parser(rule_path, targetfile, outputfile=None, rule_no=None, findings_json_path=None, progress_callback=None):
+        blob_key = (scanned["content_hash"], pack_index, windowed) if shared_blob else None
+        blob = _blob_outcomes.get(blob_key) if blob_key else None
+        if blob is not None:
+            scanned["deduplicated"] = True
+        elif blob_key:
+            _blob_outcomes[blob_key] = blob_memo = {}
+        pack_outcomes = []
+        for rule_index, rule in enumerate(rules):
+            if rule["invalid"]:
+                continue
+            per_path = blob_key is None or bool(rule["rdl_program"] and rule["rdl_program"].path_dependent)
+            if blob is not None and not per_path:
+                if rule_index not in blob:
+                    continue
+                if rel_path is None:
+                    rel_path = futils.get_source_file_path(state.sourcedir, filepath)
+                outcome = _apply_source_baseline(_rebase_outcome(blob[rule_index], rel_path), platform_name, rule)
+            else:
+                if file_lines is None:
+                    file_lines = content.splitlines()
+                    found_literals = scan_context["matcher"].scan(content)
+                if not _rule_may_match(rule, found_literals, content):
+                    scanned["skipped"] += 1
+                    continue
+                outcome = _evaluate_source_rule(
+                    rule,
+                    platform_name,
+                    filepath,
+                    content,
+                    file_lines,
+                    record_suppressed=scan_context["record_suppressed"],
+                    rdl_memo=rdl_memo,
+                    rdl_stats=rdl_stats,
+                    apply_baseline=per_path,
+                    windowed=windowed,
+                )
+                if outcome is not None and not per_path:
+                    blob_memo[rule_index] = outcome
+                    outcome = _apply_source_baseline(outcome, platform_name, rule)
+            if outcome is not None:
+                pack_outcomes.append((rule_index, outcome))
+                scanned["outcomes"].append((pack_index, rule_index, outcome))
+        if cached_results is not None and pack_key is not None:
+            scanned["fresh"].append((pack_index, pack_outcomes))
+    _release_file_indexes()
+    scanned["rdl_memo"] = (rdl_memo.hits, rdl_memo.misses)
+    scanned["rdl_stats"] = rdl_stats.counts
+    return scanned
+
+
+# Set in each worker process by _init_scan_worker().
+_worker_scan_context = None
+
+
+def _init_scan_worker(scan_context, sourcedir, suppressions):
+    global _worker_scan_context
+    _worker_scan_context = scan_context
+    _blob_outcomes.clear()
+    state.sourcedir = sourcedir
+    state.suppressions = suppressions
+
+
+def _scan_target_file_in_worker(file_job):
+    filepath, pack_indexes = file_job
+    return _scan_target_file(_worker_scan_context, filepath, pack_indexes)
+
+
+def _iter_scanned_files(scan_context, file_jobs, workers=1):
     """
-    Parses file paths and matches them against specified patterns from an XML rule file.
+    Yield _scan_target_file() results in file_jobs order, sharding the files across
+    `workers` processes when more than one is requested.
 
-    This routine reads the XML rules, checks each file path from the target file against 
-    the defined regex patterns, and categorizes them into matched and unmatched rules.
+    Workers are forked so they inherit the compiled rule packs; dakshscra.py runs its
+    scan at import time and cannot be re-imported by spawned workers, so platforms
+    without fork fall back to a serial scan.
+    """
+    if workers > 1 and len(file_jobs) > 1 and "fork" not in multiprocessing.get_all_start_methods():
+        logger.warning("Parallel scanning needs the fork start method; scanning serially")
+        workers = 1
+
+    if workers <= 1 or len(file_jobs) <= 1:
+        for filepath, pack_indexes in file_jobs:
+            yield _scan_target_file(scan_context, filepath, pack_indexes)
+        return
+
+    workers = min(workers, len(file_jobs))
+    chunksize = max(1, min(32, len(file_jobs) // (workers * 8)))
+    print(f"         [-] Scanning with {workers} worker processes")
+    with ProcessPoolExecutor(
+        max_workers=workers,
+        mp_context=multiprocessing.get_context("fork"),
+        initializer=_init_scan_worker,
+        initargs=(scan_context, state.sourcedir, state.suppressions),
+    ) as executor:
+        # map() yields in submission order, which keeps the merge deterministic.
+        yield from executor.map(_scan_target_file_in_worker, file_jobs, chunksize=chunksize)
+
+
+def _open_outcome_spool():
+    # An empty database name gives a private temporary database backed by disk.
+    spool = sqlite3.connect("")
+    spool.execute(
+        "CREATE TABLE outcomes ("
+        " pack_index INTEGER, rule_index INTEGER, filepath TEXT, outcome TEXT)"
+    )
+    return spool
+
+
+def _spooled_rule_outcomes(spool, pack_index, rule_index, target_positions):
+    """
+    Yield (file_index, filepath, outcome) for one rule's spooled outcomes in
+    target-file order. A path listed twice in a pack is emitted at each position.
+    """
+    rows = spool.execute(
+        "SELECT filepath, outcome FROM outcomes WHERE pack_index = ? AND rule_index = ?",
+        (pack_index, rule_index),
+    ).fetchall()
+    ordered = sorted(
+        (file_index, filepath, outcome_json)
+        for filepath, outcome_json in rows
+        for file_index in target_positions.get(filepath, ())
+    )
+    for file_index, filepath, outcome_json in ordered:
+        yield file_index, filepath, json.loads(outcome_json)
+
+
+def scan_source_packs(pack_jobs, outputfile=None, findings_json_path=None, suppressed_json_path=None, progress_callback=None, workers=1):
+    """
+    File-major scan engine: reads every target file once and applies all compiled
+    rules from every rule pack whose target list includes that file.
+
+    Findings are emitted in pack -> rule -> file order afterwards, so
+    areas_of_interest.json, rule_id numbering and suppressed entries are the same
+    as running source_parser() over each pack in turn.
 
     Parameters:
-        rule_path (str): Path to the XML file containing matching rules.
-        targetfile (file-like object): File object containing paths to be scanned.
-        outputfile (file-like object): File object for writing matched results.
-        rule_no (int): The initial rule number for matched output.
+        pack_jobs (list): (rule_path, targetfile) pairs in emission order. targetfile
+            is an open file-path log or any iterable of file paths.
+        outputfile (file-like object): Optional text output for scan results.
+        findings_json_path (str): Findings JSON to extend.
+        suppressed_json_path (str): Suppressed findings JSON to extend.
+        progress_callback (callable): Called once per scanned target file.
+        workers (int): Worker processes to shard target files across (1 = serial).
+            Results are merged in target-file order, so output matches a serial run.
 
     Returns:
-        tuple: A list of matched rules and a list of unmatched rules.
+        tuple: (matched_rules, unmatched_rules) - Lists of rule titles for matched and unmatched patterns.
     """
+    if suppressed_json_path is None and findings_json_path:
+        suppressed_json_path = str(Path(findings_json_path).parent / "suppressed_findings.json")
 
-    matched_rules = []       # List to store matched patterns
-    unmatched_rules = []     # List to store unmatched patterns
+    record_suppressed = bool(suppressed_json_path)
 
-    # Load rules from XML file
-    try:
-        xmltree = ET.parse(rule_path)
-        rule = xmltree.getroot()
-    except ET.ParseError as exc:
-        logger.error("Failed to parse file path rules %s: %s", rule_path, exc)
-        return matched_rules, unmatched_rules
+    result_cache = ScanResultCache(state.resultCacheDb) if state.resultCacheEnabled else None
 
-    f_scanout = outputfile
-    f_targetfilepaths = targetfile
-    pFlag = False
+    packs = []
+    for rule_path, targetfile in pack_jobs:
+        rules, digest = _load_compiled_rule_pack(rule_path)
+        if rules is None:
+            continue
+        platform_name = Path(rule_path).stem.upper()
+        pack_key, cache_scope = (None, None)
+        if result_cache is not None:
+            pack_key, cache_scope = _result_cache_keys(rule_path, platform_name, digest, rules, record_suppressed)
+        packs.append({
+            "platform": platform_name,
+            "rules": rules,
+            "targets": [str(each).rstrip() for each in targetfile],
+            "cache_key": pack_key,
+            "cache_scope": cache_scope,
+        })
+
+    # Index the project for OBSERVE PROJECT_HAS_GLOB before any worker is forked,
+    # so all of them share one walk of the tree.
+    if any(rule["rdl_program"] and rule["rdl_program"].observed_globs for pack in packs for rule in pack["rules"]):
+        get_project_index(state.sourcedir, pruned=False)
+
+    # Ordered union of target files -> packs that list them.
+    file_packs = {}
+    for pack_index, pack in enumerate(packs):
+        for filepath in pack["targets"]:
+            listed = file_packs.setdefault(filepath, [])
+            if not listed or listed[-1] != pack_index:
+                listed.append(pack_index)
+
+    total_rules = sum(1 for pack in packs for rule in pack["rules"] if not rule["invalid"])
+    print(f"         [-] File-major scan: {len(file_packs)} files x {total_rules} rules from {len(packs)} rule pack(s)")
+
+    # One combined literal matcher per scan; each file is tested against it once and
+    # rules whose required literals are absent are not evaluated at all.
+    literal_matcher = prefilter.LiteralMatcher(
+        text
+        for pack in packs
+        for rule in pack["rules"]
+        for gate in (rule["prefilter"] or ())
+        for text, _ in gate
+    )
+
+    cached_results = None
+    if result_cache is not None:
+        cached_results = result_cache.load([pack["cache_key"] for pack in packs if pack["cache_key"]])
+
+    known_hashes = {}
+    if cached_results is not None and state.knownContentHashes and state.target_dirpath:
+        for filepath in file_packs:
+            content_hash = state.knownContentHashes.get(_target_relpath(filepath))
+            if content_hash is not None:
+                known_hashes[filepath] = content_hash
+
+    scan_context = {
+        "packs": [(pack["platform"], pack["rules"]) for pack in packs],
+        "pack_keys": [pack["cache_key"] for pack in packs],
+        "matcher": literal_matcher,
+        "record_suppressed": record_suppressed,
+        "cached_results": cached_results,
+        "known_hashes": known_hashes,
+        "hash_content": cached_results is not None or state.contentDedupEnabled or state.collapseDuplicates,
+        "dedup_candidates": _duplicate_candidates(file_packs) if state.contentDedupEnabled else frozenset(),
+        "window_files": state.generatedWindowFiles,
+    }
+    _blob_outcomes.clear()
 
-    rule_no = rule_no or 0
-    findings_json = []
-    if findings_json_path and Path(findings_json_path).exists():
-        try:
-            findings_json = json.loads(Path(findings_json_path).read_text(encoding="utf-8"))
-        except (OSError, json.JSONDecodeError, TypeError, ValueError):
-            findings_json = []
+    # Outcomes are spooled to a temporary on-disk table until emission, so memory
+    # does not grow with the number of files x rules.
+    outcome_spool = _open_outcome_spool()
+    error_count = 0
+    skipped_evaluations = 0
+    cache_rows = []
+    file_blobs = {} if state.collapseDuplicates else None
+    scanned_files = _iter_scanned_files(scan_context, list(file_packs.items()), workers)
+    for file_counter, scanned in enumerate(scanned_files, start=1):
+        filepath = scanned["filepath"]
+        pack_indexes = file_packs[filepath]
+        _print_parsing_file(file_counter, filepath)
+
+        if scanned["error"] is not None:
+            print(f"Error processing {filepath}: {scanned['error']}")
+            error_count += 1
+            if callable(progress_callback):
+                progress_callback({
+                    "scope": "source_parser",
+                    "platform": packs[pack_indexes[0]]["platform"],
+                    "file_index": file_counter,
+                    "filepath": filepath,
+                    "status": "read_error",
+                    "error_count": error_count,
+                })
+            continue
+
+        skipped_evaluations += scanned["skipped"]
+        if scanned["deduplicated"]:
+            state.dedupFileCnt += 1
+        if file_blobs is not None:
+            file_blobs[filepath] = scanned["content_hash"]
+        state.rdlMemoHitCnt += scanned["rdl_memo"][0]
+        state.rdlMemoMissCnt += scanned["rdl_memo"][1]
+        _get_rdl_stats().merge(scanned["rdl_stats"])
+        outcome_spool.executemany(
+            "INSERT INTO outcomes (pack_index, rule_index, filepath, outcome) VALUES (?, ?, ?, ?)",
+            (
+                (pack_index, rule_index, filepath, json.dumps(outcome))
+                for pack_index, rule_index, outcome in scanned["outcomes"]
+            ),
+        )
+        if cached_results is not None:
+            if scanned["fresh"]:
+                state.resultCacheMissCnt += 1
+            else:
+                state.resultCacheHitCnt += 1
+            if scanned["unread"]:
+                state.resultCacheUnreadCnt += 1
+            if state.target_dirpath:
+                state.scannedContentHashes[_target_relpath(filepath)] = scanned["content_hash"]
+            for pack_index, pack_outcomes in scanned["fresh"]:
+                pack = packs[pack_index]
+                cache_rows.append((
+                    filepath,
+                    pack["cache_key"],
+                    pack["cache_scope"],
+                    scanned["content_hash"],
+                    json.dumps(pack_outcomes),
+                ))
+            if len(cache_rows) >= RESULT_CACHE_BATCH_ROWS:
+                result_cache.put(cache_rows)
+                cache_rows = []
+
+        if callable(progress_callback):
+            progress_callback({
+                "scope": "source_parser",
+                "platform": packs[pack_indexes[0]]["platform"],
+                "file_index": file_counter,
+                "filepath": filepath,
+                "rules_match_count": state.rulesMatchCnt,
+                "suppressed_count": state.suppressedFindingsCnt,
+            })
+
+    # Built once the bulk insert is done; every rule below reads its outcomes by this key.
+    outcome_spool.execute("CREATE INDEX outcomes_rule ON outcomes(pack_index, rule_index)")
+
+    sink = _open_findings_sink(findings_json_path, suppressed_json_path, outputfile)
+    matched_rules = []
+    unmatched_rules = []
+    for pack_index, pack in enumerate(packs):
+        platform_name = pack["platform"]
+        target_positions = {}
+        for file_index, filepath in enumerate(pack["targets"], start=1):
+            target_positions.setdefault(filepath, []).append(file_index)
+        pack_matched = []
+        pack_unmatched = []
+        rule_no = 0
+
+        if outputfile:
+            outputfile.write(f"\n--- {platform_name} Findings ---\n")
 
-    for r in rule:
-        #rule_no += 1
-        #f_scanout.write(f"{rule_no}. Rule Title: {r.find('name').text}\n")
+        for rule_index, rule in enumerate(pack["rules"]):
+            if rule["invalid"]:
+                pack_unmatched.append(rule["title"])
+                continue
+            file_outcomes = _spooled_rule_outcomes(outcome_spool, pack_index, rule_index, target_positions)
+            rule_no, matched = _emit_rule_results(sink, platform_name, rule, file_outcomes, rule_no, file_blobs=file_blobs)
+            if matched:
+                pack_matched.append(rule["title"])
+            else:
+                pack_unmatched.append(rule["title"])
+            state.rCnt = rule_no
+
+        # De-duplicate per pack, as separate source_parser() calls would.
+        matched_rules.extend(set(pack_matched))
+        unmatched_rules.extend(set(pack_unmatched))
+
+    state.parseErrorCnt += error_count
+    state.prefilterSkipCnt += skipped_evaluations
+
+    if result_cache is not None:
+        if state.changedFiles is not None:
+            # A changed-files scan sees only part of the project; keep the other rows.
+            result_cache.put(cache_rows)
+        else:
+            result_cache.store(cache_rows, {
+                pack["cache_scope"]: (pack["cache_key"], set(pack["targets"]))
+                for pack in packs
+                if pack["cache_key"]
+            })
+        result_cache.close()
+
+    _blob_outcomes.clear()
+    outcome_spool.close()
+    _close_findings_sink(sink)
+
+    return matched_rules, unmatched_rules
 
+
+
+
+def _load_path_rules(rules_root, rule_path, unmatched_rules):
+    """
+    Compile every file path rule once: regexes, RDL program and clause order.
+
+    Rules with an invalid regex are reported as unmatched and left out, as before.
+    """
+    path_rules = []
+    for r in rules_root:
         pattern_name = (r.findtext("name") or "").strip()
         pattern_text = (r.findtext("regex") or "").strip()
         rdl_ref = (r.findtext("rdl_ref") or "").strip()
         exclude_text = (r.findtext("exclude") or "").strip()
-        rule_meta = _file_path_rule_meta(r)
         logic_file_path = _resolve_logic_file(rule_path, rdl_ref) if rdl_ref else None
         rdl_logic_text = ""
         if logic_file_path and logic_file_path.exists():
@@ -982,6 +2027,10 @@ def paths_parser(rule_path, targetfile, outputfile=None, rule_no=None, findings_
             except OSError as exc:
                 logger.error("Failed to read file path RDL file %s for rule %s: %s", logic_file_path, pattern_name, exc)
                 rdl_logic_text = ""
+        rdl_program = rdl_engine.compile_rdl(rdl_logic_text) if rdl_logic_text else None
+        rdl_order = None
+        if rdl_program is not None and state.rdlReorderEnabled:
+            rdl_order = rdl_engine.plan_rdl_order(rdl_program, _get_rdl_stats())
 
         pattern = None
         if pattern_text:
@@ -1000,37 +2049,161 @@ def paths_parser(rule_path, targetfile, outputfile=None, rule_no=None, findings_
                 logger.error("Invalid file path exclude regex in rule %s (%s): %s", pattern_name, rule_path, exc)
                 exclude = None
 
-        for file_index, eachfilepath in enumerate(f_targetfilepaths, start=1):  # Read each line (file path) in the file
-            filepath = eachfilepath.rstrip()    # strip out '\r' or '\n' from the file paths
-            filepath = futils.get_source_file_path(state.sourcedir, filepath)
-            match_path = filepath
-            if state.sourcedir:
-                try:
-                    match_path = Path(filepath).resolve().relative_to(Path(state.sourcedir).resolve()).as_posix()
-                except Exception:
-                    match_path = str(filepath).replace("\\", "/")
-            rule_match_text = "/" + str(match_path).lstrip("/")
+        path_rules.append({
+            "name": pattern_name,
+            "title": r.find("name").text,
+            "meta": _file_path_rule_meta(r),
+            "pattern": pattern,
+            "exclude": exclude,
+            "rdl_ref": rdl_ref,
+            "rdl_program": rdl_program,
+            "rdl_order": rdl_order,
+        })
+    return path_rules
+
+
+def _read_path_entries(targetfile):
+    """
+    Read the discovered file paths once and normalise them for path rules.
+
+    Returns (filepath, match_path, rule_match_text) per line: the path as shown in
+    reports, the path relative to the project and the "/"-rooted text rules match.
+    """
+    source_root = None
+    if state.sourcedir:
+        try:
+            source_root = Path(state.sourcedir).resolve()
+        except Exception:
+            source_root = None
+
+    path_entries = []
+    for eachfilepath in targetfile:  # Read each line (file path) in the file
+        filepath = eachfilepath.rstrip()    # strip out '\r' or '\n' from the file paths
+        filepath = futils.get_source_file_path(state.sourcedir, filepath)
+        match_path = filepath
+        if state.sourcedir:
+            try:
+                match_path = Path(filepath).resolve().relative_to(source_root).as_posix()
+            except Exception:
+                match_path = str(filepath).replace("\\", "/")
+        rule_match_text = "/" + str(match_path).lstrip("/")
+        path_entries.append((filepath, match_path, rule_match_text))
+    targetfile.seek(0, 0)
+    return path_entries
+
+
+def _match_path_rules(path_rules, path_entries, path_memos):
+    """
+    Decide every path rule for every path.
+
+    Regex rules are matched in a single pass over the path list; RDL rules are
+    checked for all their paths at once with rdl_engine.check_rdl_batch(). Returns
+    one list per rule holding, per path, None when the rule's exclude regex matched
+    the path, else (matched, rdl_known).
+    """
+    decisions = [[None] * len(path_entries) for _ in path_rules]
+    rdl_batches = [[] for _ in path_rules]
+    for path_index, (filepath, _, rule_match_text) in enumerate(path_entries):
+        for rule_index, path_rule in enumerate(path_rules):
+            exclude = path_rule["exclude"]
             if exclude and exclude.search(filepath):
+                continue
+            if path_rule["rdl_program"] is not None:
+                rdl_batches[rule_index].append(path_index)
+            elif path_rule["pattern"] is not None:
+                decisions[rule_index][path_index] = (bool(path_rule["pattern"].search(rule_match_text)), None)
+            else:
+                decisions[rule_index][path_index] = (False, None)
+
+    for rule_index, path_indexes in enumerate(rdl_batches):
+        if not path_indexes:
+            continue
+        path_rule = path_rules[rule_index]
+        texts = [path_entries[path_index][2] for path_index in path_indexes]
+        results = rdl_engine.check_rdl_batch(
+            path_rule["rdl_program"],
+            [(text, text) for text in texts],
+            memos=[path_memos.setdefault(text, rdl_engine.PredicateMemo()) for text in texts],
+            order=path_rule["rdl_order"],
+            stats=_get_rdl_stats(),
+        )
+        for path_index, result in zip(path_indexes, results):
+            decisions[rule_index][path_index] = result
+    return decisions
+
+
+def paths_parser(rule_path, targetfile, outputfile=None, rule_no=None, findings_json_path=None, progress_callback=None):
+    """
+    Parses file paths and matches them against specified patterns from an XML rule file.
+
+    This routine reads the XML rules, checks each file path from the target file against 
+    the defined regex patterns, and categorizes them into matched and unmatched rules.
+
+    Parameters:
+        rule_path (str): Path to the XML file containing matching rules.
+        targetfile (file-like object): File object containing paths to be scanned.
+        outputfile (file-like object): File object for writing matched results.
+        rule_no (int): The initial rule number for matched output.
+
+    Returns:
+        tuple: A list of matched rules and a list of unmatched rules.
+    """
+
+    matched_rules = []       # List to store matched patterns
+    unmatched_rules = []     # List to store unmatched patterns
+
+    # Load rules from XML file
+    try:
+        xmltree = ET.parse(rule_path)
+        rule = xmltree.getroot()
+    except ET.ParseError as exc:
+        logger.error("Failed to parse file path rules %s: %s", rule_path, exc)
+        return matched_rules, unmatched_rules
+
+    f_scanout = outputfile
+    f_targetfilepaths = targetfile
+    pFlag = False
+
+    rule_no = rule_no or 0
+    # One predicate memo per matched path, shared by every rule's RDL script.
+    path_memos = {}
+    findings_json = []
+    if findings_json_path and Path(findings_json_path).exists():
+        try:
+            findings_json = json.loads(Path(findings_json_path).read_text(encoding="utf-8"))
+        except (OSError, json.JSONDecodeError, TypeError, ValueError):
+            findings_json = []
+
+    path_rules = _load_path_rules(rule, rule_path, unmatched_rules)
+    path_entries = _read_path_entries(f_targetfilepaths)
+    path_decisions = _match_path_rules(path_rules, path_entries, path_memos)
+
+    for path_rule, decisions in zip(path_rules, path_decisions):
+        pattern_name = path_rule["name"]
+        rule_meta = path_rule["meta"]
+
+        for file_index, ((filepath, match_path, rule_match_text), decision) in enumerate(zip(path_entries, decisions), start=1):
+            if decision is None:    # excluded path
                 unmatched_rules.append(pattern_name)
                 continue
 
-            matched = False
+            matched, rdl_known = decision
             active_logic_meta = {}
-            if rdl_logic_text:
-                rdl_result = rdl_engine.evaluate_rdl_with_reason(
-                    rdl_logic_text,
+            if matched and path_rule["rdl_program"] is not None:
+                # Logic metadata is only reported for matched paths.
+                rdl_result = rdl_engine.evaluate_rdl(
+                    path_rule["rdl_program"],
                     file_text=rule_match_text,
                     file_path=rule_match_text,
                     project_root=state.sourcedir,
+                    memo=path_memos[rule_match_text],
+                    known=rdl_known,
                 )
-                matched = bool(rdl_result.get("passes"))
                 active_logic_meta = _build_logic_meta(
                     "rdl",
-                    rdl_ref,
+                    path_rule["rdl_ref"],
                     logic_result=rdl_result,
                 )
-            elif pattern is not None:
-                matched = bool(pattern.search(rule_match_text))
 
             if matched:   # If there is a match
                 if pFlag == False:
@@ -1038,7 +2211,7 @@ def paths_parser(rule_path, targetfile, outputfile=None, rule_no=None, findings_
                     state.rulesPathsMatchCnt += 1
                     matched_rules.append(pattern_name)  # Add matched patterns to the list
                     if f_scanout:
-                        f_scanout.write(f"{rule_no}. Rule Title: {r.find('name').text}\n")
+                        f_scanout.write(f"{rule_no}. Rule Title: {path_rule['title']}\n")
                         f_scanout.write(("\tFile Path: " + match_path) + "\n")
                     print("     [-] File Path Rule:" + pattern_name)
 
@@ -1079,7 +2252,10 @@ def paths_parser(rule_path, targetfile, outputfile=None, rule_no=None, findings_
                 })
 
         pFlag = False
-        f_targetfilepaths.seek(0, 0)
+
+    for memo in path_memos.values():
+        state.rdlMemoHitCnt += memo.hits
+        state.rdlMemoMissCnt += memo.misses
 
     # Remove duplicates from unmatched items list
     unmatched_rules = list(set(unmatched_rules))
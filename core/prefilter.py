@@ -0,0 +1,293 @@
+# Standard libraries
+import re
+
+try:
+    import re._parser as sre_parse
+except ImportError:  # Python < 3.11
+    import sre_parse
+
+
+# Literals shorter than this match almost every file, so rules that can only be
+# gated on them are always evaluated instead.
+MIN_LITERAL_LENGTH = 3
+
+_REPEAT_OPS = tuple(
+    op for op in (
+        sre_parse.MAX_REPEAT,
+        sre_parse.MIN_REPEAT,
+        getattr(sre_parse, "POSSESSIVE_REPEAT", None),
+    )
+    if op is not None
+)
+_ATOMIC_GROUP = getattr(sre_parse, "ATOMIC_GROUP", None)
+_POSSESSIVE_REPEAT = getattr(sre_parse, "POSSESSIVE_REPEAT", None)
+
+# Non-ASCII characters that re.IGNORECASE treats as equal to an ASCII letter.
+# Folding them before lower() keeps the literal presence test conservative.
+_ASCII_CASE_FOLD = str.maketrans({
+    "İ": "i",
+    "ı": "i",
+    "ſ": "s",
+    "K": "k",
+})
+
+
+def _best_requirement(candidates):
+    candidates = [each for each in candidates if each]
+    if not candidates:
+        return None
+    return max(candidates, key=lambda req: (min(len(text) for text, _ in req), -len(req)))
+
+
+def _sequence_requirement(items, ignore_case):
+    """
+    Return the best set of (literal, ignore_case) alternatives, one of which must
+    occur in any text the parsed sequence matches, or None when there is none.
+    """
+    candidates = []
+    run = []
+
+    def _flush():
+        if run:
+            text = "".join(run)
+            if text.isascii():
+                candidates.append(frozenset({(text, ignore_case)}))
+            run.clear()
+
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            run.append(chr(av))
+            continue
+        _flush()
+        if op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub_items = av
+            scoped = (ignore_case or bool(add_flags & re.IGNORECASE)) and not (del_flags & re.IGNORECASE)
+            candidates.append(_sequence_requirement(sub_items, scoped))
+        elif op is _ATOMIC_GROUP:
+            candidates.append(_sequence_requirement(av, ignore_case))
+        elif op in _REPEAT_OPS and av[0] >= 1:
+            candidates.append(_sequence_requirement(av[2], ignore_case))
+        elif op is sre_parse.BRANCH:
+            alternatives = [_sequence_requirement(alt, ignore_case) for alt in av[1]]
+            if alternatives and all(alternatives):
+                candidates.append(frozenset().union(*alternatives))
+    _flush()
+    return _best_requirement(candidates)
+
+
+def required_literals(pattern_text, flags=0):
+    """
+    Extract literal substrings that any match of `pattern_text` must contain.
+
+    Returns a frozenset of (literal, ignore_case) pairs of which at least one is
+    present in every matching text, or None when the pattern has no usable
+    literal (too short, non-ASCII, or the pattern does not parse).
+    """
+    if not pattern_text:
+        return None
+    try:
+        parsed = sre_parse.parse(pattern_text, flags)
+    except (re.error, RecursionError, OverflowError):
+        return None
+
+    pattern_state = getattr(parsed, "state", None) or getattr(parsed, "pattern", None)
+    global_flags = getattr(pattern_state, "flags", flags)
+    requirement = _sequence_requirement(list(parsed), bool(global_flags & re.IGNORECASE))
+    if not requirement or min(len(text) for text, _ in requirement) < MIN_LITERAL_LENGTH:
+        return None
+    return requirement
+
+
+_NEWLINE = ord("\n")
+# Character classes that never match a newline.
+_LINE_CATEGORIES = frozenset(
+    getattr(sre_parse, name)
+    for name in (
+        "CATEGORY_DIGIT", "CATEGORY_NOT_SPACE", "CATEGORY_WORD", "CATEGORY_NOT_LINEBREAK",
+        "CATEGORY_LOC_WORD", "CATEGORY_UNI_DIGIT", "CATEGORY_UNI_NOT_SPACE",
+        "CATEGORY_UNI_WORD", "CATEGORY_UNI_NOT_LINEBREAK",
+    )
+    if hasattr(sre_parse, name)
+)
+# Whitespace classes, which may match a newline without letting a match run on
+# over whole lines of code.
+_SPACE_CATEGORIES = frozenset(
+    getattr(sre_parse, name)
+    for name in ("CATEGORY_SPACE", "CATEGORY_UNI_SPACE", "CATEGORY_LINEBREAK", "CATEGORY_UNI_LINEBREAK")
+    if hasattr(sre_parse, name)
+)
+_LINE_ANCHORS = frozenset((
+    sre_parse.AT_BEGINNING,
+    sre_parse.AT_END,
+    sre_parse.AT_BOUNDARY,
+    sre_parse.AT_NON_BOUNDARY,
+))
+
+# How a character set treats a newline.
+_NO_NEWLINE, _SPACE_NEWLINE, _ANY_NEWLINE = range(3)
+
+
+def _set_newline_kind(items):
+    if items and items[0][0] is sre_parse.NEGATE:
+        excluded = _set_newline_kind(items[1:]) != _NO_NEWLINE
+        return _NO_NEWLINE if excluded else _ANY_NEWLINE
+    kind = _NO_NEWLINE
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            if av == _NEWLINE:
+                kind = max(kind, _SPACE_NEWLINE)
+        elif op is sre_parse.RANGE:
+            if av[0] <= _NEWLINE <= av[1]:
+                kind = max(kind, _SPACE_NEWLINE if av[1] <= ord(" ") else _ANY_NEWLINE)
+        elif op is sre_parse.CATEGORY:
+            if av in _SPACE_CATEGORIES:
+                kind = max(kind, _SPACE_NEWLINE)
+            elif av not in _LINE_CATEGORIES:
+                kind = _ANY_NEWLINE
+        else:
+            return _ANY_NEWLINE
+    return kind
+
+
+def _sequence_line_safe(items, dotall, bounded):
+    """
+    With `bounded`, check that the items never match a newline. Otherwise only
+    whitespace may match one, and not inside lookarounds, atomic groups or
+    possessive repeats, which cannot backtrack out of a path that crossed a line.
+    Classes such as [^x] or \\W that can run over whole lines are rejected, since
+    a search over the joined lines could then become quadratic.
+    """
+    limit = _NO_NEWLINE if bounded else _SPACE_NEWLINE
+    for op, av in items:
+        if op is sre_parse.LITERAL:
+            if av == _NEWLINE and limit < _SPACE_NEWLINE:
+                return False
+        elif op is sre_parse.NOT_LITERAL:
+            if av != _NEWLINE:
+                return False
+        elif op is sre_parse.ANY:
+            if dotall:
+                return False
+        elif op is sre_parse.IN:
+            if _set_newline_kind(av) > limit:
+                return False
+        elif op is sre_parse.AT:
+            if av not in _LINE_ANCHORS:
+                return False
+        elif op is sre_parse.SUBPATTERN:
+            _, add_flags, del_flags, sub_items = av
+            if del_flags & re.MULTILINE:
+                return False
+            scoped = (dotall or bool(add_flags & re.DOTALL)) and not (del_flags & re.DOTALL)
+            if not _sequence_line_safe(sub_items, scoped, bounded):
+                return False
+        elif op is _ATOMIC_GROUP:
+            if not _sequence_line_safe(av, dotall, True):
+                return False
+        elif op in _REPEAT_OPS:
+            if not _sequence_line_safe(av[2], dotall, bounded or op is _POSSESSIVE_REPEAT):
+                return False
+        elif op is sre_parse.BRANCH:
+            if not all(_sequence_line_safe(alt, dotall, bounded) for alt in av[1]):
+                return False
+        elif op in (sre_parse.ASSERT, sre_parse.ASSERT_NOT):
+            if not _sequence_line_safe(av[1], dotall, True):
+                return False
+        elif op is sre_parse.GROUPREF_EXISTS:
+            if not all(_sequence_line_safe(branch, dotall, bounded) for branch in av[1:] if branch):
+                return False
+        elif op is not sre_parse.GROUPREF:
+            return False
+    return True
+
+
+def line_searchable(pattern_text, flags=0):
+    """
+    Check whether `pattern_text` can be run once over "\\n".join(lines) with
+    re.MULTILINE instead of once per line.
+
+    True means every line on which the pattern matches on its own is touched by
+    some match over the joined text, so re-checking only the touched lines gives
+    the per-line result. Patterns with string anchors, with classes other than
+    whitespace that can match a newline, or with lookarounds, atomic groups or
+    possessive repeats that can see one are rejected.
+    """
+    if not pattern_text:
+        return False
+    try:
+        parsed = sre_parse.parse(pattern_text, flags)
+    except (re.error, RecursionError, OverflowError):
+        return False
+
+    pattern_state = getattr(parsed, "state", None) or getattr(parsed, "pattern", None)
+    global_flags = getattr(pattern_state, "flags", flags)
+    try:
+        return _sequence_line_safe(list(parsed), bool(global_flags & re.DOTALL), False)
+    except RecursionError:
+        return False
+
+
+def _trie_pattern(words):
+    trie = {}
+    for word in words:
+        node = trie
+        for char in word:
+            node = node.setdefault(char, {})
+        node[""] = {}
+
+    def _emit(node):
+        branches = [re.escape(char) + _emit(child) for char, child in sorted(node.items()) if char]
+        if not branches:
+            return ""
+        body = branches[0] if len(branches) == 1 else "(?:" + "|".join(branches) + ")"
+        return "(?:" + body + ")?" if "" in node else body
+
+    return _emit(trie)
+
+
+class LiteralMatcher:
+    """
+    Combined matcher for the required literals of many rules.
+
+    All literals are folded into one trie-shaped alternation that is run once per
+    file inside a lookahead, so overlapping occurrences are found. Each position
+    reports the longest literal starting there; shorter literals that are
+    prefixes of it are implied.
+    """
+
+    def __init__(self, literals):
+        keys = sorted({text.lower() for text in literals if text})
+        self.keys = frozenset(keys)
+        self._implied = {}
+        for key in keys:
+            self._implied[key] = tuple(key[:size] for size in range(1, len(key) + 1) if key[:size] in self.keys)
+        self._regex = re.compile("(?=(" + _trie_pattern(keys) + "))") if keys else None
+
+    def scan(self, content):
+        """Return the lower-cased literals that occur in `content`, ignoring case."""
+        if self._regex is None or not content:
+            return set()
+        if content.isascii():
+            folded = content.lower()
+        else:
+            folded = content.translate(_ASCII_CASE_FOLD).lower()
+        found = set()
+        implied = self._implied
+        for match in self._regex.finditer(folded):
+            longest = match.group(1)
+            if longest not in found:
+                found.update(implied[longest])
+        return found
+
+
+def requirement_met(requirement, found, content):
+    """
+    Check a required_literals() result against LiteralMatcher.scan() output.
+    Case-sensitive literals are confirmed against the original content.
+    """
+    for text, ignore_case in requirement:
+        if text.lower() not in found:
+            continue
+        if ignore_case or text in content:
+            return True
+    return False
@@ -1,6 +1,19 @@
 import fnmatch
+import hashlib
+import json
+import os
 import re
+import tempfile
+from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
+from typing import Tuple
+
+# Local application imports
+from utils.project_index_utils import get_project_index
+
+
+_PREDICATE_PATTERN = re.compile(r"^(MISSING|PRESENT|EXISTS)\s*:(.+)$", flags=re.IGNORECASE | re.DOTALL)
 
 
 def _strip_comment(line):
@@ -79,44 +92,93 @@ def _strip_wrapping_parentheses(expr):
     return text
 
 
-def _evaluate_predicate(predicate, text):
+def _compile_predicate(predicate):
     token = _strip_wrapping_parentheses(predicate)
-    match = re.match(r"^(MISSING|PRESENT|EXISTS)\s*:(.+)$", token, flags=re.IGNORECASE | re.DOTALL)
+    match = _PREDICATE_PATTERN.match(token)
     if not match:
-        return False
+        return ("const", False)
 
     mode = match.group(1).upper()
     pattern = match.group(2).strip()
     if not pattern:
-        return False
+        return ("const", False)
 
     try:
-        found = bool(re.search(pattern, text, flags=re.IGNORECASE | re.MULTILINE))
+        regex = re.compile(pattern, flags=re.IGNORECASE | re.MULTILINE)
     except re.error:
-        return False
+        return ("const", False)
+    return ("missing" if mode == "MISSING" else "present", regex)
 
-    if mode == "MISSING":
-        return not found
-    return found
 
-
-def _evaluate_expression(expr, text):
+def _compile_expression(expr):
+    """
+    Parse a WHEN EXPR expression into a tree of tuples:
+    ("or", children), ("and", children), ("not", child), ("present"|"missing", regex)
+    or ("const", value).
+    """
     expression = _strip_wrapping_parentheses(expr)
     if not expression:
-        return True
+        return ("const", True)
 
     or_parts = _split_top_level(expression, "||")
     if len(or_parts) > 1:
-        return any(_evaluate_expression(part, text) for part in or_parts)
+        return ("or", tuple(_compile_expression(part) for part in or_parts))
 
     and_parts = _split_top_level(expression, "&&")
     if len(and_parts) > 1:
-        return all(_evaluate_expression(part, text) for part in and_parts)
+        return ("and", tuple(_compile_expression(part) for part in and_parts))
 
     if expression.startswith("!"):
-        return not _evaluate_expression(expression[1:].strip(), text)
+        return ("not", _compile_expression(expression[1:].strip()))
+
+    return _compile_predicate(expression)
+
+
+class PredicateMemo:
+    """
+    Regex predicate results for one file text, shared by every RDL program
+    evaluated against it. Results are keyed by (pattern, flags), so the same
+    predicate in many rules is searched at most once per file.
+    """
+
+    __slots__ = ("results", "hits", "misses")
+
+    def __init__(self):
+        self.results = {}
+        self.hits = 0
+        self.misses = 0
 
-    return _evaluate_predicate(expression, text)
+    def search(self, regex, text):
+        key = (regex.pattern, regex.flags)
+        found = self.results.get(key)
+        if found is None:
+            found = regex.search(text) is not None
+            self.results[key] = found
+            self.misses += 1
+        else:
+            self.hits += 1
+        return found
+
+
+def _regex_found(regex, text, memo):
+    if memo is None:
+        return regex.search(text) is not None
+    return memo.search(regex, text)
+
+
+def _evaluate_expression(node, text, memo=None):
+    kind, value = node
+    if kind == "present":
+        return _regex_found(value, text, memo)
+    if kind == "missing":
+        return not _regex_found(value, text, memo)
+    if kind == "or":
+        return any(_evaluate_expression(child, text, memo) for child in value)
+    if kind == "and":
+        return all(_evaluate_expression(child, text, memo) for child in value)
+    if kind == "not":
+        return not _evaluate_expression(value, text, memo)
+    return value
 
 
 def load_rdl(path):
@@ -125,163 +187,273 @@ def load_rdl(path):
 
 
 def _project_glob(project_root, pattern):
-    root = Path(project_root or ".").resolve()
-    matches = []
-    try:
-        for item in root.rglob("*"):
-            try:
-                rel = item.relative_to(root).as_posix()
-            except ValueError:
-                rel = item.as_posix()
-            if fnmatch.fnmatch(rel, pattern) or fnmatch.fnmatch(item.name, pattern):
-                matches.append(item)
-    except OSError:
-        return []
-    return matches
-
-
-def evaluate_rdl_with_reason(rdl_script, *, file_text="", file_path="", project_root=""):
+    return list(get_project_index(project_root, pruned=False).glob(pattern))
+
+
+def _parse_observe_glob(remainder):
+    if " AS " in remainder:
+        pattern, label = remainder.rsplit(" AS ", 1)
+        return pattern.strip(), label.strip()
+    return remainder, ""
+
+
+def observed_project_globs(rdl_script):
+    program = rdl_script if isinstance(rdl_script, RdlProgram) else compile_rdl(rdl_script)
+    return list(program.observed_globs)
+
+
+def project_glob_signature(project_root, patterns):
+    # Changes whenever any OBSERVE PROJECT_HAS_GLOB result for these patterns would.
+    digest = hashlib.sha256()
+    for pattern in sorted(set(patterns)):
+        digest.update(pattern.encode("utf-8") + b"\0")
+        for item in _project_glob(project_root, pattern):
+            digest.update(item.as_posix().encode("utf-8", "surrogatepass") + b"\0")
+        digest.update(b"\1")
+    return digest.hexdigest()
+
+
+# WHEN/UNLESS commands whose argument is a regex token tested against the file text:
+# prefix -> (step kind, trace label).
+_REGEX_COMMANDS = (
+    ("WHEN CURRENT_FILE_MATCHES ", "when_matches", "current_file_matches"),
+    ("WHEN PRESENT ", "when_matches", "present"),
+    ("WHEN MISSING ", "when_missing", "missing"),
+    ("UNLESS CURRENT_FILE_MATCHES ", "unless_matches", "unless current_file_matches"),
+)
+
+
+@dataclass(frozen=True)
+class RdlProgram:
+    """
+    An RDL script parsed once by compile_rdl(): header fields, and the evaluation
+    steps in script order with their regexes, globs and WHEN EXPR trees compiled.
+    """
+    source: str
+    outcome: str
+    reason: str
+    fail_reason: str
+    trace: Tuple[str, ...]
+    steps: Tuple[tuple, ...]
+
+    @property
+    def observed_globs(self):
+        return tuple(step[1] for step in self.steps if step[0] == "observe_glob")
+
+    @property
+    def path_dependent(self):
+        """True when the result can differ between files with the same text."""
+        return any(step[0] in ("file_name_is", "file_path_matches") for step in self.steps)
+
+
+def _compile_regex_token(token):
+    # Returns (pattern, flags, regex); regex is None for an empty or invalid
+    # pattern. Invalid patterns are re-raised by re.search() when evaluated.
+    pattern, flags = _parse_regex_token(token)
+    regex = None
+    if pattern:
+        try:
+            regex = re.compile(pattern, flags=flags)
+        except re.error:
+            regex = None
+    return pattern, flags, regex
+
+
+def _compile_glob(pattern):
+    return re.compile(fnmatch.translate(os.path.normcase(pattern)))
+
+
+def compile_rdl(rdl_script):
+    """
+    Parse an RDL script into an immutable RdlProgram for evaluate_rdl().
+    """
     commands = []
     for raw_line in (rdl_script or "").splitlines():
         line = _strip_comment(raw_line)
         if line:
             commands.append(line)
 
-    result = {
-        "passes": True,
-        "outcome": "area_of_interest",
-        "reason": "",
-        "fail_reason": "",
-        "trace": [],
-        "consulted_files": [],
-    }
-    current_path = Path(file_path or "")
-    current_name = current_path.name
-    normalized_path = current_path.as_posix()
+    outcome = "area_of_interest"
+    reason = ""
+    fail_reason = ""
+    trace = []
+    steps = []
 
     for line in commands:
         upper = line.upper()
         if upper.startswith("REPORT AS "):
-            result["outcome"] = line[len("REPORT AS "):].strip().lower()
+            outcome = line[len("REPORT AS "):].strip().lower()
             continue
         if upper.startswith("REASON "):
-            result["reason"] = line[len("REASON "):].strip()
+            reason = line[len("REASON "):].strip()
             continue
         if upper.startswith("FAIL_REASON "):
-            result["fail_reason"] = line[len("FAIL_REASON "):].strip()
+            fail_reason = line[len("FAIL_REASON "):].strip()
             continue
         if upper.startswith("TRACE "):
-            result["trace"].append(line[len("TRACE "):].strip())
+            trace.append(line[len("TRACE "):].strip())
             continue
-
-    for line in commands:
-        upper = line.upper()
         if upper.startswith("VERSION "):
             continue
-        if upper.startswith("REPORT AS ") or upper.startswith("REASON ") or upper.startswith("FAIL_REASON ") or upper.startswith("TRACE "):
-            continue
 
         if upper.startswith("WHEN FILE_NAME_IS "):
-            expected = line[len("WHEN FILE_NAME_IS "):].strip()
-            matched = current_name == expected
-            result["trace"].append(f"file_name_is {expected}: {'matched' if matched else 'missed'}")
-            if not matched:
-                result["passes"] = False
-                if not result["fail_reason"]:
-                    result["fail_reason"] = f"Expected file name {expected}"
-                return result
+            steps.append(("file_name_is", line[len("WHEN FILE_NAME_IS "):].strip()))
             continue
 
         if upper.startswith("WHEN FILE_PATH_MATCHES "):
             pattern = line[len("WHEN FILE_PATH_MATCHES "):].strip()
-            matched = fnmatch.fnmatch(normalized_path, pattern) or fnmatch.fnmatch(current_name, pattern)
-            result["trace"].append(f"file_path_matches {pattern}: {'matched' if matched else 'missed'}")
-            if not matched:
-                result["passes"] = False
-                if not result["fail_reason"]:
-                    result["fail_reason"] = f"Expected file path match {pattern}"
-                return result
+            steps.append(("file_path_matches", pattern, _compile_glob(pattern)))
             continue
 
-        if upper.startswith("WHEN CURRENT_FILE_MATCHES "):
-            token = line[len("WHEN CURRENT_FILE_MATCHES "):].strip()
-            pattern, flags = _parse_regex_token(token)
-            matched = bool(pattern and re.search(pattern, file_text or "", flags=flags))
-            result["trace"].append(f"current_file_matches {token}: {'matched' if matched else 'missed'}")
-            if not matched:
-                result["passes"] = False
-                if not result["fail_reason"]:
-                    result["fail_reason"] = f"Current file did not satisfy {token}"
-                return result
+        regex_command = next((cmd for cmd in _REGEX_COMMANDS if upper.startswith(cmd[0])), None)
+        if regex_command is not None:
+            prefix, kind, label = regex_command
+            token = line[len(prefix):].strip()
+            steps.append((kind, token, label) + _compile_regex_token(token))
+            continue
+
+        if upper.startswith("WHEN EXPR "):
+            expr = line[len("WHEN EXPR "):].strip()
+            steps.append(("expr", expr, _compile_expression(expr) if expr else None))
+            continue
+
+        if upper.startswith("OBSERVE PROJECT_HAS_GLOB "):
+            pattern, label = _parse_observe_glob(line[len("OBSERVE PROJECT_HAS_GLOB "):].strip())
+            steps.append(("observe_glob", pattern, label))
+            continue
+
+    return RdlProgram(
+        source=rdl_script or "",
+        outcome=outcome,
+        reason=reason,
+        fail_reason=fail_reason,
+        trace=tuple(trace),
+        steps=tuple(steps),
+    )
+
+
+def _regex_step_matched(step, file_text, memo):
+    _, _, _, pattern, flags, regex = step
+    if not pattern:
+        return False
+    if regex is None:
+        return bool(re.search(pattern, file_text, flags=flags))
+    return _regex_found(regex, file_text, memo)
+
+
+# Steps that can fail the script. For the *_missing/unless_* kinds a match fails it.
+_GATE_KINDS = frozenset((
+    "file_name_is", "file_path_matches", "when_matches", "when_missing", "unless_matches", "expr",
+))
+_FAIL_ON_MATCH_KINDS = frozenset(("when_missing", "unless_matches"))
+
+
+def _step_matched(step, file_text, current_name, normalized_path, memo):
+    kind = step[0]
+    if kind == "file_name_is":
+        return current_name == step[1]
+    if kind == "file_path_matches":
+        glob_regex = step[2]
+        return bool(
+            glob_regex.match(os.path.normcase(normalized_path))
+            or glob_regex.match(os.path.normcase(current_name))
+        )
+    if kind == "expr":
+        tree = step[2]
+        return bool(tree and _evaluate_expression(tree, file_text, memo))
+    return _regex_step_matched(step, file_text, memo)
+
+
+def _fail(result, reason):
+    result["passes"] = False
+    if not result["fail_reason"]:
+        result["fail_reason"] = reason
+    return result
+
+
+def evaluate_rdl(program, *, file_text="", file_path="", project_root="", memo=None, known=None):
+    """
+    Evaluate a compiled RdlProgram against one file.
+
+    Returns a dict with passes, outcome, reason, fail_reason, trace and
+    consulted_files. Steps run in script order and evaluation stops at the first
+    failing WHEN/UNLESS step. `memo` is an optional PredicateMemo for this
+    file_text, reused across rules; `known` holds step results already computed
+    by check_rdl() for the same file.
+    """
+    result = {
+        "passes": True,
+        "outcome": program.outcome,
+        "reason": program.reason,
+        "fail_reason": program.fail_reason,
+        "trace": list(program.trace),
+        "consulted_files": [],
+    }
+    current_path = Path(file_path or "")
+    current_name = current_path.name
+    normalized_path = current_path.as_posix()
+    file_text = file_text or ""
+    known = known or {}
+
+    for step_index, step in enumerate(program.steps):
+        kind = step[0]
+
+        if kind == "observe_glob":
+            _, pattern, label = step
+            index = get_project_index(project_root, pruned=False)
+            result["consulted_files"].extend(index.consulted(pattern, limit=8))
+            observation = f"project_has_glob {pattern}: {len(index.glob(pattern))} match(es)"
+            if label:
+                observation = f"{label}: {observation}"
+            result["trace"].append(observation)
             continue
 
-        if upper.startswith("WHEN PRESENT "):
-            token = line[len("WHEN PRESENT "):].strip()
-            pattern, flags = _parse_regex_token(token)
-            matched = bool(pattern and re.search(pattern, file_text or "", flags=flags))
-            result["trace"].append(f"present {token}: {'matched' if matched else 'missed'}")
+        matched = known.get(step_index)
+        if matched is None:
+            matched = _step_matched(step, file_text, current_name, normalized_path, memo)
+
+        if kind == "file_name_is":
+            expected = step[1]
+            result["trace"].append(f"file_name_is {expected}: {'matched' if matched else 'missed'}")
             if not matched:
-                result["passes"] = False
-                if not result["fail_reason"]:
-                    result["fail_reason"] = f"Required pattern was not found: {token}"
-                return result
+                return _fail(result, f"Expected file name {expected}")
             continue
 
-        if upper.startswith("WHEN MISSING "):
-            token = line[len("WHEN MISSING "):].strip()
-            pattern, flags = _parse_regex_token(token)
-            matched = bool(pattern and re.search(pattern, file_text or "", flags=flags))
-            result["trace"].append(f"missing {token}: {'violated' if matched else 'satisfied'}")
-            if matched:
-                result["passes"] = False
-                if not result["fail_reason"]:
-                    result["fail_reason"] = f"Excluded by present safe pattern: {token}"
-                return result
+        if kind == "file_path_matches":
+            pattern = step[1]
+            result["trace"].append(f"file_path_matches {pattern}: {'matched' if matched else 'missed'}")
+            if not matched:
+                return _fail(result, f"Expected file path match {pattern}")
             continue
 
-        if upper.startswith("WHEN EXPR "):
-            expr = line[len("WHEN EXPR "):].strip()
-            matched = bool(expr and _evaluate_expression(expr, file_text or ""))
-            result["trace"].append(f"expr {expr}: {'matched' if matched else 'missed'}")
+        if kind == "when_matches":
+            token, label = step[1], step[2]
+            result["trace"].append(f"{label} {token}: {'matched' if matched else 'missed'}")
             if not matched:
-                result["passes"] = False
-                if not result["fail_reason"]:
-                    result["fail_reason"] = f"Expression did not pass: {expr}"
-                return result
+                if label == "present":
+                    return _fail(result, f"Required pattern was not found: {token}")
+                return _fail(result, f"Current file did not satisfy {token}")
             continue
 
-        if upper.startswith("UNLESS CURRENT_FILE_MATCHES "):
-            token = line[len("UNLESS CURRENT_FILE_MATCHES "):].strip()
-            pattern, flags = _parse_regex_token(token)
-            matched = bool(pattern and re.search(pattern, file_text or "", flags=flags))
-            result["trace"].append(f"unless current_file_matches {token}: {'triggered' if matched else 'not_triggered'}")
+        if kind == "when_missing":
+            token, label = step[1], step[2]
+            result["trace"].append(f"{label} {token}: {'violated' if matched else 'satisfied'}")
             if matched:
-                result["passes"] = False
-                if not result["fail_reason"]:
-                    result["fail_reason"] = f"Excluded by current file pattern {token}"
-                return result
+                return _fail(result, f"Excluded by present safe pattern: {token}")
             continue
 
-        if upper.startswith("OBSERVE PROJECT_HAS_GLOB "):
-            remainder = line[len("OBSERVE PROJECT_HAS_GLOB "):].strip()
-            label = ""
-            if " AS " in remainder:
-                pattern, label = remainder.rsplit(" AS ", 1)
-                pattern = pattern.strip()
-                label = label.strip()
-            else:
-                pattern = remainder
-            matches = _project_glob(project_root, pattern)
-            for item in matches[:8]:
-                try:
-                    rel = item.resolve().relative_to(Path(project_root).resolve()).as_posix()
-                except Exception:
-                    rel = item.as_posix()
-                result["consulted_files"].append(rel)
-            observation = f"project_has_glob {pattern}: {len(matches)} match(es)"
-            if label:
-                observation = f"{label}: {observation}"
-            result["trace"].append(observation)
+        if kind == "unless_matches":
+            token, label = step[1], step[2]
+            result["trace"].append(f"{label} {token}: {'triggered' if matched else 'not_triggered'}")
+            if matched:
+                return _fail(result, f"Excluded by current file pattern {token}")
+            continue
+
+        if kind == "expr":
+            expr = step[1]
+            result["trace"].append(f"expr {expr}: {'matched' if matched else 'missed'}")
+            if not matched:
+                return _fail(result, f"Expression did not pass: {expr}")
             continue
 
     # Keep consulted files unique and stable.
@@ -293,3 +465,213 @@ def evaluate_rdl_with_reason(rdl_script, *, file_text="", file_path="", project_
             deduped.append(item)
     result["consulted_files"] = deduped
     return result
+
+
+class RdlStats:
+    """
+    How often each WHEN/UNLESS clause was evaluated and failed, keyed by
+    rdl_step_signature(). Saved between scans so plan_rdl_order() can try the
+    clauses most likely to fail cheaply first.
+    """
+
+    def __init__(self, path=None):
+        self.path = Path(path) if path else None
+        self.counts = {}
+        if self.path is not None and self.path.exists():
+            try:
+                data = json.loads(self.path.read_text(encoding="utf-8"))
+                self.counts = {
+                    key: [int(value[0]), int(value[1])]
+                    for key, value in (data.get("clauses") or {}).items()
+                }
+            except (OSError, ValueError, TypeError, IndexError, AttributeError):
+                self.counts = {}
+
+    def record(self, signature, failed):
+        entry = self.counts.setdefault(signature, [0, 0])
+        entry[0] += 1
+        if failed:
+            entry[1] += 1
+
+    def merge(self, counts):
+        for signature, (evaluated, failed) in counts.items():
+            entry = self.counts.setdefault(signature, [0, 0])
+            entry[0] += evaluated
+            entry[1] += failed
+
+    def fail_rate(self, signature):
+        # Laplace-smoothed, so unseen clauses count as failing half the time.
+        evaluated, failed = self.counts.get(signature, (0, 0))
+        return (failed + 1) / (evaluated + 2)
+
+    def save(self):
+        if self.path is None:
+            return
+        # Concurrent scans share the cache directory, so each writer gets its own temp file.
+        tmp_path = None
+        try:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            with tempfile.NamedTemporaryFile(
+                "w", encoding="utf-8", dir=self.path.parent, prefix=self.path.name + ".", suffix=".tmp", delete=False
+            ) as tmp_file:
+                tmp_path = tmp_file.name
+                json.dump({"version": 1, "clauses": self.counts}, tmp_file)
+            os.replace(tmp_path, self.path)
+        except OSError:
+            if tmp_path:
+                Path(tmp_path).unlink(missing_ok=True)
+
+
+# Relative cost of a clause: name/path checks are near free, regex searches scan
+# the whole file (an EXPR scans it once per predicate).
+_STEP_COSTS = {
+    "file_name_is": 1,
+    "file_path_matches": 2,
+    "when_matches": 50,
+    "when_missing": 50,
+    "unless_matches": 50,
+}
+
+
+def _expression_cost(node):
+    kind, value = node
+    if kind in ("present", "missing"):
+        return 50
+    if kind in ("or", "and"):
+        return sum(_expression_cost(child) for child in value)
+    if kind == "not":
+        return _expression_cost(value)
+    return 0
+
+
+def rdl_step_signature(step):
+    return f"{step[0]}:{step[1]}"
+
+
+def plan_rdl_order(program, stats=None):
+    """
+    Return the indexes of the program's WHEN/UNLESS steps, cheapest and most
+    likely to fail first (cost / fail rate), for check_rdl().
+    """
+    gates = [index for index, step in enumerate(program.steps) if step[0] in _GATE_KINDS]
+    # An invalid WHEN regex raises when reached; keep script order so it raises
+    # exactly when a script-order evaluation would.
+    if any(len(program.steps[index]) == 6 and program.steps[index][3] and program.steps[index][5] is None for index in gates):
+        return tuple(gates)
+
+    ranked = []
+    for step_index in gates:
+        step = program.steps[step_index]
+        if step[0] == "expr":
+            cost = _expression_cost(step[2]) if step[2] else 0
+        else:
+            cost = _STEP_COSTS[step[0]]
+        fail_rate = stats.fail_rate(rdl_step_signature(step)) if stats is not None else 0.5
+        ranked.append((cost / fail_rate, step_index))
+    ranked.sort()
+    return tuple(step_index for _, step_index in ranked)
+
+
+def check_rdl(program, *, file_text="", file_path="", memo=None, order=None, stats=None):
+    """
+    Decide only whether a program passes, trying its WHEN/UNLESS steps in `order`
+    (from plan_rdl_order(), default script order) and stopping at the first
+    failure. OBSERVE steps cannot fail and are not run.
+
+    Returns (passes, known): `known` maps step index to its raw match result, to
+    pass to evaluate_rdl() when the full script-order result is needed. `stats`
+    (an RdlStats) records each evaluated clause.
+    """
+    current_path = Path(file_path or "")
+    current_name = current_path.name
+    normalized_path = current_path.as_posix()
+    file_text = file_text or ""
+    if order is None:
+        order = tuple(index for index, step in enumerate(program.steps) if step[0] in _GATE_KINDS)
+
+    known = {}
+    for step_index in order:
+        step = program.steps[step_index]
+        matched = _step_matched(step, file_text, current_name, normalized_path, memo)
+        known[step_index] = matched
+        failed = matched if step[0] in _FAIL_ON_MATCH_KINDS else not matched
+        if stats is not None:
+            stats.record(rdl_step_signature(step), failed)
+        if failed:
+            return False, known
+    return True, known
+
+
+def check_rdl_batch(program, items, *, memos=None, order=None, stats=None):
+    """
+    check_rdl() for many files at once. `items` is a list of (file_path, file_text)
+    pairs and `memos` an optional parallel list of PredicateMemo.
+
+    Each WHEN/UNLESS step runs across every file still passing before the next
+    step starts; a file is dropped at its first failure. Returns a list of
+    (passes, known) in `items` order, the same as calling check_rdl() per file.
+    """
+    names = []
+    paths = []
+    texts = []
+    for file_path, file_text in items:
+        current_path = Path(file_path or "")
+        names.append(current_path.name)
+        paths.append(current_path.as_posix())
+        texts.append(file_text or "")
+    if order is None:
+        order = tuple(index for index, step in enumerate(program.steps) if step[0] in _GATE_KINDS)
+
+    known = [{} for _ in items]
+    alive = list(range(len(items)))
+    for step_index in order:
+        if not alive:
+            break
+        step = program.steps[step_index]
+        fail_on_match = step[0] in _FAIL_ON_MATCH_KINDS
+        survivors = []
+        for item_index in alive:
+            memo = memos[item_index] if memos is not None else None
+            matched = _step_matched(step, texts[item_index], names[item_index], paths[item_index], memo)
+            known[item_index][step_index] = matched
+            if matched != fail_on_match:
+                survivors.append(item_index)
+        if stats is not None:
+            stats.merge({rdl_step_signature(step): (len(alive), len(alive) - len(survivors))})
+        alive = survivors
+
+    passing = set(alive)
+    return [(item_index in passing, known[item_index]) for item_index in range(len(items))]
+
+
+def evaluate_rdl_batch(program, items, *, project_root="", memos=None, order=None, stats=None):
+    """
+    evaluate_rdl() for a list of (file_path, file_text) pairs, deciding pass/fail
+    clause by clause across the batch with check_rdl_batch(). Returns the
+    per-file result dicts in `items` order.
+    """
+    checked = check_rdl_batch(program, items, memos=memos, order=order, stats=stats)
+    return [
+        evaluate_rdl(
+            program,
+            file_text=file_text,
+            file_path=file_path,
+            project_root=project_root,
+            memo=memos[item_index] if memos is not None else None,
+            known=known,
+        )
+        for item_index, ((file_path, file_text), (_, known)) in enumerate(zip(items, checked))
+    ]
+
+
+# Scripts passed as text are compiled once and reused.
+_compile_rdl_cached = lru_cache(maxsize=1024)(compile_rdl)
+
+
+def evaluate_rdl_with_reason(rdl_script, *, file_text="", file_path="", project_root=""):
+    """
+    Text API kept for callers that hold the script source: compiles (cached) and
+    evaluates it. Also accepts an RdlProgram.
+    """
+    program = rdl_script if isinstance(rdl_script, RdlProgram) else _compile_rdl_cached(rdl_script or "")
+    return evaluate_rdl(program, file_text=file_text, file_path=file_path, project_root=project_root)
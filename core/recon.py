@@ -12,10 +12,12 @@ import yaml
 from jinja2 import Template
 
 import state.runtime_state as state
+import utils.archive_utils as archiveops
 import utils.cli_utils as cli
 import utils.file_utils as futils
 import utils.result_utils as result
 from utils.log_utils import get_logger
+from utils.project_index_utils import get_project_index
 
 logger = get_logger(__name__)
 
@@ -130,8 +132,11 @@ def _normalize_extensions(exts):
 
 def _read_text(file_path):
     try:
-        with open(file_path, "rb") as fh:
-            raw = fh.read(MAX_CONTENT_BYTES)
+        if archiveops.is_archive_ref(file_path):
+            raw = archiveops.read_member(file_path, MAX_CONTENT_BYTES)
+        else:
+            with open(file_path, "rb") as fh:
+                raw = fh.read(MAX_CONTENT_BYTES)
     except OSError:
         return None
 
@@ -268,18 +273,30 @@ def _apply_confidence_override(category, name, confidence, tuning):
     return confidence
 
 
+def _archive_member_paths(archive_path):
+    try:
+        members, _ = archiveops.list_archive_members(archive_path)
+    except IOError as exc:
+        logger.debug("Recon skipping archive %s: %s", archive_path, exc)
+        return []
+    return [member.ref for member in members if Path(member.name).suffix.lower() not in exclusion_list]
+
+
 def _walk_project_files(targetdir):
     started = time.time()
     last_print = started
     visited_dirs = 0
     total_files_seen = 0
     log_filepaths = []
-    for root, dirs, files in os.walk(targetdir):
+    for root, dirs, files in get_project_index(targetdir).walk(targetdir):
         visited_dirs += 1
         dirs[:] = [d for d in dirs if d not in SKIP_DIRS]
         total_files_seen += len(files)
         for file_name in files:
             file_path = os.path.join(root, file_name)
+            if state.archiveExtensions and archiveops.is_archive_name(file_name):
+                log_filepaths.extend(_archive_member_paths(file_path))
+                continue
             ext = Path(file_name).suffix.lower()
             if ext in exclusion_list:
                 continue
@@ -403,6 +403,14 @@ def _infer_pdf_evidence_label(issue_scope, category, files):
     return "Matched Source Snippets"
 
 
+def _collect_identical_copies(copies, ev, ev_file):
+    """Add the other paths of an evidence entry collapsed from identical files (--collapse-duplicates)."""
+    for location in ev.get("locations", []) or []:
+        location = str(location).strip()
+        if location and location != ev_file and location not in copies:
+            copies.append(location)
+
+
 def _build_pdf_report_context(
     platform_filter=None,
     summary_json_path=None,
@@ -459,6 +467,7 @@ def _build_pdf_report_context(
         # Build per-file code viewer rows (handles aggregated + context evidence).
         file_rows = defaultdict(list)
         seen_lines = defaultdict(set)
+        copies = defaultdict(list)
         if isinstance(evidence, list):
             for ev in evidence:
                 if not isinstance(ev, dict):
@@ -466,6 +475,10 @@ def _build_pdf_report_context(
                 ev_file = str(ev.get("file", "")).strip()
                 if ev_file and ev_file not in files:
                     files.append(ev_file)
+                _collect_identical_copies(copies[ev_file], ev, ev_file)
+                for copy_path in copies[ev_file]:
+                    if copy_path not in files:
+                        files.append(copy_path)
                 if ev.get("aggregated"):
                     for m in ev.get("matches", []):
                         ln = m.get("line")
@@ -502,6 +515,7 @@ def _build_pdf_report_context(
                 "code": _render_code_viewer(
                     sorted(rows, key=lambda r: r[1] if isinstance(r[1], int) else 0)
                 ),
+                "identical_copies": copies[src_file],
             }
             for src_file, rows in list(file_rows.items())[:12]
         ]
@@ -894,10 +908,12 @@ def get_areas_of_interest(input_file):
         # file -> list of (row_type, line_num, code_str); use seen set to avoid duplicate lines
         file_rows = defaultdict(list)
         seen_lines = defaultdict(set)
+        copies = defaultdict(list)
         for ev in evidence:
             if not isinstance(ev, dict):
                 continue
             ev_file = str(ev.get("file", "")).strip()
+            _collect_identical_copies(copies[ev_file], ev, ev_file)
             if ev.get("aggregated"):
                 for m in ev.get("matches", []):
                     ln = m.get("line")
@@ -928,6 +944,7 @@ def get_areas_of_interest(input_file):
             snippet["sources"].append({
                 "source": src_file,
                 "code": _render_code_viewer(rows_sorted),
+                "identical_copies": [html.escape(path) for path in copies[src_file]],
             })
         grouped[platform].append(snippet)
     return _ordered_platform_dict(grouped)
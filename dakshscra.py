@@ -8,6 +8,7 @@ import re
 import sys
 import threading
 import time
+from contextlib import ExitStack
 from datetime import datetime
 from os import path  # This lowercase path to be used only to validate whether a directory exists
 from pathlib import Path  # Resolve the Windows / macOS / Linux path issue
@@ -44,6 +45,7 @@ import utils.review_utils as review_utils
 import utils.string_utils as strutils
 import utils.suppression_utils as supp
 from utils.cli_utils import spinner
+from utils.git_utils import changed_files_since
 from utils.config_utils import get_tool_version
 from utils.scan_state_utils import ScanStateManager
 
@@ -153,6 +155,48 @@ advanced_group.add_argument('--baseline-generate', action='store_true', dest='ba
 advanced_group.add_argument('--no-baseline', action='store_true', dest='no_baseline',
                             help='Disable baseline suppression for this run')
 
+advanced_group.add_argument('--scan-engine', type=str, dest='scan_engine',
+                            default=state.scanEngine, choices=['file', 'rule'],
+                            help='Source scan engine: file (read each file once for all rule packs, default) or rule (legacy rule-by-rule pass)')
+
+advanced_group.add_argument('--workers', type=int, dest='workers',
+                            default=state.scanWorkers, metavar='N',
+                            help='Worker processes for source scanning (default: 1, 0 = one per CPU; file scan engine only)')
+
+advanced_group.add_argument('--walk-threads', type=int, dest='walk_threads',
+                            default=state.walkThreads, metavar='N',
+                            help='Threads listing directories while the target tree is indexed (default: 8, 1 = serial)')
+
+advanced_group.add_argument('--since', type=str, dest='since_ref',
+                            default='', metavar='GIT_REF',
+                            help='Scan only files changed or added since GIT_REF in the target checkout (local git, no network); detection still sees every file')
+
+advanced_group.add_argument('--prune-dirs', type=str, dest='prune_dirs',
+                            default=None, metavar='NAMES',
+                            help='Comma-separated directory names/globs to skip during discovery, replacing the configured list (config/tool.yaml)')
+
+advanced_group.add_argument('--no-prune', action='store_true', dest='no_prune',
+                            help='Discover files in vendor, VCS and build directories too')
+
+advanced_group.add_argument('--no-archives', action='store_true', dest='no_archives',
+                            help='Do not scan zip/jar/war/apk archives in place during discovery')
+
+advanced_group.add_argument('--generated-files', type=str, dest='generated_files',
+                            default=None, choices=['skip', 'window', 'scan'],
+                            help='Minified/generated files found during discovery: match their long lines in windows too, skip them, or scan them normally (default: config/tool.yaml, window)')
+
+advanced_group.add_argument('--no-result-cache', action='store_true', dest='no_result_cache',
+                            help='Re-match every file instead of reusing cached results for unchanged files (file scan engine)')
+
+advanced_group.add_argument('--no-discovery-snapshot', action='store_true', dest='no_discovery_snapshot',
+                            help='Walk the whole target tree without the previous scan\'s inventory snapshot, and do not record one')
+
+advanced_group.add_argument('--no-dedup', action='store_true', dest='no_dedup',
+                            help='Match every copy of identical files separately instead of reusing the first copy\'s results (file scan engine)')
+
+advanced_group.add_argument('--collapse-duplicates', action='store_true', dest='collapse_duplicates',
+                            help='Report matches in identical files once, listing every location of the file (file scan engine)')
+
 advanced_group.add_argument('--resume-scan', action='store_true', dest='resume_scan',
                             help='Resume a previously interrupted long-running scan from state file')
 
@@ -177,6 +221,20 @@ if len(sys.argv) < 2:
 
 # Parse arguments with error handling
 results = args.parse_args()
+state.scanEngine = results.scan_engine
+if results.workers < 0:
+    args.error("--workers must be 0 or a positive number")
+state.scanWorkers = results.workers or (os.cpu_count() or 1)
+if results.walk_threads < 1:
+    args.error("--walk-threads must be a positive number")
+state.walkThreads = results.walk_threads
+if results.no_result_cache:
+    state.resultCacheEnabled = False
+if results.no_discovery_snapshot:
+    state.discoverySnapshotEnabled = False
+if results.no_dedup:
+    state.contentDedupEnabled = False
+state.collapseDuplicates = results.collapse_duplicates
 
 original_rule_file = results.rule_file
 
@@ -239,6 +297,22 @@ else:
 
 analysis_include_frameworks = bool(analysis_cfg.get("include_frameworks", True))
 
+discovery_cfg = cutils.get_discovery_config()
+if results.no_prune:
+    state.discoveryPruneDirs = ()
+elif results.prune_dirs is not None:
+    state.discoveryPruneDirs = tuple(cutils.parse_prune_dirs(results.prune_dirs))
+elif discovery_cfg["prune_enabled"]:
+    state.discoveryPruneDirs = tuple(discovery_cfg["prune_dirs"])
+if discovery_cfg["archives_enabled"] and not results.no_archives:
+    state.archiveExtensions = tuple(discovery_cfg["archive_extensions"])
+    state.archiveMaxDepth = discovery_cfg["archive_max_depth"]
+    state.archiveMaxMemberBytes = discovery_cfg["archive_max_member_bytes"]
+state.generatedFilesMode = results.generated_files or discovery_cfg["generated_mode"]
+state.generatedMaxAvgLineLength = discovery_cfg["generated_max_avg_line_length"]
+state.generatedMinWhitespaceRatio = discovery_cfg["generated_min_whitespace_ratio"]
+state.generatedSampleBytes = discovery_cfg["generated_sample_bytes"]
+
 
 def _safe_load_json(path_obj, default):
     try:
@@ -803,6 +877,25 @@ if path.isdir(results.target_dir) is False:
 
 project_dir = os.path.join(results.target_dir, '')
 state.sourcedir = re.search(r'((?!\/|\\).)*(\/|\\)$', project_dir)[0]        # Target Source Code Directory
+state.target_dirpath = Path(results.target_dir).resolve()
+
+# Walk the target once; detection, discovery, recon and the analyzers all read
+# this shared inventory instead of walking the tree again. Pruned directories are
+# never entered, and directories unchanged since the previous scan's snapshot are
+# not re-listed. RDL project observations index the whole tree separately, and
+# only when a rule uses OBSERVE PROJECT_HAS_GLOB.
+discovery_snapshot = discover.index_target(state.target_dirpath)
+
+if results.since_ref:
+    try:
+        state.changedFiles = changed_files_since(state.target_dirpath, results.since_ref)
+    except RuntimeError as exc:
+        print(f"\n[!] --since {results.since_ref}: {exc}\n")
+        sys.exit(1)
+    state.sinceRef = results.since_ref
+    print(f"     [-] Changed Files Only   : {len(state.changedFiles)} file(s) changed or added since {results.since_ref}")
+    result.update_scan_summary("inputs_received.since_ref", results.since_ref)
+    result.update_scan_summary("detection_summary.changed_files_since_ref", len(state.changedFiles))
 
 root_dir = os.path.dirname(os.path.realpath(__file__))
 state.root_dir = root_dir
@@ -910,6 +1003,9 @@ result.update_scan_summary("inputs_received.framework_rules_count", str(framewor
 result.update_scan_summary("inputs_received.common_rules", str(common_rules_total))
 result.update_scan_summary("inputs_received.total_rules_loaded", str(total_rules_loaded))
 result.update_scan_summary("inputs_received.rule_engine", state.ruleEngine)
+result.update_scan_summary("inputs_received.scan_engine", state.scanEngine)
+result.update_scan_summary("inputs_received.scan_workers", state.scanWorkers)
+result.update_scan_summary("inputs_received.discovery_prune_dirs", list(state.discoveryPruneDirs))
 
 resume_progress = {}
 if results.rule_file:
@@ -926,6 +1022,7 @@ if results.rule_file:
         "persist_after_seconds": state_cfg["persist_after_seconds"],
         "persist_interval_seconds": state_cfg["persist_interval_seconds"],
         "rule_engine": state.ruleEngine,
+        "scan_engine": state.scanEngine,
     }
 
     restored = None
@@ -962,6 +1059,13 @@ resume_stages = resume_progress.get("stages", {}) if isinstance(resume_progress,
 resume_discovery = resume_stages.get("discovery", {})
 resume_pattern = resume_stages.get("pattern_matching", {})
 resume_paths = resume_stages.get("path_analysis", {})
+if resume_stages and discover.discovery_delta_size(state.discoveryDelta):
+    # Checkpointed stages saw the old tree; redo them, reusing cached results for unchanged files.
+    print(f"     [-] Resume Checkpoint    : Target changed ({discover.discovery_delta_size(state.discoveryDelta)} file(s) added, removed or modified); re-running all stages")
+    resume_discovery, resume_pattern, resume_paths = {}, {}, {}
+    # Findings committed by the interrupted run would otherwise be emitted again.
+    parser.discard_source_findings(state.outputAoI_JSON)
+    Path(state.outputAoI_Fpaths_JSON).unlink(missing_ok=True)
 
 scan_state_mgr.update_stage("initialization", "completed", {
     "start_timestamp": state.start_timestamp,
@@ -979,6 +1083,7 @@ if resume_discovery.get("status") == "completed":
 if resume_discovery.get("status") == "completed":
     cli.section_print(f"[*] [Stage {sCnt}] File Path Discovery")
     print("     [-] Discovery Stage      : Resumed from checkpoint")
+    discover.load_generated_files()
 else:
     scan_state_mgr.update_stage("discovery", "running")
     if results.recon:
@@ -1036,6 +1141,10 @@ def _source_progress(payload):
         "parse_error_count": state.parseErrorCnt,
     })
 
+# Rule packs to apply, in emission order: each platform pack followed by its
+# framework-specific overlays, then the common rules.
+source_scan_jobs = []
+
 # Platform-specific rules (+ framework-specific overlays)
 if results.rule_file.lower() not in ['common']:
     def _filter_framework_target_files(src_file_path, framework_key, patterns):
@@ -1069,75 +1178,110 @@ if results.rule_file.lower() not in ['common']:
             continue
         if index < len(platform_file_paths):
             platform_file_path = platform_file_paths[index]
-            print(f"\033[92m     --> Applying rules for {platform} \033[0m")
-            with open(platform_file_path, 'r', encoding=futils.detect_encoding_type(platform_file_path)) as f_targetfiles:
-                matched, unmatched = parser.source_parser(
-                    rules_main_path,
-                    f_targetfiles,
-                    outputfile=None,
-                    findings_json_path=state.outputAoI_JSON,
-                    progress_callback=_source_progress,
-                )
-                source_matched_rules.extend(matched)
-                source_unmatched_rules.extend(unmatched)
-                f_targetfiles.seek(0)
-
-                applied_fw_rule_paths = set()
-                for fw_entry in framework_rule_files.get(platform, []):
-                    fw_rule_path = fw_entry["path"]
-                    fw_rule_key = str(fw_rule_path).lower()
-                    if fw_rule_key in applied_fw_rule_paths:
-                        continue
-                    fw_key = fw_entry.get("name", fw_rule_path.stem).replace(" ", "_")
-                    fw_scan_ftypes = fw_entry.get("scan_ftypes", [])
-                    target_file_for_fw, fw_target_count = _filter_framework_target_files(
-                        platform_file_path, fw_key, fw_scan_ftypes
-                    )
-                    if fw_target_count == 0:
-                        print(f"\033[93m     --> Skipping framework rules: {platform}/{fw_rule_path.stem} (no applicable files)\033[0m")
-                        applied_fw_rule_paths.add(fw_rule_key)
-                        continue
-                    aliases = fw_entry.get("names", [])
-                    alias_suffix = f" [aliases: {', '.join(aliases)}]" if aliases else ""
-                    print(f"\033[92m     --> Applying framework rules: {platform}/{fw_rule_path.stem}{alias_suffix}\033[0m")
-                    with open(target_file_for_fw, 'r', encoding=futils.detect_encoding_type(target_file_for_fw)) as f_fw_targetfiles:
-                        fw_matched, fw_unmatched = parser.source_parser(
-                            fw_rule_path,
-                            f_fw_targetfiles,
-                            outputfile=None,
-                            findings_json_path=state.outputAoI_JSON,
-                            progress_callback=_source_progress,
-                        )
-                    source_matched_rules.extend(fw_matched)
-                    source_unmatched_rules.extend(fw_unmatched)
-                    applied_fw_rule_paths.add(fw_rule_key)
-                    f_targetfiles.seek(0)
-            completed_platforms.add(platform.upper())
-            scan_state_mgr.mark_platform_completed(platform.upper())
-            scan_state_mgr.update_stage("pattern_matching", "running", {
-                "completed_platforms": sorted(completed_platforms),
-                "common_rules_done": common_rules_done,
+            source_scan_jobs.append({
+                "label": f"rules for {platform}",
+                "rule_path": rules_main_path,
+                "targets": platform_file_path,
+                "platform": platform,
             })
 
+            applied_fw_rule_paths = set()
+            for fw_entry in framework_rule_files.get(platform, []):
+                fw_rule_path = fw_entry["path"]
+                fw_rule_key = str(fw_rule_path).lower()
+                if fw_rule_key in applied_fw_rule_paths:
+                    continue
+                fw_key = fw_entry.get("name", fw_rule_path.stem).replace(" ", "_")
+                fw_scan_ftypes = fw_entry.get("scan_ftypes", [])
+                target_file_for_fw, fw_target_count = _filter_framework_target_files(
+                    platform_file_path, fw_key, fw_scan_ftypes
+                )
+                applied_fw_rule_paths.add(fw_rule_key)
+                if fw_target_count == 0:
+                    print(f"\033[93m     --> Skipping framework rules: {platform}/{fw_rule_path.stem} (no applicable files)\033[0m")
+                    continue
+                aliases = fw_entry.get("names", [])
+                alias_suffix = f" [aliases: {', '.join(aliases)}]" if aliases else ""
+                source_scan_jobs.append({
+                    "label": f"framework rules: {platform}/{fw_rule_path.stem}{alias_suffix}",
+                    "rule_path": fw_rule_path,
+                    "targets": target_file_for_fw,
+                    "platform": platform,
+                })
+
 # Common rules
 if common_rules_done:
     print("\033[92m     --> Skipping common rules (already completed in checkpoint)\033[0m")
-    common_matched_rules, common_unmatched_rules = [], []
 else:
-    print("\033[92m     --> Applying common (platform-independent) rules \033[0m")
-    with open(master_file_paths, 'r', encoding=futils.detect_encoding_type(master_file_paths)) as f_targetfiles:
-        common_matched_rules, common_unmatched_rules = parser.source_parser(
-            rules_common,
-            f_targetfiles,
+    source_scan_jobs.append({
+        "label": "common (platform-independent) rules",
+        "rule_path": rules_common,
+        "targets": master_file_paths,
+        "platform": None,
+    })
+
+
+def _mark_source_job_completed(job, next_job=None):
+    global common_rules_done
+    if job["platform"] is None:
+        common_rules_done = True
+        scan_state_mgr.mark_common_rules_completed()
+        return
+    # A platform is complete once its pack and all of its framework overlays ran.
+    if next_job is not None and next_job["platform"] == job["platform"]:
+        return
+    completed_platforms.add(job["platform"].upper())
+    scan_state_mgr.mark_platform_completed(job["platform"].upper())
+    scan_state_mgr.update_stage("pattern_matching", "running", {
+        "completed_platforms": sorted(completed_platforms),
+        "common_rules_done": common_rules_done,
+    })
+
+
+if state.scanEngine == "rule":
+    for job_index, job in enumerate(source_scan_jobs):
+        print(f"\033[92m     --> Applying {job['label']} \033[0m")
+        with open(job["targets"], 'r', encoding=futils.detect_encoding_type(job["targets"])) as f_targetfiles:
+            matched, unmatched = parser.source_parser(
+                job["rule_path"],
+                f_targetfiles,
+                outputfile=None,
+                findings_json_path=state.outputAoI_JSON,
+                progress_callback=_source_progress,
+            )
+        source_matched_rules.extend(matched)
+        source_unmatched_rules.extend(unmatched)
+        next_job = source_scan_jobs[job_index + 1] if job_index + 1 < len(source_scan_jobs) else None
+        _mark_source_job_completed(job, next_job)
+elif source_scan_jobs:
+    for job in source_scan_jobs:
+        print(f"\033[92m     --> Applying {job['label']} \033[0m")
+    with ExitStack() as job_files:
+        pack_jobs = [
+            (
+                job["rule_path"],
+                job_files.enter_context(
+                    open(job["targets"], 'r', encoding=futils.detect_encoding_type(job["targets"]))
+                ),
+            )
+            for job in source_scan_jobs
+        ]
+        matched, unmatched = parser.scan_source_packs(
+            pack_jobs,
             outputfile=None,
             findings_json_path=state.outputAoI_JSON,
             progress_callback=_source_progress,
+            workers=state.scanWorkers,
         )
-    common_rules_done = True
-    scan_state_mgr.mark_common_rules_completed()
+    source_matched_rules.extend(matched)
+    source_unmatched_rules.extend(unmatched)
+    for job_index, job in enumerate(source_scan_jobs):
+        next_job = source_scan_jobs[job_index + 1] if job_index + 1 < len(source_scan_jobs) else None
+        _mark_source_job_completed(job, next_job)
+
+# Findings were streamed to JSONL spools under runtime/; write the JSON reports once.
+parser.finalize_source_findings(state.outputAoI_JSON)
 
-source_matched_rules.extend(common_matched_rules)
-source_unmatched_rules.extend(common_unmatched_rules)
 print("\033[92m     --- Pattern Matching Summary ---\033[0m")
 scan_state_mgr.update_stage("pattern_matching", "completed", {
     "completed_platforms": sorted(completed_platforms),
@@ -1146,6 +1290,19 @@ scan_state_mgr.update_stage("pattern_matching", "completed", {
 
 result.update_scan_summary("source_files_scanning_summary.matched_rules", source_matched_rules)
 result.update_scan_summary("source_files_scanning_summary.unmatched_rules", source_unmatched_rules)
+result.update_scan_summary("source_files_scanning_summary.prefilter_skipped_evaluations", state.prefilterSkipCnt)
+if state.scanEngine == "file" and state.resultCacheEnabled:
+    result.update_scan_summary("source_files_scanning_summary.result_cache_hits", state.resultCacheHitCnt)
+    result.update_scan_summary("source_files_scanning_summary.result_cache_misses", state.resultCacheMissCnt)
+    result.update_scan_summary("source_files_scanning_summary.result_cache_unread_hits", state.resultCacheUnreadCnt)
+if state.scanEngine == "file" and state.contentDedupEnabled:
+    result.update_scan_summary("source_files_scanning_summary.duplicate_files_reused", state.dedupFileCnt)
+if state.scanEngine == "file" and state.collapseDuplicates:
+    result.update_scan_summary("source_files_scanning_summary.collapsed_duplicate_matches", state.collapsedDuplicateCnt)
+
+# Content hashes seen while scanning let the next scan skip reading unchanged files.
+discovery_snapshot.record_hashes(state.scannedContentHashes)
+discovery_snapshot.close()
 
 print("     [-] Total Files Scanned:", str(state.totalFilesIdentified - state.parseErrorCnt))
 result.update_scan_summary("detection_summary.total_files_scanned", str(state.totalFilesIdentified - state.parseErrorCnt))
@@ -1193,6 +1350,16 @@ result.update_scan_summary("paths_scanning_summary.unmatched_rules", unmatched_r
 
 result.update_scan_summary("detection_summary.file_paths_areas_of_interest_identified", str(state.rulesPathsMatchCnt))
 
+parser.save_rdl_stats()
+
+rdl_memo_lookups = state.rdlMemoHitCnt + state.rdlMemoMissCnt
+result.update_scan_summary("rdl_predicate_memo.hits", state.rdlMemoHitCnt)
+result.update_scan_summary("rdl_predicate_memo.misses", state.rdlMemoMissCnt)
+result.update_scan_summary(
+    "rdl_predicate_memo.hit_rate",
+    round(state.rdlMemoHitCnt / rdl_memo_lookups, 4) if rdl_memo_lookups else 0.0,
+)
+
 total_loc = futils.clean_file_paths(master_file_paths, count_loc=bool(results.loc))
 if total_loc is not None:
     result.update_scan_summary("detection_summary.total_loc", str(total_loc))
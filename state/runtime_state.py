@@ -19,6 +19,7 @@ def _resolve_output_root(env_name, default_relative_dir):
     return Path(str(root_dir) + f"/{default_relative_dir}")
 
 sourcedir = ''       # To be used for storing project directory name
+target_dirpath = None    # Absolute path of the target source directory
 
 verbosity = '1'
 
@@ -61,6 +62,14 @@ parseErrorCnt = 0           # Keep track of file parsing errors
 rulesMatchCnt = 0
 rulesPathsMatchCnt = 0
 suppressedFindingsCnt = 0
+prefilterSkipCnt = 0        # Rule/file evaluations skipped by the literal prefilter
+resultCacheHitCnt = 0       # Files whose source scan results were reused from the result cache
+resultCacheMissCnt = 0      # Files (re-)matched because they are new, changed or uncached
+resultCacheUnreadCnt = 0    # Cache hits taken on the discovery snapshot's stat alone, without reading the file
+dedupFileCnt = 0            # Files whose rule outcomes were reused from an identical file scanned earlier
+collapsedDuplicateCnt = 0   # Rule matches in identical files folded into the first copy's locations
+rdlMemoHitCnt = 0           # RDL predicate searches answered from the per-file memo
+rdlMemoMissCnt = 0          # RDL predicate searches actually run
 ## ------------- </Counters> ------------- ##
 
 # Runtime suppression entries loaded from baseline file
@@ -71,6 +80,64 @@ if ruleEngine in {"legacy", "hybrid"}:
 elif ruleEngine != "rdl":
     ruleEngine = "rdl"
 
+# Source scan engine: "file" reads each target file once and applies every selected
+# rule pack to it (file-major); "rule" applies one rule at a time across all files.
+scanEngine = os.environ.get("DAKSH_SCAN_ENGINE", "file").strip().lower() or "file"
+if scanEngine not in {"file", "rule"}:
+    scanEngine = "file"
+
+# Identical target files are matched once and the outcomes reused for every copy
+# (file engine); with collapseDuplicates the copies are also folded into one
+# evidence entry listing every location instead of being reported separately.
+contentDedupEnabled = os.environ.get("DAKSH_CONTENT_DEDUP", "1").strip().lower() not in {"0", "false", "no", "off"}
+collapseDuplicates = False
+
+# Worker processes for the file-major source scan (1 = serial, 0 = one per CPU).
+try:
+    scanWorkers = max(0, int(os.environ.get("DAKSH_SCAN_WORKERS", "1").strip() or "1"))
+except ValueError:
+    scanWorkers = 1
+
+# Threads listing directories while the project inventory is built (1 = serial).
+# Extra threads mostly help on network-mounted trees where each listing is a round trip.
+try:
+    walkThreads = max(1, int(os.environ.get("DAKSH_WALK_THREADS", "8").strip() or "8"))
+except ValueError:
+    walkThreads = 8
+
+# Directory names (or globs) discover_files() does not descend into; set per scan
+# from the `discovery` section of config/tool.yaml and the --prune-dirs/--no-prune options.
+discoveryPruneDirs = ()
+
+# Archives scanned in place as virtual directories ("app.war!/WEB-INF/web.xml"); set
+# per scan from `discovery.archives` in config/tool.yaml and the --no-archives option.
+# An empty extension list disables archive scanning.
+archiveExtensions = ()
+archiveMaxDepth = 2
+archiveMaxMemberBytes = 10 * 1024 * 1024
+
+# Minified and generated sources (".min." names, generator headers, long lines, little
+# whitespace) found during discovery: "skip" leaves them out of the scan, "window"
+# matches their over-long lines in overlapping windows, "scan" does not classify.
+# Set per scan from `discovery.generated` in config/tool.yaml and --generated-files.
+generatedFilesMode = "scan"
+generatedMaxAvgLineLength = 200
+generatedMinWhitespaceRatio = 0.05
+generatedSampleBytes = 8192
+generatedWindowFiles = frozenset()  # Target paths matched in window mode
+
+# --since <git-ref>: paths (relative to the target, normcased) changed or added since
+# the ref. None scans every discovered file.
+sinceRef = ""
+changedFiles = None
+
+# Files added/removed/modified since the previous scan of the target (a DiscoveryDelta,
+# None without a discovery snapshot), and content hashes keyed by target-relative
+# POSIX path: known from the snapshot for unchanged files, and recorded while scanning.
+discoveryDelta = None
+knownContentHashes = {}
+scannedContentHashes = {}
+
 
 ## ------------- <Temp Files> ------------- ##
 # Runtime/report roots can be overridden for isolated runs (for example web UI jobs).
@@ -88,6 +155,29 @@ inventory_Fpathext = runtime_dirpath / "inventory.json"
 
 # Specify the filename of the JSON file
 scanSummary_Fpath = runtime_dirpath / "scan_summary.json"
+
+# Persistent caches reused across scans (DAKSH_CACHE_DIR lets isolated runs share them)
+cache_dirpath = Path(os.environ["DAKSH_CACHE_DIR"]).expanduser().resolve() if os.environ.get("DAKSH_CACHE_DIR", "").strip() else runtime_dirpath / "cache"
+
+# Compiled rule packs, reused until a rule XML or an RDL script it references changes
+rulePackCacheDir = cache_dirpath / "rulepacks"
+rulePackCacheEnabled = os.environ.get("DAKSH_RULE_PACK_CACHE", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+# Per-file source scan results keyed by content hash, for incremental re-scans
+resultCacheDb = cache_dirpath / "scan_results.sqlite3"
+resultCacheEnabled = os.environ.get("DAKSH_RESULT_CACHE", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+# Observed RDL clause selectivity; WHEN/UNLESS clauses likely to fail cheaply are tried first
+rdlStatsFile = cache_dirpath / "rdl_clause_stats.json"
+rdlReorderEnabled = os.environ.get("DAKSH_RDL_REORDER", "1").strip().lower() not in {"0", "false", "no", "off"}
+
+# Inventory of each scanned target (path, size, mtime, inode) for delta re-discovery
+discoverySnapshotDb = cache_dirpath / "discovery_snapshot.sqlite3"
+discoverySnapshotEnabled = os.environ.get("DAKSH_DISCOVERY_SNAPSHOT", "1").strip().lower() not in {"0", "false", "no", "off"}
+discoveryDelta_Fpath = runtime_dirpath / "discovery_delta.json"
+
+# Minified/generated files found by discovery, with the reason and how they were handled
+generatedFiles_Fpath = runtime_dirpath / "generated_files.json"
 ## ------------- </Temp Files> ------------- ##
 
 
@@ -0,0 +1,192 @@
+# Standard libraries
+import io
+import os
+import zipfile
+from collections import OrderedDict, namedtuple
+
+# Local application imports
+import state.runtime_state as runtime
+from utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+# Separates an archive from the path of a member inside it, as in
+# "/src/app.war!/WEB-INF/web.xml"; nested archives repeat it.
+ARCHIVE_SEPARATOR = "!/"
+
+# One file inside an archive: `ref` is the full "archive!/inner/path" reference,
+# `inner` the member path in the innermost archive and `name` its basename.
+ArchiveMember = namedtuple("ArchiveMember", "ref inner name size")
+
+
+def is_archive_name(file_name):
+    """True when `file_name` has one of the archive extensions scanned in place."""
+    return file_name.lower().endswith(tuple(runtime.archiveExtensions)) if runtime.archiveExtensions else False
+
+
+def split_archive_ref(ref):
+    """
+    Split "a.war!/lib/b.jar!/x.xml" into ["a.war", "lib/b.jar", "x.xml"].
+
+    Only a "!/" that follows an archive name separates, so a directory that merely
+    ends in "!" is not mistaken for an archive. A plain path yields [path].
+    """
+    ref = str(ref)
+    parts = []
+    start = 0
+    search_from = 0
+    while True:
+        pos = ref.find(ARCHIVE_SEPARATOR, search_from)
+        if pos < 0:
+            break
+        if is_archive_name(ref[start:pos]):
+            parts.append(ref[start:pos])
+            start = pos + len(ARCHIVE_SEPARATOR)
+        search_from = pos + len(ARCHIVE_SEPARATOR)
+    parts.append(ref[start:])
+    return parts
+
+
+def is_archive_ref(path):
+    """True when `path` points inside an archive."""
+    path = str(path)
+    return ARCHIVE_SEPARATOR in path and len(split_archive_ref(path)) > 1
+
+
+def _readable_member(info):
+    # Encrypted members cannot be read without a password.
+    return not info.is_dir() and not info.flag_bits & 0x1
+
+
+class ArchiveReader:
+    """
+    Reads archive members lazily, keeping the most recently used archives open.
+
+    Top-level archives are opened from disk and read by streaming; a nested archive
+    is read into memory once (within the member size cap) and then treated the
+    same way. Open handles are per process, so forked scan workers never share a
+    file offset with their parent.
+    """
+
+    def __init__(self, max_open=8):
+        self.max_open = max_open
+        self._open_archives = OrderedDict()
+        self._pid = os.getpid()
+
+    def _archive(self, chain):
+        if self._pid != os.getpid():
+            # Inherited across fork: leave the parent's handles alone.
+            self._open_archives = OrderedDict()
+            self._pid = os.getpid()
+        archive = self._open_archives.get(chain)
+        if archive is not None:
+            self._open_archives.move_to_end(chain)
+            return archive
+
+        if len(chain) == 1:
+            archive = zipfile.ZipFile(chain[0])
+        else:
+            parent = self._archive(chain[:-1])
+            archive = zipfile.ZipFile(io.BytesIO(self._read(parent, chain[-1], runtime.archiveMaxMemberBytes)))
+        self._open_archives[chain] = archive
+        while len(self._open_archives) > self.max_open:
+            _, evicted = self._open_archives.popitem(last=False)
+            evicted.close()
+        return archive
+
+    @staticmethod
+    def _read(archive, inner, limit):
+        info = archive.getinfo(inner)
+        if info.file_size > limit:
+            raise IOError(f"{inner} is larger than the archive member size cap ({limit} bytes)")
+        with archive.open(info) as member:
+            # The declared size can lie; never inflate more than the cap.
+            return member.read(limit)
+
+    def read(self, ref, limit=None):
+        """
+        Return the bytes of the member `ref` points to, at most `limit` of them.
+
+        Raises:
+            IOError: The archive or member cannot be read.
+        """
+        parts = split_archive_ref(ref)
+        if len(parts) < 2:
+            raise IOError(f"{ref} is not an archive member reference")
+        try:
+            archive = self._archive(tuple(parts[:-1]))
+            data = self._read(archive, parts[-1], runtime.archiveMaxMemberBytes)
+        except (OSError, KeyError, RuntimeError, EOFError, zipfile.BadZipFile, NotImplementedError) as exc:
+            raise IOError(f"Could not read {ref}: {exc}") from exc
+        return data if limit is None else data[:limit]
+
+    def list_members(self, archive_path):
+        """
+        Return (members, skipped) for the archive at `archive_path`.
+
+        Members are ArchiveMember tuples sorted by inner path. Archives nested within
+        runtime.archiveMaxDepth levels are expanded in place of being listed; members
+        over runtime.archiveMaxMemberBytes, encrypted members, archives nested too
+        deep and unreadable nested archives are counted in `skipped`.
+        """
+        members = []
+        skipped = 0
+        pending = [(str(archive_path),)]
+        while pending:
+            chain = pending.pop()
+            try:
+                infos = self._archive(chain).infolist()
+            except (OSError, KeyError, RuntimeError, EOFError, zipfile.BadZipFile, NotImplementedError) as exc:
+                logger.debug("Skipping unreadable archive %s: %s", ARCHIVE_SEPARATOR.join(chain), exc)
+                if len(chain) == 1:
+                    raise IOError(f"Could not read archive {chain[0]}: {exc}") from exc
+                skipped += 1
+                continue
+            nested = []
+            for info in sorted(infos, key=lambda item: item.filename):
+                if not _readable_member(info):
+                    if not info.is_dir():
+                        skipped += 1
+                    continue
+                inner = info.filename
+                if info.file_size > runtime.archiveMaxMemberBytes:
+                    skipped += 1
+                elif is_archive_name(inner):
+                    if len(chain) < runtime.archiveMaxDepth:
+                        nested.append(chain + (inner,))
+                    else:
+                        skipped += 1
+                else:
+                    members.append(ArchiveMember(
+                        ARCHIVE_SEPARATOR.join(chain + (inner,)),
+                        inner,
+                        inner.rsplit("/", 1)[-1],
+                        info.file_size,
+                    ))
+            pending.extend(reversed(nested))
+        members.sort(key=lambda member: member.ref)
+        return members, skipped
+
+
+_reader = ArchiveReader()
+
+
+def list_archive_members(archive_path):
+    """Return (members, skipped) for `archive_path`; see ArchiveReader.list_members()."""
+    return _reader.list_members(archive_path)
+
+
+def read_member(ref, limit=None):
+    """Return the bytes of the archive member `ref`, at most `limit` of them."""
+    return _reader.read(ref, limit)
+
+
+def open_text(path, encoding=None, errors=None):
+    """
+    Open `path` for reading text, whether it is a plain file or an archive member.
+    """
+    if is_archive_ref(path):
+        data = read_member(path)
+        return io.TextIOWrapper(io.BytesIO(data), encoding=encoding, errors=errors)
+    return open(path, "r", encoding=encoding, errors=errors)
@@ -164,6 +164,85 @@ def get_analysis_config():
     }
 
 
+DEFAULT_PRUNE_DIRS = (
+    "node_modules", "bower_components", "jspm_packages", "vendor", "dist", "build",
+    ".git", ".hg", ".svn", "__pycache__", ".venv", "venv", ".tox", ".mypy_cache",
+    ".pytest_cache", ".gradle", ".next", ".nuxt",
+)
+
+
+def parse_prune_dirs(value):
+    """
+    Split a comma-separated (or list) directory-name policy into clean names.
+    """
+    items = value.split(",") if isinstance(value, str) else list(value or [])
+    return [str(item).strip().strip("/\\") for item in items if str(item).strip().strip("/\\")]
+
+
+DEFAULT_ARCHIVE_EXTENSIONS = (".zip", ".jar", ".war", ".ear", ".apk", ".aar")
+
+GENERATED_FILE_MODES = ("skip", "window", "scan")
+
+
+def parse_archive_extensions(value):
+    """
+    Split a comma-separated (or list) archive extension policy into ".ext" names.
+    """
+    items = value.split(",") if isinstance(value, str) else list(value or [])
+    extensions = []
+    for item in items:
+        ext = str(item).strip().lower()
+        if ext:
+            extensions.append(ext if ext.startswith(".") else "." + ext)
+    return extensions
+
+
+def get_discovery_config():
+    """
+    Get file discovery settings (directory pruning, archives, generated files) with sane defaults.
+    """
+    tool_cfg = get_tool_config()
+    discovery_cfg = tool_cfg.get("discovery", {}) if isinstance(tool_cfg, dict) else {}
+    if not isinstance(discovery_cfg, dict):
+        discovery_cfg = {}
+    archives_cfg = discovery_cfg.get("archives", {})
+    if not isinstance(archives_cfg, dict):
+        archives_cfg = {}
+    generated_cfg = discovery_cfg.get("generated", {})
+    if not isinstance(generated_cfg, dict):
+        generated_cfg = {}
+
+    def _pos_int(val, default):
+        try:
+            v = int(val)
+            return v if v > 0 else default
+        except (TypeError, ValueError):
+            return default
+
+    def _ratio(val, default):
+        try:
+            v = float(val)
+            return v if 0 <= v <= 1 else default
+        except (TypeError, ValueError):
+            return default
+
+    generated_mode = str(generated_cfg.get("mode", "window")).strip().lower()
+    prune_dirs = discovery_cfg.get("prune_dirs")
+    archive_exts = archives_cfg.get("extensions")
+    return {
+        "prune_enabled": bool(discovery_cfg.get("prune_enabled", True)),
+        "prune_dirs": parse_prune_dirs(prune_dirs) if prune_dirs is not None else list(DEFAULT_PRUNE_DIRS),
+        "archives_enabled": bool(archives_cfg.get("enabled", True)),
+        "archive_extensions": parse_archive_extensions(archive_exts) if archive_exts is not None else list(DEFAULT_ARCHIVE_EXTENSIONS),
+        "archive_max_depth": _pos_int(archives_cfg.get("max_depth"), 2),
+        "archive_max_member_bytes": _pos_int(archives_cfg.get("max_member_bytes"), 10 * 1024 * 1024),
+        "generated_mode": generated_mode if generated_mode in GENERATED_FILE_MODES else "window",
+        "generated_max_avg_line_length": _pos_int(generated_cfg.get("max_avg_line_length"), 200),
+        "generated_min_whitespace_ratio": _ratio(generated_cfg.get("min_whitespace_ratio"), 0.05),
+        "generated_sample_bytes": _pos_int(generated_cfg.get("sample_bytes"), 8192),
+    }
+
+
 def init_or_prompt_project_config():
     import utils.cli_utils as cli
 
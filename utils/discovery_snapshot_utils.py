@@ -0,0 +1,222 @@
+# Standard libraries
+import sqlite3
+from collections import namedtuple
+from pathlib import Path
+
+# Local application imports
+from utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+# Directory and file stats from mtimes this close to the snapshot time are not
+# trusted: a change landing in the same timestamp tick would go unnoticed.
+RACY_WINDOW_NS = 2_000_000_000
+
+# The inventory of a project as recorded by the previous scan. `dirs` maps a
+# directory's rel path to (mtime_ns, inode); `children` maps it to its entries as
+# (name, is_dir, is_link, size, mtime_ns, inode) in name order; `hashes` maps a
+# file's rel path to the content hash recorded for that stat.
+PreviousSnapshot = namedtuple("PreviousSnapshot", "taken_at_ns dirs children hashes")
+
+# Files added, removed and modified (size, mtime or inode changed) since the
+# previous snapshot, as sorted rel paths, plus how many directories were reused.
+DiscoveryDelta = namedtuple("DiscoveryDelta", "first_run added removed modified dirs_reused dirs_total")
+
+
+def stat_trusted(mtime_ns, taken_at_ns):
+    """True when an mtime is old enough, relative to a snapshot, to rely on."""
+    return mtime_ns + RACY_WINDOW_NS < taken_at_ns
+
+
+class DiscoverySnapshot:
+    """
+    Persistent inventory of a scan target: every directory with its mtime and
+    inode, every file with its size, mtime, inode and last known content hash.
+
+    The next scan of the same target hands the loaded snapshot to the project
+    index, which reuses the listing of any directory whose mtime and inode are
+    unchanged instead of reading it again, then diffs the new inventory against
+    the snapshot to report added, removed and modified files.
+    """
+
+    VERSION = 1
+
+    def __init__(self, db_path, project_root, enabled=True):
+        self.db_path = Path(db_path)
+        self.root = str(Path(project_root).resolve())
+        self.enabled = bool(enabled)
+        self._conn = None
+        if self.enabled:
+            self._open()
+
+    def _open(self):
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.VERSION:
+                for table in ("snapshots", "dirs", "entries"):
+                    self._conn.execute(f"DROP TABLE IF EXISTS {table}")
+                self._conn.execute(f"PRAGMA user_version = {self.VERSION}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS snapshots ("
+                " root TEXT PRIMARY KEY,"
+                " taken_at_ns INTEGER NOT NULL)"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS dirs ("
+                " root TEXT NOT NULL,"
+                " rel TEXT NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " inode INTEGER NOT NULL,"
+                " PRIMARY KEY (root, rel))"
+            )
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS entries ("
+                " root TEXT NOT NULL,"
+                " rel TEXT NOT NULL,"
+                " dir_rel TEXT NOT NULL,"
+                " name TEXT NOT NULL,"
+                " is_dir INTEGER NOT NULL,"
+                " is_link INTEGER NOT NULL,"
+                " size INTEGER NOT NULL,"
+                " mtime_ns INTEGER NOT NULL,"
+                " inode INTEGER NOT NULL,"
+                " content_hash TEXT,"
+                " PRIMARY KEY (root, rel))"
+            )
+            self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Discovery snapshot disabled, cannot open %s: %s", self.db_path, exc)
+            self.close()
+            self.enabled = False
+
+    def load(self):
+        """Return the PreviousSnapshot of this root, or None if there is none."""
+        if not self.enabled:
+            return None
+        try:
+            row = self._conn.execute("SELECT taken_at_ns FROM snapshots WHERE root = ?", (self.root,)).fetchone()
+            if row is None:
+                return None
+            dirs = {
+                rel: (mtime_ns, inode)
+                for rel, mtime_ns, inode in self._conn.execute(
+                    "SELECT rel, mtime_ns, inode FROM dirs WHERE root = ?", (self.root,)
+                )
+            }
+            children = {}
+            hashes = {}
+            rows = self._conn.execute(
+                "SELECT rel, dir_rel, name, is_dir, is_link, size, mtime_ns, inode, content_hash"
+                " FROM entries WHERE root = ? ORDER BY dir_rel, name",
+                (self.root,),
+            )
+            for rel, dir_rel, name, is_dir, is_link, size, mtime_ns, inode, content_hash in rows:
+                children.setdefault(dir_rel, []).append(
+                    (name, bool(is_dir), bool(is_link), size, mtime_ns, inode)
+                )
+                if content_hash:
+                    hashes[rel] = content_hash
+        except sqlite3.Error as exc:
+            logger.warning("Failed to read discovery snapshot %s: %s", self.db_path, exc)
+            return None
+        return PreviousSnapshot(row[0], dirs, children, hashes)
+
+    def update(self, project_index, previous=None):
+        """
+        Diff `project_index` against `previous` and replace the stored snapshot.
+
+        Content hashes are carried over for files whose stat is unchanged and old
+        enough to be trusted. Returns (DiscoveryDelta, {rel: content_hash}) with
+        those hashes; an empty delta with first_run set when there was no snapshot.
+        """
+        previous_files = {}
+        if previous is not None:
+            for dir_rel, children in previous.children.items():
+                for name, is_dir, _, size, mtime_ns, inode in children:
+                    if not is_dir:
+                        rel = f"{dir_rel}/{name}" if dir_rel else name
+                        previous_files[rel] = (size, mtime_ns, inode)
+
+        added, modified, known_hashes = [], [], {}
+        current_files = set()
+        for entry in project_index.entries:
+            if entry.is_dir:
+                continue
+            rel = entry.rel.replace("\\", "/")
+            current_files.add(rel)
+            if previous is None:
+                continue
+            stat_key = previous_files.get(rel)
+            if stat_key is None:
+                added.append(rel)
+            elif stat_key != (entry.size, entry.mtime_ns, entry.inode):
+                modified.append(rel)
+            elif rel in previous.hashes and stat_trusted(entry.mtime_ns, previous.taken_at_ns):
+                known_hashes[rel] = previous.hashes[rel]
+        removed = sorted(set(previous_files) - current_files)
+
+        delta = DiscoveryDelta(
+            previous is None,
+            sorted(added),
+            removed,
+            sorted(modified),
+            project_index.reused_dirs,
+            len(project_index.dir_stats),
+        )
+        self._save(project_index, known_hashes)
+        return delta, known_hashes
+
+    def _save(self, project_index, known_hashes):
+        if not self.enabled:
+            return
+        try:
+            with self._conn:
+                for table in ("snapshots", "dirs", "entries"):
+                    self._conn.execute(f"DELETE FROM {table} WHERE root = ?", (self.root,))
+                self._conn.execute(
+                    "INSERT INTO snapshots (root, taken_at_ns) VALUES (?, ?)",
+                    (self.root, project_index.started_at_ns),
+                )
+                self._conn.executemany(
+                    "INSERT INTO dirs (root, rel, mtime_ns, inode) VALUES (?, ?, ?, ?)",
+                    (
+                        (self.root, rel.replace("\\", "/"), mtime_ns, inode)
+                        for rel, (mtime_ns, inode) in project_index.dir_stats.items()
+                    ),
+                )
+                rows = []
+                for entry in project_index.entries:
+                    rel = entry.rel.replace("\\", "/")
+                    dir_rel = rel.rpartition("/")[0]
+                    rows.append((
+                        self.root, rel, dir_rel, entry.name, int(entry.is_dir), int(entry.is_link),
+                        entry.size, entry.mtime_ns, entry.inode, known_hashes.get(rel),
+                    ))
+                self._conn.executemany(
+                    "INSERT INTO entries (root, rel, dir_rel, name, is_dir, is_link, size, mtime_ns, inode, content_hash)"
+                    " VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except (sqlite3.Error, UnicodeError) as exc:
+            logger.warning("Failed to update discovery snapshot %s: %s", self.db_path, exc)
+
+    def record_hashes(self, hashes):
+        """Store {rel: content_hash} computed while scanning, for the next snapshot diff."""
+        if not self.enabled or not hashes:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "UPDATE entries SET content_hash = ? WHERE root = ? AND rel = ?",
+                    ((content_hash, self.root, rel) for rel, content_hash in hashes.items()),
+                )
+        except (sqlite3.Error, UnicodeError) as exc:
+            logger.warning("Failed to update discovery snapshot %s: %s", self.db_path, exc)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
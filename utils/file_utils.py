@@ -11,6 +11,7 @@ import ruamel.yaml
 
 # Local application imports
 import state.runtime_state as runtime
+import utils.archive_utils as archiveops
 
 
 # Current directory of the python file
@@ -36,7 +37,7 @@ def readfile_FallbackEncoding(filepath, fallback_order=("ISO-8859-1", "utf-8")):
     Opens a file with specified encodings in fallback order.
 
     Parameters:
-        filepath (str): The path to the file to open.
+        filepath (str): The path to the file to open, or an "archive!/member" reference.
         fallback_order (tuple): Encodings to try in order.
 
     Returns:
@@ -47,7 +48,7 @@ def readfile_FallbackEncoding(filepath, fallback_order=("ISO-8859-1", "utf-8")):
     """
     for encoding in fallback_order:
         try:
-            return open(filepath, 'r', encoding=encoding)
+            return archiveops.open_text(filepath, encoding=encoding)
         except (UnicodeDecodeError, ValueError):
             continue
     raise IOError(f"Could not open file {filepath} with any of the specified encodings: {fallback_order}")
@@ -217,7 +218,7 @@ def count_effective_lines(filepath):
     in_multiline_comment = False  # Tracks if we are inside a multi-line comment
 
     try:
-        with open(filepath, 'r', errors='ignore') as f:
+        with archiveops.open_text(filepath, errors='ignore') as f:
             for line in f:
                 stripped = line.strip()
 
@@ -0,0 +1,87 @@
+# Standard libraries
+import re
+
+# Local application imports
+import state.runtime_state as runtime
+from utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+# Banners code generators write as a comment line at the top of their output. Each
+# must match a whole comment line, so prose merely mentioning generated code does not.
+GENERATOR_BANNERS = tuple(re.compile(pattern) for pattern in (
+    r"^\s*//\s*Code generated .* DO NOT EDIT\.$",                               # Go convention
+    r"^\s*(?://|#|/?\*+)\s*@generated\b",                                      # Meta/Buck, Relay, Thrift
+    r"^\s*(?://|#)\s*Generated by the protocol buffer compiler\.\s+DO NOT EDIT!",  # protoc
+    r"^#\s*Generated by Django \d[\w.]* on \d{4}-\d{2}-\d{2}",                  # Django migrations
+    r"^\s*//\s*<auto-generated\b",                                              # .NET tooling
+))
+
+# Only the first lines of a file are searched for a generator banner.
+HEADER_LINES = 10
+
+# Samples shorter than this say too little about line length or whitespace.
+MIN_SAMPLE_CHARS = 1024
+
+# The long_lines and low_whitespace heuristics need this many complete lines in the
+# sample, so a short hand-written file with one long line is still scanned.
+# Single-line bundles are recognised by their ".min." name instead.
+MIN_SAMPLE_LINES = 5
+
+_MINIFIED_NAME = re.compile(r"[.\-_]min\.[a-z0-9]+$", re.IGNORECASE)
+
+
+def classify_name(file_name):
+    """Return "minified_name" for names like app.min.js or style-min.css, else None."""
+    return "minified_name" if _MINIFIED_NAME.search(file_name) else None
+
+
+def classify_sample(sample, truncated=False):
+    """
+    Return why a file whose first characters are `sample` looks generated or
+    minified ("generator_header", "long_lines", "low_whitespace"), or None.
+
+    `truncated` tells that the file goes on after the sample, so its last line is
+    incomplete and is left out of the average line length. Only whole comment lines
+    near the top count as generator banners; line length and whitespace are only
+    judged on samples of at least MIN_SAMPLE_LINES lines.
+    """
+    lines = sample.split("\n")
+    for line in lines[:HEADER_LINES]:
+        line = line.rstrip("\r")
+        if any(banner.match(line) for banner in GENERATOR_BANNERS):
+            return "generator_header"
+    if truncated and len(lines) > 1:
+        lines.pop()
+    elif lines[-1] == "":
+        lines.pop()
+    if len(sample) < MIN_SAMPLE_CHARS or len(lines) < MIN_SAMPLE_LINES:
+        return None
+
+    if sum(len(line) for line in lines) / len(lines) > runtime.generatedMaxAvgLineLength:
+        return "long_lines"
+
+    whitespace = sum(1 for char in sample if char.isspace())
+    if whitespace / len(sample) < runtime.generatedMinWhitespaceRatio:
+        return "low_whitespace"
+    return None
+
+
+def classify_file(file_path, file_name):
+    """
+    Classify one discovered file from its name and the first
+    runtime.generatedSampleBytes of its content. Returns a reason string for
+    minified or generated files, None for regular sources and unreadable files.
+    """
+    reason = classify_name(file_name)
+    if reason:
+        return reason
+    try:
+        with open(file_path, "rb") as handle:
+            head = handle.read(runtime.generatedSampleBytes + 1)
+    except OSError as exc:
+        logger.debug("Cannot sample %s for generated-file detection: %s", file_path, exc)
+        return None
+    truncated = len(head) > runtime.generatedSampleBytes
+    return classify_sample(head[:runtime.generatedSampleBytes].decode("utf-8", "replace"), truncated)
@@ -0,0 +1,55 @@
+# Standard libraries
+import os
+import subprocess
+
+# Local application imports
+from utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+def _run_git(target_dir, *args):
+    try:
+        completed = subprocess.run(
+            ["git", "-C", str(target_dir), *args],
+            capture_output=True,
+            check=False,
+        )
+    except OSError as exc:
+        raise RuntimeError(f"git is not available: {exc}") from exc
+    if completed.returncode != 0:
+        message = completed.stderr.decode("utf-8", errors="replace").strip()
+        raise RuntimeError(message or f"git {' '.join(args)} failed")
+    return completed.stdout
+
+
+def _split_paths(raw):
+    return [item.decode("utf-8", errors="surrogateescape") for item in raw.split(b"\0") if item]
+
+
+def changed_files_since(target_dir, ref):
+    """
+    Return the files under `target_dir` changed or added since the git ref `ref`.
+
+    Uses the local checkout only: modified, added, renamed and type-changed files
+    from `git diff` against `ref` (committed, staged and unstaged changes), plus
+    untracked files that are not ignored. Deleted files are left out.
+
+    Returns:
+        set: Normalised paths relative to `target_dir`.
+
+    Raises:
+        RuntimeError: `target_dir` is not in a git work tree or `ref` is unknown.
+    """
+    _run_git(target_dir, "rev-parse", "--is-inside-work-tree")
+    try:
+        _run_git(target_dir, "rev-parse", "--verify", "--quiet", f"{ref}^{{commit}}")
+    except RuntimeError as exc:
+        raise RuntimeError(f"unknown git ref '{ref}'") from exc
+
+    changed = _split_paths(_run_git(
+        target_dir, "diff", "--name-only", "--relative", "-z", "--diff-filter=ACMRT", ref, "--",
+    ))
+    untracked = _split_paths(_run_git(target_dir, "ls-files", "--others", "--exclude-standard", "-z"))
+    logger.debug("git reports %d changed and %d untracked files since %s", len(changed), len(untracked), ref)
+    return {os.path.normcase(os.path.normpath(path)) for path in changed + untracked}
@@ -0,0 +1,131 @@
+# Standard libraries
+import json
+import os
+from pathlib import Path
+
+# Local application imports
+from utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class JsonlAppender:
+    """
+    Append-only JSON Lines writer with commit points.
+
+    Records are written as soon as they are complete, so memory does not grow with
+    the number of records. commit() stores the current size in a `.commit` sidecar;
+    reopening the file truncates anything written after the last commit (for example
+    by an interrupted scan that is resumed). With `path=None` records are only counted.
+    """
+
+    def __init__(self, path, seed_json_path=None):
+        self.path = Path(path) if path else None
+        self.count = 0
+        self._handle = None
+        if self.path is None:
+            return
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        commit_path = self._commit_path()
+        committed = {}
+        if self.path.exists() and commit_path.exists():
+            try:
+                committed = json.loads(commit_path.read_text(encoding="utf-8"))
+            except (OSError, ValueError):
+                committed = {}
+
+        self._handle = open(self.path, "a+b")
+        if committed:
+            self._handle.truncate(int(committed.get("size", 0)))
+            self.count = int(committed.get("count", 0))
+        else:
+            self._handle.truncate(0)
+            if seed_json_path:
+                self._seed_from_json(seed_json_path)
+        self._handle.seek(0, os.SEEK_END)
+        if not committed:
+            self.commit()
+
+    def _commit_path(self):
+        return self.path.with_name(self.path.name + ".commit")
+
+    def _seed_from_json(self, json_path):
+        # Continue a findings JSON written before JSONL spooling existed.
+        json_path = Path(json_path)
+        if not json_path.exists():
+            return
+        try:
+            records = json.loads(json_path.read_text(encoding="utf-8"))
+        except (OSError, ValueError) as exc:
+            logger.warning("Failed to read %s: %s", json_path, exc)
+            return
+        for record in records if isinstance(records, list) else []:
+            self.append(record)
+
+    def append(self, record):
+        if self._handle is not None:
+            self._handle.write(json.dumps(record).encode("utf-8") + b"\n")
+        self.count += 1
+
+    def commit(self):
+        if self._handle is None:
+            return
+        self._handle.flush()
+        size = self._handle.tell()
+        tmp_path = self._commit_path().with_suffix(".tmp")
+        tmp_path.write_text(json.dumps({"size": size, "count": self.count}), encoding="utf-8")
+        os.replace(tmp_path, self._commit_path())
+
+    def close(self):
+        if self._handle is not None:
+            self._handle.close()
+            self._handle = None
+
+
+def discard_jsonl(path):
+    """Delete a JSONL spool and its `.commit` sidecar, so the next JsonlAppender starts empty."""
+    path = Path(path)
+    for each in (path, path.with_name(path.name + ".commit")):
+        try:
+            each.unlink()
+        except FileNotFoundError:
+            pass
+
+
+def iter_jsonl(path):
+    with open(path, "r", encoding="utf-8") as handle:
+        for line in handle:
+            if line.strip():
+                yield json.loads(line)
+
+
+def compact_jsonl(jsonl_path, json_path, write_empty=True):
+    """
+    Stream a JSONL file into a JSON array file, one record at a time.
+
+    The output is byte-for-byte what json.dumps(records, indent=2) would produce.
+    Returns the number of records, or None when the JSONL file does not exist.
+    """
+    jsonl_path = Path(jsonl_path)
+    if not jsonl_path.exists():
+        return None
+
+    json_path = Path(json_path)
+    tmp_path = json_path.with_name(json_path.name + ".tmp")
+    count = 0
+    try:
+        json_path.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, "w", encoding="utf-8") as out:
+            for record in iter_jsonl(jsonl_path):
+                out.write("[\n  " if count == 0 else ",\n  ")
+                out.write(json.dumps(record, indent=2).replace("\n", "\n  "))
+                count += 1
+            out.write("\n]" if count else "[]")
+        if count or write_empty:
+            os.replace(tmp_path, json_path)
+        else:
+            tmp_path.unlink()
+    except (OSError, ValueError) as exc:
+        logger.error("Failed to write %s from %s: %s", json_path, jsonl_path, exc)
+    return count
@@ -0,0 +1,277 @@
+# Standard libraries
+import fnmatch
+import os
+import re
+import stat
+import time
+from collections import namedtuple
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from pathlib import Path
+
+# Local application imports
+import state.runtime_state as runtime
+from utils.discovery_snapshot_utils import stat_trusted
+
+
+# One directory entry of the inventory. `rel` is the path relative to the project
+# root joined with os.sep; size, mtime_ns, inode and ext are only meaningful for files.
+InventoryEntry = namedtuple("InventoryEntry", "name rel is_dir is_link size mtime_ns inode ext")
+
+
+class ProjectFileIndex:
+    """
+    Every file and directory under a project root, listed once with os.scandir().
+
+    The tree is read a single time at scan start and every stage that used to walk
+    it consumes this inventory instead: walk() replays os.walk(), rglob() replays
+    Path.rglob() and glob() answers RDL project observations.
+
+    With `threads` > 1 sibling directories are listed concurrently by a bounded
+    thread pool, which hides per-directory round trips on network mounts. Entries
+    are sorted by name within each directory, so the order never depends on the
+    file system or on thread timing. Directories whose name matches `prune_dirs`
+    (names or globs, see prune_matcher()) show up in their parent's listing but are
+    never read; their paths are kept in `pruned`.
+
+    `previous` is the DiscoverySnapshot of an earlier scan. A directory whose
+    mtime and inode are unchanged since then still has the same entries, so its
+    listing is taken from the snapshot instead of being read again; its files are
+    still stat'ed, since editing a file in place leaves the directory untouched.
+    """
+
+    def __init__(self, project_root, threads=1, prune_dirs=(), previous=None):
+        self.root = Path(project_root or ".").resolve()
+        self.threads = max(1, int(threads or 1))
+        self.prune_dirs = tuple(prune_dirs or ())
+        self._is_pruned = prune_matcher(self.prune_dirs)
+        self.entries = []
+        self.pruned = []
+        self.dir_stats = {}
+        self.reused_dirs = 0
+        self.started_at_ns = time.time_ns()
+        self._previous = previous
+        self._dirs = {}
+        self._glob_cache = {}
+        self._consulted_cache = {}
+        self._scan(str(self.root))
+        self._previous = None
+
+    def _read_listing(self, dir_path, rel_dir):
+        try:
+            with os.scandir(dir_path) as scandir_it:
+                dir_entries = sorted(scandir_it, key=lambda entry: entry.name)
+        except OSError:
+            return None
+
+        children = []
+        for entry in dir_entries:
+            rel = os.path.join(rel_dir, entry.name) if rel_dir else entry.name
+            try:
+                is_dir = entry.is_dir()
+            except OSError:
+                is_dir = False
+            try:
+                is_link = entry.is_symlink()
+            except OSError:
+                is_link = False
+            size, mtime_ns, inode, ext = 0, 0, 0, ""
+            if not is_dir:
+                try:
+                    stat_result = entry.stat()
+                    size, mtime_ns, inode = stat_result.st_size, stat_result.st_mtime_ns, entry.inode()
+                except OSError:
+                    pass
+                ext = os.path.splitext(entry.name)[1].lower()
+            children.append(InventoryEntry(entry.name, rel, is_dir, is_link, size, mtime_ns, inode, ext))
+        return children
+
+    def _reuse_listing(self, dir_path, rel_dir, listed):
+        children = []
+        for name, is_dir, is_link, _, _, _ in sorted(listed):
+            rel = os.path.join(rel_dir, name) if rel_dir else name
+            size, mtime_ns, inode, ext = 0, 0, 0, ""
+            if is_link or not is_dir:
+                # A symlink's target may have changed type; re-read it like scandir does.
+                try:
+                    stat_result = os.stat(os.path.join(dir_path, name))
+                    is_dir = stat.S_ISDIR(stat_result.st_mode)
+                    if not is_dir:
+                        size, mtime_ns, inode = stat_result.st_size, stat_result.st_mtime_ns, stat_result.st_ino
+                except OSError:
+                    is_dir = False
+                if not is_dir:
+                    ext = os.path.splitext(name)[1].lower()
+            children.append(InventoryEntry(name, rel, is_dir, is_link, size, mtime_ns, inode, ext))
+        return children
+
+    def _list_dir(self, root, rel_dir):
+        """Return (rel_dir, dir stat, children, subdirectories to enter, reused), or None if unreadable."""
+        dir_path = os.path.join(root, rel_dir) if rel_dir else root
+        try:
+            dir_stat = os.stat(dir_path)
+        except OSError:
+            return None
+        dir_key = (dir_stat.st_mtime_ns, dir_stat.st_ino)
+
+        children = None
+        previous = self._previous
+        if previous is not None:
+            snapshot_rel = rel_dir.replace(os.sep, "/")
+            if previous.dirs.get(snapshot_rel) == dir_key and stat_trusted(dir_key[0], previous.taken_at_ns):
+                children = self._reuse_listing(dir_path, rel_dir, previous.children.get(snapshot_rel, ()))
+        reused = children is not None
+        if children is None:
+            children = self._read_listing(dir_path, rel_dir)
+            if children is None:
+                return None
+
+        # Symlinked directories are listed but not entered, as with os.walk().
+        walk_into = [entry.rel for entry in children if entry.is_dir and not entry.is_link]
+        return rel_dir, dir_key, children, walk_into, reused
+
+    def _record_dir(self, listing):
+        if listing is None:
+            return []
+        rel_dir, dir_key, children, walk_into, reused = listing
+        self._dirs[rel_dir] = children
+        self.dir_stats[rel_dir] = dir_key
+        self.reused_dirs += int(reused)
+        enter = []
+        for rel in walk_into:
+            if self._is_pruned(os.path.basename(rel)):
+                self.pruned.append(rel)
+            else:
+                enter.append(rel)
+        return enter
+
+    def _scan(self, root):
+        if self.threads == 1:
+            pending = [""]
+            while pending:
+                pending.extend(self._record_dir(self._list_dir(root, pending.pop())))
+        else:
+            with ThreadPoolExecutor(max_workers=self.threads, thread_name_prefix="daksh-walk") as pool:
+                futures = {pool.submit(self._list_dir, root, "")}
+                while futures:
+                    done, futures = wait(futures, return_when=FIRST_COMPLETED)
+                    for future in done:
+                        for rel in self._record_dir(future.result()):
+                            futures.add(pool.submit(self._list_dir, root, rel))
+        self.pruned.sort()
+
+        # Lay the entries out top-down, depth-first, whatever order threads finished in.
+        stack = [""]
+        while stack:
+            children = self._dirs.get(stack.pop())
+            if children is None:
+                continue
+            self.entries.extend(children)
+            stack.extend(reversed([entry.rel for entry in children if entry.rel in self._dirs]))
+
+    def walk(self, top=None):
+        """
+        Yield (dirpath, dirnames, filenames) as os.walk(top) would, in sorted order.
+
+        `top` is the project root as the caller spells it and prefixes every
+        dirpath. Pruning `dirnames` in place skips those subtrees, as with os.walk();
+        directories pruned while indexing are in `dirnames` but yield nothing.
+        """
+        top = os.fspath(top) if top is not None else str(self.root)
+        stack = [("", top)]
+        while stack:
+            rel_dir, dirpath = stack.pop()
+            children = self._dirs.get(rel_dir)
+            if children is None:
+                continue
+            dirnames = [entry.name for entry in children if entry.is_dir]
+            filenames = [entry.name for entry in children if not entry.is_dir]
+            yield dirpath, dirnames, filenames
+
+            walkable = {entry.name for entry in children if entry.is_dir and not entry.is_link}
+            stack.extend(
+                (os.path.join(rel_dir, name) if rel_dir else name, os.path.join(dirpath, name))
+                for name in reversed(dirnames)
+                if name in walkable
+            )
+
+    def files(self):
+        """Return the file entries (not directories) in walk order."""
+        return [entry for entry in self.entries if not entry.is_dir]
+
+    def rglob(self, pattern, top=None):
+        """Return Path(top).rglob(pattern) for a basename pattern such as "*.java"."""
+        top = Path(top) if top is not None else self.root
+        name_match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+        return [top / entry.rel for entry in self.entries if name_match(os.path.normcase(entry.name))]
+
+    def glob(self, pattern):
+        """Return the entries whose relative path or basename matches `pattern`."""
+        matches = self._glob_cache.get(pattern)
+        if matches is None:
+            glob_match = re.compile(fnmatch.translate(os.path.normcase(pattern))).match
+            matches = tuple(
+                self.root / entry.rel for entry in self.entries
+                if glob_match(os.path.normcase(entry.rel.replace(os.sep, "/")))
+                or glob_match(os.path.normcase(entry.name))
+            )
+            self._glob_cache[pattern] = matches
+        return matches
+
+    def consulted(self, pattern, limit=8):
+        """Return root-relative paths of the first `limit` glob() matches."""
+        key = (pattern, limit)
+        consulted = self._consulted_cache.get(key)
+        if consulted is None:
+            consulted = []
+            for item in self.glob(pattern)[:limit]:
+                try:
+                    consulted.append(item.resolve().relative_to(self.root).as_posix())
+                except Exception:
+                    consulted.append(item.as_posix())
+            consulted = tuple(consulted)
+            self._consulted_cache[key] = consulted
+        return consulted
+
+
+def prune_matcher(prune_dirs):
+    """
+    Return a predicate telling whether a directory name is pruned by `prune_dirs`.
+    """
+    exact = {name for name in prune_dirs if not any(token in name for token in ("*", "?", "["))}
+    globs = [name for name in prune_dirs if name not in exact]
+
+    def _is_pruned(dir_name):
+        return dir_name in exact or any(fnmatch.fnmatch(dir_name, patt) for patt in globs)
+
+    return _is_pruned
+
+
+# One index per (resolved project root, pruned directory names) for the lifetime of a scan.
+_project_indexes = {}
+
+
+def get_project_index(project_root, previous=None, pruned=True):
+    """
+    Return the shared ProjectFileIndex for `project_root`, building it on first use.
+
+    The index honours the discovery prune policy (runtime.discoveryPruneDirs), so
+    vendor, VCS and build directories are never read. `pruned=False` returns an
+    index of the whole tree instead, kept under its own key; RDL project
+    observations use it, since a glob such as "**/package-lock.json" may only
+    match inside a pruned directory. With pruning disabled both are the same index.
+
+    `previous` is only consulted when the index is built (see ProjectFileIndex).
+    """
+    root = str(Path(project_root or ".").resolve())
+    prune_dirs = tuple(runtime.discoveryPruneDirs) if pruned else ()
+    key = (root, prune_dirs)
+    index = _project_indexes.get(key)
+    if index is None:
+        index = ProjectFileIndex(root, threads=runtime.walkThreads, prune_dirs=prune_dirs, previous=previous)
+        _project_indexes[key] = index
+    return index
+
+
+def reset_project_indexes():
+    """Drop every cached index, e.g. before scanning a project that may have changed."""
+    _project_indexes.clear()
@@ -0,0 +1,122 @@
+# Standard libraries
+import sqlite3
+from pathlib import Path
+
+# Local application imports
+from utils.log_utils import get_logger
+
+logger = get_logger(__name__)
+
+
+class ScanResultCache:
+    """
+    Persistent per-file source scan results for incremental re-scans.
+
+    Each row holds one file's raw rule outcomes for one rule pack. Rows are keyed by
+    (file path, pack key); the pack key fingerprints the compiled rule pack and every
+    other scan input that can change an outcome. A row is reused only while the
+    file's content hash is unchanged.
+    """
+
+    VERSION = 1
+
+    def __init__(self, db_path, enabled=True):
+        self.db_path = Path(db_path)
+        self.enabled = bool(enabled)
+        self._conn = None
+        if self.enabled:
+            self._open()
+
+    def _open(self):
+        try:
+            self.db_path.parent.mkdir(parents=True, exist_ok=True)
+            self._conn = sqlite3.connect(str(self.db_path), timeout=30)
+            version = self._conn.execute("PRAGMA user_version").fetchone()[0]
+            if version != self.VERSION:
+                self._conn.execute("DROP TABLE IF EXISTS results")
+                self._conn.execute(f"PRAGMA user_version = {self.VERSION}")
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " path TEXT NOT NULL,"
+                " pack_key TEXT NOT NULL,"
+                " scope TEXT NOT NULL,"
+                " content_hash TEXT NOT NULL,"
+                " outcomes TEXT NOT NULL,"
+                " PRIMARY KEY (path, pack_key))"
+            )
+            self._conn.execute("CREATE INDEX IF NOT EXISTS results_scope ON results (scope)")
+            self._conn.commit()
+        except sqlite3.Error as exc:
+            logger.warning("Result cache disabled, cannot open %s: %s", self.db_path, exc)
+            self.close()
+            self.enabled = False
+
+    def load(self, pack_keys):
+        """
+        Return {(path, pack_key): (content_hash, outcomes_json)} for the given pack keys.
+        """
+        entries = {}
+        if not self.enabled or not pack_keys:
+            return entries
+        try:
+            for pack_key in set(pack_keys):
+                rows = self._conn.execute(
+                    "SELECT path, content_hash, outcomes FROM results WHERE pack_key = ?",
+                    (pack_key,),
+                )
+                for path, content_hash, outcomes in rows:
+                    entries[(path, pack_key)] = (content_hash, outcomes)
+        except sqlite3.Error as exc:
+            logger.warning("Failed to read result cache %s: %s", self.db_path, exc)
+            return {}
+        return entries
+
+    def put(self, rows):
+        """
+        Save (path, pack_key, scope, content_hash, outcomes_json) rows.
+        """
+        if not self.enabled or not rows:
+            return
+        try:
+            with self._conn:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO results (path, pack_key, scope, content_hash, outcomes)"
+                    " VALUES (?, ?, ?, ?, ?)",
+                    rows,
+                )
+        except sqlite3.Error as exc:
+            logger.warning("Failed to update result cache %s: %s", self.db_path, exc)
+
+    def store(self, rows, scopes):
+        """
+        Save rows as put() does, then prune.
+
+        `scopes` maps each scope (one rule pack applied to one project) to the pack
+        key and file paths of this scan; rows of that scope with an outdated pack key
+        or for files no longer scanned are dropped.
+        """
+        if not self.enabled:
+            return
+        self.put(rows)
+        try:
+            with self._conn:
+                for scope, (pack_key, paths) in scopes.items():
+                    self._conn.execute(
+                        "DELETE FROM results WHERE scope = ? AND pack_key != ?",
+                        (scope, pack_key),
+                    )
+                    stale = [
+                        (path, pack_key)
+                        for (path,) in self._conn.execute(
+                            "SELECT path FROM results WHERE pack_key = ?", (pack_key,)
+                        ).fetchall()
+                        if path not in paths
+                    ]
+                    self._conn.executemany("DELETE FROM results WHERE path = ? AND pack_key = ?", stale)
+        except sqlite3.Error as exc:
+            logger.warning("Failed to update result cache %s: %s", self.db_path, exc)
+
+    def close(self):
+        if self._conn is not None:
+            self._conn.close()
+            self._conn = None
@@ -53,34 +53,107 @@ def load_suppressions(path):
     return normalized
 
 
-def is_suppressed(entries, platform, rule_title, category, file_path, line_no, code):
-    if not entries:
+_EXACT_FIELDS = ("platform", "rule_title", "category", "file", "line")
+
+
+def _entry_matches(entry, platform_n, rule_title_n, category_n, file_n, line_no, code_t):
+    if entry["platform"] and entry["platform"] != platform_n:
+        return False
+    if entry["rule_title"] and entry["rule_title"] != rule_title_n:
+        return False
+    if entry["category"] and entry["category"] != category_n:
+        return False
+    if entry["file"] and entry["file"] != file_n:
+        return False
+    if entry["line"] is not None and int(entry["line"]) != int(line_no):
+        return False
+    if entry["path_regex"] and not entry["path_regex"].search(file_n):
+        return False
+    if entry["code_regex"] and not entry["code_regex"].search(code_t):
+        return False
+    return True
+
+
+class SuppressionIndex:
+    """
+    Lookup structure over load_suppressions() entries.
+
+    Entries without code_regex/path_regex are hash-partitioned by which of
+    (platform, rule_title, category, file, line) they set; an empty field matches
+    anything, as in a linear scan. A lookup probes one set per distinct field
+    combination, so exact baseline entries are found in O(1). Only regex entries
+    are scanned.
+    """
+
+    def __init__(self, entries):
+        self.size = len(entries)
+        self._exact = {}
+        self._residual = []
+        for entry in entries:
+            if entry["code_regex"] or entry["path_regex"]:
+                self._residual.append(entry)
+                continue
+            line = entry["line"]
+            if line is not None:
+                try:
+                    line = int(line)
+                except (TypeError, ValueError):
+                    self._residual.append(entry)
+                    continue
+            values = (entry["platform"], entry["rule_title"], entry["category"], entry["file"], line)
+            mask = tuple(bool(value) if field != "line" else value is not None
+                         for field, value in zip(_EXACT_FIELDS, values))
+            key = tuple(value for value, used in zip(values, mask) if used)
+            self._exact.setdefault(mask, set()).add(key)
+
+    def __len__(self):
+        return self.size
+
+    def matches(self, platform, rule_title, category, file_path, line_no, code):
+        platform_n = _normalize_text(platform)
+        rule_title_n = _normalize_text(rule_title)
+        category_n = _normalize_text(category)
+        file_n = _normalize_path(file_path)
+        code_t = str(code or "")
+
+        if self._exact:
+            values = (platform_n, rule_title_n, category_n, file_n, int(line_no))
+            for mask, keys in self._exact.items():
+                if tuple(value for value, used in zip(values, mask) if used) in keys:
+                    return True
+
+        for entry in self._residual:
+            if _entry_matches(entry, platform_n, rule_title_n, category_n, file_n, line_no, code_t):
+                return True
         return False
 
-    platform_n = _normalize_text(platform)
-    rule_title_n = _normalize_text(rule_title)
-    category_n = _normalize_text(category)
-    file_n = _normalize_path(file_path)
-    code_t = str(code or "")
 
-    for entry in entries:
-        if entry["platform"] and entry["platform"] != platform_n:
-            continue
-        if entry["rule_title"] and entry["rule_title"] != rule_title_n:
-            continue
-        if entry["category"] and entry["category"] != category_n:
-            continue
-        if entry["file"] and entry["file"] != file_n:
-            continue
-        if entry["line"] is not None and int(entry["line"]) != int(line_no):
-            continue
-        if entry["path_regex"] and not entry["path_regex"].search(file_n):
-            continue
-        if entry["code_regex"] and not entry["code_regex"].search(code_t):
-            continue
-        return True
+# Index of the entries list last passed to is_suppressed(), rebuilt when a
+# different list is passed or the list grows.
+_index_cache = (None, 0, None)
 
-    return False
+
+def build_suppression_index(entries):
+    global _index_cache
+    if isinstance(entries, SuppressionIndex):
+        return entries
+    cached_entries, cached_size, index = _index_cache
+    if cached_entries is not entries or cached_size != len(entries):
+        index = SuppressionIndex(entries)
+        _index_cache = (entries, len(entries), index)
+    return index
+
+
+def is_suppressed(entries, platform, rule_title, category, file_path, line_no, code):
+    """
+    Return True when any suppression entry matches the evidence line.
+    `entries` is a load_suppressions() list or a SuppressionIndex.
+    """
+    if not entries:
+        return False
+    return build_suppression_index(entries).matches(
+        platform, rule_title, category, file_path, line_no, code
+    )
 
 
 def build_baseline_from_findings(findings_json_path, baseline_path):
@@ -69,6 +69,18 @@ def build_cmd(payload: dict) -> List[str]:
         cmd.append("--skip-analysis")
     if payload.get("loc"):
         cmd.append("--loc")
+    if payload.get("prune") is False:
+        cmd.append("--no-prune")
+    else:
+        prune_dirs = (payload.get("prune_dirs") or "").strip()
+        if prune_dirs:
+            cmd += ["--prune-dirs", prune_dirs]
+    if payload.get("archives") is False:
+        cmd.append("--no-archives")
+    if payload.get("generated") is False:
+        cmd += ["--generated-files", "scan"]
+    if payload.get("collapse_duplicates"):
+        cmd.append("--collapse-duplicates")
 
     return cmd
 
@@ -113,6 +125,8 @@ def execute_scan_sync(cmd: List[str], log_path: Path, run_uuid: str = "") -> int
         run_runtime.mkdir(parents=True, exist_ok=True)
         env["DAKSH_REPORTS_DIR"] = str(run_reports)
         env["DAKSH_RUNTIME_DIR"] = str(run_runtime)
+        # Caches (compiled rule packs etc.) are shared by every web run.
+        env.setdefault("DAKSH_CACHE_DIR", str(RUNTIME_DIR / "cache"))
 
     with open(log_path, "w", encoding="utf-8") as logf:
         proc = subprocess.Popen(
@@ -13,6 +13,11 @@ class ScanCreate(BaseModel):
     estimate: bool = False
     analysis: bool = True
     loc: bool = False
+    prune: bool = True
+    prune_dirs: Optional[str] = None
+    archives: bool = True
+    collapse_duplicates: bool = False
+    generated: bool = True
 
 
 class ScanSummary(BaseModel):
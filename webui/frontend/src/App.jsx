@@ -34,6 +34,11 @@ const EMPTY_FORM = {
   estimate: false,
   analysis: false,
   loc: false,
+  prune: true,
+  prune_dirs: '',
+  archives: true,
+  collapse_duplicates: false,
+  generated: true,
 }
 
 /* ─── Toast ──────────────────────────────────────────────────── */
@@ -16,6 +16,22 @@ const TOGGLE_INFO = {
     label: 'Count Lines of Code',
     desc: 'Count source lines of code per file and language. Adds a LoC table to the report.',
   },
+  prune: {
+    label: 'Skip Vendor Directories',
+    desc: 'Do not discover files under dependency, VCS and build directories (node_modules, vendor, dist, build, .git …). The list comes from config/tool.yaml unless overridden below. Pruned directories are listed in the scan summary.',
+  },
+  archives: {
+    label: 'Scan Archives',
+    desc: 'Scan files inside .zip, .jar, .war, .ear, .apk and .aar bundles without extracting them. Findings point at members as app.war!/WEB-INF/web.xml. Nesting depth and member size limits come from config/tool.yaml.',
+  },
+  generated: {
+    label: 'Detect Minified Files',
+    desc: 'Detect minified bundles and generated sources (.min. names, generator banners, very long lines) during discovery and handle them as configured in config/tool.yaml: by default their over-long lines are also matched in windows. Counts appear in the scan summary.',
+  },
+  collapse_duplicates: {
+    label: 'Collapse Duplicates',
+    desc: 'Report matches in byte-identical files (copied libraries, generated stubs) once, listing every path that shares the file instead of repeating the evidence.',
+  },
 }
 
 function InfoTooltip({ text }) {
@@ -103,6 +119,22 @@ export default function ScanForm({ values, setValues, onSubmit, onBrowse, creati
           />
         </div>
 
+        {/* Directory pruning override */}
+        <div className="form-field">
+          <label className="form-label">
+            Skipped Directories
+            <span className="form-label-hint">comma-separated names or globs</span>
+          </label>
+          <input
+            className="form-input"
+            value={values.prune_dirs}
+            onChange={(e) => upd('prune_dirs', e.target.value)}
+            placeholder="config default"
+            disabled={!values.prune}
+            style={!values.prune ? { opacity: 0.5, cursor: 'not-allowed' } : undefined}
+          />
+        </div>
+
         {/* Report + Verbosity */}
         <div className="form-grid">
           <div className="form-field">
@@ -145,7 +177,7 @@ export default function ScanForm({ values, setValues, onSubmit, onBrowse, creati
 
           {/* Optional toggles */}
           <div className="form-toggles" style={{ marginTop: 8 }}>
-            {['recon', 'estimate', 'analysis', 'loc'].map((key) => {
+            {['recon', 'estimate', 'analysis', 'loc', 'prune', 'archives', 'generated', 'collapse_duplicates'].map((key) => {
               const { label, warn, desc } = TOGGLE_INFO[key]
               return (
                 <label key={key} className={`toggle-item${warn ? ' toggle-warn' : ''}`}>